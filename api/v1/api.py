@@ -3,6 +3,8 @@ from fastapi import APIRouter  # Importa o gerenciador de rotas do FastAPI
 # Importa os módulos de rotas específicos
 from api.v1.endpoints import g_usuario_endpoint
 from api.v1.endpoints import c_caixa_item_endpoint
+from api.v1.endpoints import t_ato_endpoint
+from api.v1.endpoints import job_endpoint
 
 # Cria uma instância do APIRouter que vai agregar todas as rotas da API
 api_router = APIRouter()
@@ -15,4 +17,14 @@ api_router.include_router(
 # Inclui as rotas de "c_caixa_item no roteador principal, com prefixo /c_caixa_items e tag 'Caixa Itens'
 api_router.include_router(
     c_caixa_item_endpoint.router, prefix='/caixa_itens', tags=['Caixa Itens']
-)
\ No newline at end of file
+)
+
+# Inclui as rotas de "t_ato" no roteador principal, com prefixo /atos e tag 'Atos'
+api_router.include_router(
+    t_ato_endpoint.router, prefix='/atos', tags=['Atos']
+)
+
+# Inclui as rotas de tarefas em segundo plano, com prefixo /jobs e tag 'Tarefas'
+api_router.include_router(
+    job_endpoint.router, prefix='/jobs', tags=['Tarefas']
+)
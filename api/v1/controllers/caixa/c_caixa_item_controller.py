@@ -1,24 +1,102 @@
-from typing import Optional, List
+import asyncio
+import json
+import logging
+import os
+from typing import AsyncIterator, Optional, List
+from datetime import date, datetime, time, timedelta
 from fastapi import HTTPException, status # Importe HTTPException e status
+from fastapi.concurrency import run_in_threadpool
 
 # Schemas usados para entrada e saída de dados dos items
 from api.v1.schemas.caixa.c_caixa_item_schema import (
     CCaixaItemSchemaBase,
     CCaixaItemSchemaList,
-    CCaixaItemPaginationSchema
+    CCaixaItemPaginationSchema,
+    CCaixaItemFiltroSchema,
+    CCaixaItemTotaisSchema,
+    CCaixaItemAnaliseSchema
 )
 
 # Model responsável pelo acesso ao banco de dados Firebird
 from api.v1.models.caixa.c_caixa_item_model import CCaixaItemModel
 
+# Análise em memória (opcional, requer NumPy)
+from api.v1.models.caixa.c_caixa_analytics_model import CCaixaAnalyticsModel, numpy_disponivel
+
 # Funções para sanitização de entradas (evitar XSS, SQLi etc.)
 from core.validation import InputSanitizer
 
-# Retorna a lista de todos os itens cadastrados
-def get_all_caixa_itens(skip: int = 0, limit: int = 10) -> CCaixaItemPaginationSchema:
+# Cache de totais compartilhado com o controller de usuários
+from core.cache import get_cache
+from core.change_listener import ao_alterar
+from core.configs import settings
+
+# Canal do feed ao vivo (um laço de consulta por worker para todos os painéis)
+from core.broadcast import Broadcast
+
+# Contexto das tarefas em segundo plano (progresso e cancelamento)
+from core.jobs import JobContext
+
+logger = logging.getLogger(__name__)
+
+counts_cache = get_cache("counts", settings.COUNT_CACHE_SECONDS)
+
+# Laço do feed em execução: (event loop, evento que o acorda antes do intervalo)
+_feed_sinal: tuple[asyncio.AbstractEventLoop, asyncio.Event] | None = None
+
+
+# C_CAIXA_ITEM alterado fora da API: o total em cache deixa de valer e o
+# feed ao vivo consulta na hora (chamado pela thread do change_listener)
+def _itens_alterados() -> None:
+    counts_cache.invalidate("caixa_itens")
+    sinal = _feed_sinal
+    if sinal is not None:
+        loop, acordar = sinal
+        loop.call_soon_threadsafe(acordar.set)
+
+
+ao_alterar("C_CAIXA_ITEM", _itens_alterados)
+
+# Converte o schema de filtros no dicionário esperado pelo model
+def _montar_filtros(filtros: Optional[CCaixaItemFiltroSchema]) -> dict:
+    if filtros is None:
+        return {}
+
+    if (filtros.data_pagamento_inicio and filtros.data_pagamento_fim
+            and filtros.data_pagamento_inicio > filtros.data_pagamento_fim):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data inicial do pagamento deve ser anterior ou igual à data final."
+        )
+
+    if (filtros.valor_pago_min is not None and filtros.valor_pago_max is not None
+            and filtros.valor_pago_min > filtros.valor_pago_max):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O valor pago mínimo deve ser menor ou igual ao valor pago máximo."
+        )
+
+    apresentante = filtros.apresentante.strip() if filtros.apresentante else None
+
+    return {
+        # O intervalo é fechado nos dois dias: o fim vira "menor que o dia seguinte"
+        "data_pagamento_inicio": datetime.combine(filtros.data_pagamento_inicio, time.min) if filtros.data_pagamento_inicio else None,
+        "data_pagamento_fim": datetime.combine(filtros.data_pagamento_fim + timedelta(days=1), time.min) if filtros.data_pagamento_fim else None,
+        "apresentante": apresentante or None,
+        "valor_pago_min": filtros.valor_pago_min,
+        "valor_pago_max": filtros.valor_pago_max,
+    }
+
+# Retorna a lista de itens cadastrados, opcionalmente filtrada
+def get_all_caixa_itens(skip: int = 0, limit: int = 10, filtros: Optional[CCaixaItemFiltroSchema] = None) -> CCaixaItemPaginationSchema:
+    filtros_model = _montar_filtros(filtros)
     try:
-        itens = CCaixaItemModel.get_all_caixa_itens(skip=skip, limit=limit)
-        total = CCaixaItemModel.count_items()
+        itens = CCaixaItemModel.get_all_caixa_itens(skip=skip, limit=limit, filtros=filtros_model)
+        if any(v is not None for v in filtros_model.values()):
+            total = CCaixaItemModel.count_items(filtros=filtros_model)
+        else:
+            # Sem filtros o total é o da tabela inteira: vem do cache
+            total = counts_cache.get_or_load("caixa_itens", CCaixaItemModel.count_items)
 
         return {
             "total": total,
@@ -40,7 +118,7 @@ def get_all_caixa_itens(skip: int = 0, limit: int = 10) -> CCaixaItemPaginationS
 # Retorna a quantidade de registros no banco de dados
 def count_items() -> int:
     try:
-        return CCaixaItemModel.count_items()
+        return counts_cache.get_or_load("caixa_itens", CCaixaItemModel.count_items)
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -66,4 +144,175 @@ def get_item_by_id(caixa_item_id: int) -> CCaixaItemSchemaBase: # Retorno altera
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Ocorreu um erro inesperado ao buscar item por ID: {e}"
-        )    
\ No newline at end of file
+        )
+
+# Agrupa os itens na cópia em memória, sem consultar o banco a cada pergunta
+def get_analytics(agrupar: str, inicio: Optional[date] = None, fim: Optional[date] = None,
+                  apresentante: Optional[str] = None, somente_diferenca: bool = False,
+                  ordenar: str = "quantidade", limite: int = 50) -> CCaixaItemAnaliseSchema:
+    if not settings.ANALYTICS_ENABLED or not numpy_disponivel():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Análise em memória indisponível: ative ANALYTICS_ENABLED e instale o NumPy."
+        )
+    if inicio and fim and inicio > fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data inicial deve ser anterior ou igual à data final."
+        )
+    apresentante = InputSanitizer.clean_text(apresentante.strip()) if apresentante else None
+    try:
+        resultado = CCaixaAnalyticsModel.breakdown(
+            agrupar, inicio=inicio, fim=fim, apresentante=apresentante or None,
+            somente_diferenca=somente_diferenca, ordenar=ordenar, limite=limite
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao carregar a análise: {e}"
+        )
+    dados = resultado.pop("dados")
+    return CCaixaItemAnaliseSchema(agrupar=agrupar, data=dados, **resultado)
+
+# Tarefa caixa_itens_export: grava os itens filtrados em NDJSON ou CSV na pasta da tarefa
+def job_exportar_itens(ctx: JobContext, formato: str = "ndjson", filtros: Optional[dict] = None) -> dict:
+    filtros_model = _montar_filtros(CCaixaItemFiltroSchema(**(filtros or {})))
+    ctx.progress(0.0, "Contando os itens")
+    total = CCaixaItemModel.count_items(filtros=filtros_model)
+    lote = settings.EXPORT_BATCH_SIZE
+    nome = f"caixa_itens.{formato}"
+    escritos = 0
+    with open(ctx.path(nome), "wb") as arquivo:
+        # Cada bloco tem `lote` linhas (o último, o restante)
+        for bloco in CCaixaItemModel.export(formato=formato, filtros=filtros_model, lote=lote):
+            arquivo.write(bloco)
+            escritos = min(escritos + lote, total)
+            ctx.progress(escritos / total if total else None, f"{escritos} de {total} itens")
+    return {"arquivo": nome, "linhas": total, "bytes": os.path.getsize(ctx.path(nome))}
+
+# Verifica se as colunas usadas nos filtros estão indexadas e retorna as que não estão
+def verificar_indices_filtros() -> List[str]:
+    try:
+        return CCaixaItemModel.colunas_sem_indice()
+    except RuntimeError as e:
+        logger.warning("Não foi possível verificar os índices de C_CAIXA_ITEM: %s", e)
+        return []
+
+
+# ---------------------- FEED AO VIVO ----------------------
+
+def _item_json(item: dict) -> dict:
+    return CCaixaItemSchemaList(**item).model_dump(mode="json")
+
+
+def _totais_do_dia(dia: date) -> dict:
+    inicio = datetime.combine(dia, time.min)
+    totais = CCaixaItemModel.get_totals(inicio, inicio + timedelta(days=1))
+    return CCaixaItemTotaisSchema(dia=dia, **totais).model_dump(mode="json")
+
+
+async def _produzir_feed(feed: Broadcast) -> None:
+    """
+    Laço compartilhado do feed: a cada FEED_POLL_SECONDS (ou assim que o
+    change_listener avisa uma alteração) busca os itens com ID maior que o
+    último visto e, quando algo mudou, recalcula os totais do dia.
+    """
+    global _feed_sinal
+    acordar = asyncio.Event()
+    _feed_sinal = (asyncio.get_running_loop(), acordar)
+    ultimo = None
+    dia = None
+    recalcular = True
+    iniciado = False
+    try:
+        while True:
+            acordar.clear()
+            itens = []
+            try:
+                if not iniciado:
+                    # Quem conecta recebe só o que entrar daqui em diante
+                    ultimo = await run_in_threadpool(CCaixaItemModel.get_last_id)
+                    iniciado = True
+                itens = await run_in_threadpool(CCaixaItemModel.get_after, ultimo, settings.FEED_BATCH_SIZE)
+                if itens:
+                    ultimo = itens[-1]["caixa_item_id"]
+                    feed.publish("itens", [_item_json(i) for i in itens])
+                    recalcular = True
+                hoje = date.today()
+                if recalcular or hoje != dia:
+                    feed.publish("totais", await run_in_threadpool(_totais_do_dia, hoje), guardar=True)
+                    dia, recalcular = hoje, False
+            except RuntimeError as e:
+                logger.error("Error in caixa_itens feed: %s", e)
+
+            if len(itens) == settings.FEED_BATCH_SIZE:
+                continue  # Ainda há itens novos: busca o próximo bloco sem esperar
+            try:
+                await asyncio.wait_for(acordar.wait(), settings.FEED_POLL_SECONDS)
+                # Aviso do banco: pode ter sido alteração ou exclusão, refaz os totais
+                recalcular = True
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _feed_sinal = None
+
+
+caixa_feed = Broadcast("caixa_itens", _produzir_feed, settings.FEED_QUEUE_SIZE)
+
+
+def _sse(evento: str, dados, id: Optional[int] = None) -> str:
+    linhas = [f"event: {evento}"]
+    if id is not None:
+        linhas.append(f"id: {id}")
+    linhas.append("data: " + json.dumps(dados, ensure_ascii=False))
+    return "\n".join(linhas) + "\n\n"
+
+
+# Gera o fluxo SSE de um painel: itens novos ("itens") e totais do dia ("totais")
+async def caixa_itens_feed(ultimo_id: Optional[int] = None) -> AsyncIterator[str]:
+    async with caixa_feed.subscribe() as assinante:
+        # O navegador reconecta com Last-Event-ID: entrega o que foi perdido, em
+        # blocos, até alcançar o produtor (o que ele publicar enquanto isso fica
+        # na fila do assinante e é filtrado abaixo)
+        entregues = 0
+        while ultimo_id is not None:
+            if entregues >= settings.FEED_RESUME_MAX_ITEMS:
+                # Perdeu itens demais: o painel recarrega a lista e segue ao vivo
+                yield _sse("reset", {"ultimo_id": ultimo_id})
+                ultimo_id = None
+                break
+            try:
+                perdidos = await run_in_threadpool(CCaixaItemModel.get_after, ultimo_id, settings.FEED_BATCH_SIZE)
+            except RuntimeError as e:
+                logger.error("Error resuming caixa_itens feed after %s: %s", ultimo_id, e)
+                yield _sse("reset", {"ultimo_id": ultimo_id})
+                ultimo_id = None
+                break
+            if perdidos:
+                ultimo_id = perdidos[-1]["caixa_item_id"]
+                entregues += len(perdidos)
+                yield _sse("itens", [_item_json(i) for i in perdidos], id=ultimo_id)
+            if len(perdidos) < settings.FEED_BATCH_SIZE:
+                break
+
+        yield f"retry: {settings.FEED_RETRY_MS}\n\n"
+        while True:
+            if assinante.lagged and assinante.fila.empty():
+                # Cliente lento perdeu mensagens: encerra para ele reconectar e recuperar
+                break
+            mensagem = await assinante.get(settings.FEED_HEARTBEAT_SECONDS)
+            if mensagem is None:
+                yield ": ping\n\n"  # Mantém a conexão aberta em proxies e balanceadores
+                continue
+            tipo, dados = mensagem
+            if tipo == "itens":
+                # Descarta o que já foi entregue na recuperação
+                novos = [i for i in dados if ultimo_id is None or i["caixa_item_id"] > ultimo_id]
+                if not novos:
+                    continue
+                ultimo_id = novos[-1]["caixa_item_id"]
+                yield _sse("itens", novos, id=ultimo_id)
+            else:
+                yield _sse(tipo, dados)
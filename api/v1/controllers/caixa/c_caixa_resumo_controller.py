@@ -0,0 +1,97 @@
+# controllers/c_caixa_resumo_controller.py
+
+import logging
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from fastapi import HTTPException, status
+
+# Contexto e executor das tarefas em segundo plano
+from core.jobs import EXECUTANDO, PENDENTE, JobContext, runner
+
+# Schemas de saída do resumo diário
+from api.v1.schemas.caixa.c_caixa_resumo_schema import (
+    CCaixaResumoSchema,
+    CCaixaResumoPeriodoSchema
+)
+
+# Model do resumo diário (SQLite local alimentado por C_CAIXA_ITEM)
+from api.v1.models.caixa.c_caixa_resumo_model import CCaixaResumoModel
+
+logger = logging.getLogger(__name__)
+
+
+# Soma as linhas diárias por período (dia ou mês)
+def _agrupar(dias: list[dict], agrupar: str) -> list[CCaixaResumoPeriodoSchema]:
+    periodos: dict[str, list] = {}
+    for linha in dias:
+        chave = linha["dia"].isoformat()[:7] if agrupar == "mes" else linha["dia"].isoformat()
+        atual = periodos.setdefault(chave, [0, Decimal(0), Decimal(0)])
+        atual[0] += linha["quantidade"]
+        atual[1] += linha["valor_servico"]
+        atual[2] += linha["valor_pago"]
+    return [
+        CCaixaResumoPeriodoSchema(periodo=p, quantidade=q, valor_servico=s, valor_pago=v)
+        for p, (q, s, v) in periodos.items()
+    ]
+
+
+# Enfileira a construção inicial do resumo, se ainda não houver uma aguardando ou em execução
+def _enfileirar_construcao() -> None:
+    try:
+        if any(j["tipo"] == "caixa_resumo_rebuild" and j["estado"] in (PENDENTE, EXECUTANDO)
+               for j in runner.list_jobs()):
+            return
+        runner.submit("caixa_resumo_rebuild", {"desde": None, "se_vazio": True}, owner=None)
+    except (RuntimeError, ValueError) as e:
+        # Fila cheia ou executor parado: a próxima consulta tenta de novo
+        logger.warning("Could not enqueue caixa_resumo_rebuild: %s", e)
+
+
+# Retorna os totais por dia ou mês a partir do resumo (custo proporcional à quantidade de dias)
+def get_resumo(inicio: date, fim: date, agrupar: str = "dia") -> CCaixaResumoSchema:
+    if inicio > fim:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data inicial deve ser anterior ou igual à data final."
+        )
+    try:
+        # Soma os itens novos antes de responder (no máximo a cada SUMMARY_REFRESH_SECONDS)
+        if CCaixaResumoModel.atualizar().get("vazio"):
+            # A carga completa varre C_CAIXA_ITEM inteira: roda como tarefa, não aqui
+            _enfileirar_construcao()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="O resumo diário está sendo construído; tente novamente em instantes.",
+                headers={"Retry-After": "30"}
+            )
+        dias = CCaixaResumoModel.get_days(inicio, fim)
+        situacao = CCaixaResumoModel.get_status()
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao consultar o resumo do caixa: {e}"
+        )
+
+    periodos = _agrupar(dias, agrupar)
+    return CCaixaResumoSchema(
+        agrupar=agrupar,
+        inicio=inicio,
+        fim=fim,
+        watermark=situacao["watermark"],
+        atualizado_em=situacao["atualizado_em"],
+        total=CCaixaResumoPeriodoSchema(
+            periodo=f"{inicio.isoformat()}/{fim.isoformat()}",
+            quantidade=sum(p.quantidade for p in periodos),
+            valor_servico=sum((p.valor_servico for p in periodos), Decimal(0)),
+            valor_pago=sum((p.valor_pago for p in periodos), Decimal(0)),
+        ),
+        data=periodos,
+    )
+
+
+# Tarefa caixa_resumo_rebuild: reconstrói o resumo (inteiro ou a partir de uma data)
+def job_rebuild_resumo(ctx: JobContext, desde: Optional[str] = None, se_vazio: bool = False) -> dict:
+    ctx.progress(0.0, "Totalizando os itens de caixa por dia")
+    resultado = CCaixaResumoModel.reconstruir(date.fromisoformat(desde) if desde else None, se_vazio=se_vazio)
+    return {"dias": resultado["dias"], "watermark": resultado["watermark"]}
@@ -1,5 +1,8 @@
 # controllers/user_controller.py
 
+import logging
+import threading
+import time
 from typing import Optional, List
 from fastapi import HTTPException, status # Importe HTTPException e status
 
@@ -9,7 +12,8 @@ from api.v1.schemas.g_usuario_schema import (
     UserSchemaCreate,
     UserSchemaUpdate,
     UserSchemaList,
-    UserPaginationSchema
+    UserPaginationSchema,
+    UserSearchResultSchema
 )
 
 # Model responsável pelo acesso ao banco de dados Firebird
@@ -21,6 +25,107 @@ from core.security import verify_senha_api, hash_senha_api
 # Funções para sanitização de entradas (evitar XSS, SQLi etc.)
 from core.validation import InputSanitizer
 
+# Índice de busca em memória, cache de totais e configurações
+from core.search_index import SearchIndex, somente_digitos
+from core.cache import get_cache
+from core.change_listener import ao_alterar
+from core.configs import settings
+
+# Limite de tentativas de login (balde de fichas por IP e por e-mail)
+from core.rate_limit import RateLimiter, hash_key
+
+logger = logging.getLogger(__name__)
+
+
+# Tentativas de login por IP e por e-mail (o e-mail entra só como hash)
+login_ip_limiter = RateLimiter("login_ip", settings.LOGIN_RATE_IP_BURST, settings.LOGIN_RATE_IP_PER_MINUTE)
+login_email_limiter = RateLimiter("login_email", settings.LOGIN_RATE_EMAIL_BURST, settings.LOGIN_RATE_EMAIL_PER_MINUTE)
+
+
+# Total de usuários em cache (evita um COUNT(*) a cada página listada)
+counts_cache = get_cache("counts", settings.COUNT_CACHE_SECONDS)
+
+
+# Índice de busca de usuários: campo -> peso no ranking
+user_search_index = SearchIndex(
+    campos={"nome_completo": 3.0, "login": 2.0, "cpf": 2.0, "email": 1.0},
+    normalizadores={"cpf": somente_digitos},
+)
+_search_index_lock = threading.Lock()
+_search_index_built_at = 0.0
+
+
+# Garante que o índice de busca esteja carregado e dentro do prazo de validade
+def _ensure_search_index() -> None:
+    global _search_index_built_at
+    expirado = time.monotonic() - _search_index_built_at > settings.USER_SEARCH_REBUILD_SECONDS
+    if user_search_index.construido and not expirado:
+        return
+
+    # Apenas uma thread reconstrói; as demais usam o índice atual (se houver)
+    if not _search_index_lock.acquire(blocking=not user_search_index.construido):
+        return
+    try:
+        expirado = time.monotonic() - _search_index_built_at > settings.USER_SEARCH_REBUILD_SECONDS
+        if user_search_index.construido and not expirado:
+            return
+        user_search_index.construir(UserModel.get_search_rows(), chave="usuario_id")
+        _search_index_built_at = time.monotonic()
+    finally:
+        _search_index_lock.release()
+
+
+# G_USUARIO alterado fora da API (ex: sistema desktop): descarta o total em
+# cache e marca o índice como vencido (a próxima busca o reconstrói, as
+# buscas concorrentes seguem usando o índice atual)
+def _usuarios_alterados() -> None:
+    global _search_index_built_at
+    counts_cache.invalidate("usuarios")
+    _search_index_built_at = 0.0
+
+
+ao_alterar("G_USUARIO", _usuarios_alterados)
+
+
+# Atualiza um usuário no índice de busca após criação ou alteração
+def _refresh_search_entry(user_id: int) -> None:
+    if not user_search_index.construido:
+        return  # O índice será carregado por completo na primeira busca
+    try:
+        rows = UserModel.get_search_rows(user_id)
+    except RuntimeError as e:
+        # Não falha a escrita por causa do índice; força a reconstrução na próxima busca
+        logger.error("Error refreshing search index for user %s: %s", user_id, e)
+        user_search_index.invalidar()
+        return
+    if rows:
+        user_search_index.upsert(rows[0]["usuario_id"], rows[0])
+    else:
+        user_search_index.remover(user_id)
+
+
+# Recusa a tentativa de login (429) antes da consulta ao banco e do bcrypt
+def check_login_rate(ip: Optional[str], email: str) -> None:
+    if not settings.LOGIN_RATE_LIMIT_ENABLED:
+        return
+    espera = login_ip_limiter.hit(ip) if ip else None
+    # IP já bloqueado não gasta as fichas do e-mail (de quem pode ser a vítima)
+    if espera is None:
+        espera = login_email_limiter.hit(hash_key(email))
+    if espera is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente em instantes.",
+            headers={"Retry-After": str(int(espera))}
+        )
+
+
+# Login bem-sucedido devolve a ficha do e-mail: só as falhas contam para o
+# bloqueio, e logins legítimos não ajudam quem tenta travar a conta de alguém
+def refund_login_rate(email: str) -> None:
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        login_email_limiter.refund(hash_key(email))
+
 
 # Autentica um usuário com base no e-mail e senha fornecidos
 def authenticate_user(email: str, senha_api: str) -> Optional[dict]:
@@ -71,6 +176,8 @@ def create_user(user_data: UserSchemaCreate) -> UserSchemaBase: # Retorno altera
 
         # Se o modelo retornar um dicionário, converte para UserSchemaBase
         if result:
+            counts_cache.invalidate("usuarios")
+            _refresh_search_entry(result["user_id"])
             return UserSchemaBase(**result)
         # Se o modelo retornasse None (o que não deve mais acontecer com as exceções),
         # poderia ser um erro interno ou algo que não previu.
@@ -103,7 +210,7 @@ def create_user(user_data: UserSchemaCreate) -> UserSchemaBase: # Retorno altera
 def get_all(skip: int = 0, limit: int = 10) -> UserPaginationSchema:
     try:
         users = UserModel.get_all(skip=skip, limit=limit)
-        total = UserModel.count_users()
+        total = counts_cache.get_or_load("usuarios", UserModel.count_users)
 
         return {
             "total": total,
@@ -125,7 +232,7 @@ def get_all(skip: int = 0, limit: int = 10) -> UserPaginationSchema:
 # Retorna a quantidade de registros no banco de dados
 def count_users() -> int:
     try:
-        return UserModel.count_users()
+        return counts_cache.get_or_load("usuarios", UserModel.count_users)
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -154,6 +261,21 @@ def get_user_by_id(user_id: int) -> UserSchemaBase: # Retorno alterado para User
         )
 
 
+# Busca usuários por trecho do nome, login, CPF ou e-mail usando o índice em memória
+def search_users(q: str, limit: int = 20) -> List[UserSearchResultSchema]:
+    try:
+        _ensure_search_index()
+        return [
+            UserSearchResultSchema(**row, score=score)
+            for row, score in user_search_index.buscar(q, limite=limit)
+        ]
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao buscar usuários: {e}"
+        )
+
+
 # Atualiza os dados de um usuário existente
 def update_user(user_id: int, user_data: UserSchemaUpdate) -> UserSchemaBase: # Retorno alterado
     try:
@@ -188,6 +310,7 @@ def update_user(user_id: int, user_data: UserSchemaUpdate) -> UserSchemaBase: #
                 detail="Nenhum dado válido fornecido para atualização."
             )
 
+        _refresh_search_entry(user_id)
         return get_user_by_id(user_id) # Se atualizou com sucesso, retorna o usuário atualizado
 
     except KeyError as e:
@@ -221,6 +344,8 @@ def delete_user(user_id: int) -> bool:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Usuário com ID {user_id} não encontrado para exclusão."
             )
+        counts_cache.invalidate("usuarios")
+        user_search_index.remover(user_id)
         return success
     except KeyError as e:
         raise HTTPException(
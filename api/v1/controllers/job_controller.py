@@ -0,0 +1,154 @@
+# controllers/job_controller.py
+
+from typing import List, Optional
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+
+# Schemas de entrada e saída das tarefas
+from api.v1.schemas.job_schema import JobSchema, ParquetExportJobSchema
+from api.v1.schemas.caixa.c_caixa_item_schema import CCaixaItemExportJobSchema
+from api.v1.schemas.caixa.c_caixa_resumo_schema import CCaixaResumoRebuildJobSchema
+
+# Executor de tarefas em segundo plano
+from core.jobs import EXECUTANDO, PENDENTE, JobContext, JobQueueFull, runner
+from core.configs import settings
+
+# Exportação Parquet (definições ficam junto dos models)
+from core.parquet_export import exportar
+from api.v1.models.caixa.c_caixa_item_model import CAIXA_ITENS_PARQUET
+from api.v1.models.g_usuario_model import USUARIOS_PARQUET
+
+
+# Tabelas exportáveis para Parquet (também usadas por scripts/export_parquet.py)
+EXPORTACOES_PARQUET = {
+    "c_caixa_item": CAIXA_ITENS_PARQUET,
+    "g_usuario": USUARIOS_PARQUET,
+}
+
+
+# Tarefa parquet_export: exporta as tabelas para PARQUET_EXPORT_DIR
+def job_exportar_parquet(ctx: JobContext, tabelas: Optional[List[str]] = None) -> dict:
+    nomes = tabelas or list(EXPORTACOES_PARQUET)
+    resultados = []
+    for posicao, nome in enumerate(nomes):
+        ctx.progress(posicao / len(nomes), f"Exportando {nome}")
+        resultados.append(exportar(
+            EXPORTACOES_PARQUET[nome],
+            settings.PARQUET_EXPORT_DIR,
+            lote=settings.PARQUET_BATCH_SIZE,
+            # Entre um bloco e outro: registra o andamento e atende o cancelamento
+            progresso=lambda linhas, nome=nome: ctx.progress(mensagem=f"Exportando {nome}: {linhas} linhas"),
+        ))
+    return {"tabelas": resultados}
+
+
+# Tipos de tarefa: função ("modulo:funcao", importável no processo filho) e schema dos parâmetros
+TIPOS: dict[str, tuple[str, type[BaseModel]]] = {
+    "caixa_itens_export": (
+        "api.v1.controllers.caixa.c_caixa_item_controller:job_exportar_itens", CCaixaItemExportJobSchema
+    ),
+    "caixa_resumo_rebuild": (
+        "api.v1.controllers.caixa.c_caixa_resumo_controller:job_rebuild_resumo", CCaixaResumoRebuildJobSchema
+    ),
+    "parquet_export": (
+        "api.v1.controllers.job_controller:job_exportar_parquet", ParquetExportJobSchema
+    ),
+}
+
+for _tipo, (_caminho, _) in TIPOS.items():
+    runner.register(_tipo, _caminho)
+
+
+# Monta a resposta, com o link de download quando há arquivo de resultado
+def _job_schema(job: dict) -> JobSchema:
+    download_url = None
+    if runner.result_path(job):
+        download_url = f"{settings.API_V1_STR}/jobs/{job['id']}/download"
+    return JobSchema(**job, download_url=download_url)
+
+
+# Busca a tarefa do usuário; tarefas de outros usuários respondem como inexistentes
+def _job_do_usuario(job_id: str, current_user: dict) -> dict:
+    try:
+        job = runner.get(job_id)
+    except ValueError:
+        job = None
+    if job is None or job["owner"] != current_user["user_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarefa não encontrada."
+        )
+    return job
+
+
+# Enfileira uma tarefa e retorna a situação inicial (pendente)
+def create_job(tipo: str, params: dict, current_user: dict) -> JobSchema:
+    if tipo not in TIPOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tipo de tarefa desconhecido: {tipo}. Disponíveis: {', '.join(TIPOS)}."
+        )
+    try:
+        # Valida os parâmetros na requisição: erro de digitação não vira tarefa que falha depois
+        parametros = TIPOS[tipo][1](**params).model_dump(mode="json")
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parâmetros inválidos para {tipo}: {e.errors(include_url=False)}"
+        )
+    if tipo == "parquet_export":
+        desconhecidas = [t for t in parametros["tabelas"] or [] if t not in EXPORTACOES_PARQUET]
+        if desconhecidas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tabela desconhecida: {', '.join(desconhecidas)}. Disponíveis: {', '.join(EXPORTACOES_PARQUET)}."
+            )
+        # Uma por vez: duas exportações disputariam a mesma marca d'água e os mesmos arquivos
+        if any(j["tipo"] == tipo and j["estado"] in (PENDENTE, EXECUTANDO) for j in runner.list_jobs()):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Já há uma exportação Parquet aguardando ou em execução.",
+                headers={"Retry-After": "60"}
+            )
+
+    try:
+        job = runner.submit(tipo, parametros, owner=current_user["user_id"])
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor ao criar a tarefa: {e}"
+        )
+    return _job_schema(job)
+
+
+# Retorna a situação de uma tarefa
+def get_job(job_id: str, current_user: dict) -> JobSchema:
+    return _job_schema(_job_do_usuario(job_id, current_user))
+
+
+# Lista as tarefas do usuário (mais recentes primeiro)
+def list_jobs(current_user: dict) -> List[JobSchema]:
+    return [_job_schema(job) for job in runner.list_jobs(owner=current_user["user_id"])]
+
+
+# Pede o cancelamento; a tarefa para no próximo bloco
+def cancel_job(job_id: str, current_user: dict) -> JobSchema:
+    _job_do_usuario(job_id, current_user)
+    return _job_schema(runner.cancel(job_id))
+
+
+# Caminho do arquivo de resultado de uma tarefa concluída
+def job_file(job_id: str, current_user: dict) -> str:
+    caminho = runner.result_path(_job_do_usuario(job_id, current_user))
+    if caminho is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="A tarefa não tem arquivo de resultado (ainda não terminou, falhou ou expirou)."
+        )
+    return caminho
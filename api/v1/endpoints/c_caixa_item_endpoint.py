@@ -1,43 +1,157 @@
 # endpoints/c_caixa_item_endpoint.py
 
-from typing import List
-from fastapi import APIRouter, status, Depends, HTTPException, Response, Query
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, status, Depends, HTTPException, Response, Query, Header
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Schemas para entrada e saída de dados (nomes padronizados em inglês)
 from api.v1.schemas.caixa.c_caixa_item_schema import (
     CCaixaItemSchemaBase,
     CCaixaItemSchemaList,
-    CCaixaItemPaginationSchema
+    CCaixaItemPaginationSchema,
+    CCaixaItemFiltroSchema,
+    CCaixaItemAnaliseSchema,
+    CCaixaItemExportJobSchema,
+    CCaixaFeedTicketSchema
 )
 
 # Controller responsável pelas regras de negócio e sanitização
 from api.v1.controllers.caixa.c_caixa_item_controller import (
     get_all_caixa_itens,
     get_item_by_id,
-    count_items
+    count_items,
+    caixa_itens_feed,
+    get_analytics
 )
+from api.v1.controllers.caixa.c_caixa_resumo_controller import get_resumo
+from api.v1.schemas.caixa.c_caixa_resumo_schema import CCaixaResumoSchema, CCaixaResumoRebuildJobSchema
+
+# Exportação e reconstrução do resumo rodam como tarefas em segundo plano (/jobs)
+from api.v1.controllers.job_controller import create_job
+from api.v1.schemas.job_schema import JobSchema
+
+# Configurações (tamanho máximo da página)
+from core.configs import settings
 
 # Dependência para obter o usuário autenticado a partir do token JWT      
-from core.deps import get_current_user
+from core.deps import get_current_user, get_feed_user
+
+# Ticket do feed para o EventSource do navegador
+from core.auth import create_feed_ticket
 
 # Inicializa o roteador responsável pelas rotas de usuários
 router = APIRouter()
 
 
+# ---------------------- ROTAS FIXAS ----------------------
+
+@router.get('/feed')
+async def feed(
+    last_event_id: Optional[int] = Header(None, description="Último ID recebido (enviado pelo navegador ao reconectar)"),
+    ultimo_id: Optional[int] = Query(None, description="Último ID recebido, ao abrir um novo EventSource"),
+    current_user: dict = Depends(get_feed_user)
+):
+    """
+    Feed ao vivo (Server-Sent Events) dos itens de caixa novos e dos totais do
+    dia. Substitui a consulta periódica de /caixa_itens/: todos os painéis
+    conectados ao worker compartilham uma única consulta ao banco por ciclo.
+    Na reconexão, reenvia os itens perdidos; se forem muitos, envia o evento
+    "reset" e o painel deve recarregar a lista.
+
+    Autenticação: cabeçalho Authorization (streaming via fetch) ou, para o
+    EventSource do navegador, ?ticket= obtido em POST /caixa_itens/feed/ticket.
+    """
+    return StreamingResponse(
+        caixa_itens_feed(last_event_id if last_event_id is not None else ultimo_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post('/feed/ticket', response_model=CCaixaFeedTicketSchema)
+def feed_ticket(current_user: dict = Depends(get_current_user)):
+    """
+    Ticket de curta duração para abrir o feed com EventSource
+    (GET /caixa_itens/feed?ticket=...). Só vale para o feed.
+    """
+    return CCaixaFeedTicketSchema(
+        ticket=create_feed_ticket(current_user["user_id"]),
+        expires_in=settings.FEED_TICKET_MINUTES * 60,
+    )
+
+
+@router.get('/resumo', response_model=CCaixaResumoSchema)
+def resumo(
+    inicio: date = Query(..., description="Data inicial do pagamento (inclusiva)"),
+    fim: date = Query(..., description="Data final do pagamento (inclusiva)"),
+    agrupar: str = Query("dia", pattern="^(dia|mes)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Totais de VALOR_SERVICO e VALOR_PAGO por dia ou por mês, lidos do resumo
+    diário (uma linha por dia) em vez de varrer os itens de caixa.
+    """
+    return get_resumo(inicio, fim, agrupar)
+
+
+@router.post('/resumo/rebuild', response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+def resumo_rebuild(
+    desde: Optional[date] = Query(None, description="Refaz só os dias a partir desta data"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Enfileira a reconstrução do resumo diário a partir de C_CAIXA_ITEM
+    (necessária quando itens antigos são alterados ou excluídos).
+    Acompanhe por GET /jobs/{id}.
+    """
+    params = CCaixaResumoRebuildJobSchema(desde=desde).model_dump(mode="json")
+    return create_job("caixa_resumo_rebuild", params, current_user)
+
+
+@router.post('/export', response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+def export(job: CCaixaItemExportJobSchema, current_user: dict = Depends(get_current_user)):
+    """
+    Enfileira a exportação dos itens filtrados em NDJSON ou CSV. Quando a
+    tarefa terminar, o arquivo fica em GET /jobs/{id}/download.
+    """
+    return create_job("caixa_itens_export", job.model_dump(mode="json"), current_user)
+
+
+@router.get('/analytics', response_model=CCaixaItemAnaliseSchema)
+def analytics(
+    agrupar: str = Query("apresentante", pattern="^(apresentante|hora|dia|dia_semana|mes)$"),
+    inicio: Optional[date] = Query(None, description="Data inicial do pagamento (inclusiva)"),
+    fim: Optional[date] = Query(None, description="Data final do pagamento (inclusiva)"),
+    apresentante: Optional[str] = Query(None, description="Prefixo do nome do apresentante"),
+    somente_diferenca: bool = Query(False, description="Só itens com VALOR_PAGO diferente de VALOR_SERVICO"),
+    ordenar: str = Query("quantidade", pattern="^(quantidade|valor_servico|valor_pago|diferenca|grupo)$"),
+    limite: int = Query(50, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Análises ad hoc dos itens de caixa (por apresentante, hora, dia, dia da
+    semana ou mês; diferença entre valor do serviço e valor pago), calculadas
+    sobre uma cópia colunar em memória, sem carga extra no banco de produção.
+    """
+    return get_analytics(agrupar, inicio, fim, apresentante, somente_diferenca, ordenar, limite)
+
 
 # ---------------------- ROTAS DINÂMICAS ----------------------
 
 @router.get('/', response_model=CCaixaItemPaginationSchema)
-def get_items(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1), current_user: dict = Depends(get_current_user)):
+def get_items(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    filtros: CCaixaItemFiltroSchema = Depends(),
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Retorna todos os usuários cadastrados no sistema.
+    Retorna os itens de caixa cadastrados, com filtros opcionais por período de
+    pagamento, prefixo do apresentante e faixa de valor pago.
     """
-    items = get_all_caixa_itens(skip=skip, limit=limit)
-    total = count_items()
-
-    return get_all_caixa_itens(skip=skip, limit=limit)
+    return get_all_caixa_itens(skip=skip, limit=limit, filtros=filtros)
 
 
 @router.get('/{caixa_item_id}', response_model=CCaixaItemSchemaBase, status_code=status.HTTP_200_OK)
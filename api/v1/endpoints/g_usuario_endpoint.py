@@ -1,7 +1,7 @@
 # endpoints/g_usuario_endpoint.py
 
 from typing import List
-from fastapi import APIRouter, status, Depends, HTTPException, Response, Query
+from fastapi import APIRouter, status, Depends, HTTPException, Response, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import JSONResponse
 
@@ -10,26 +10,35 @@ from api.v1.schemas.g_usuario_schema import (
     UserSchemaBase,
     UserSchemaCreate,
     UserSchemaUpdate,
-    UserPaginationSchema
+    UserPaginationSchema,
+    UserSearchResultSchema
 )
 
 # Controller responsável pelas regras de negócio e sanitização
 from api.v1.controllers.g_usuario_controller import (
     authenticate_user,
+    check_login_rate,
+    refund_login_rate,
     create_user,
     get_all,
     get_user_by_id,
     update_user,
     delete_user,
-    count_users
+    search_users
 )
 
+# Configurações (tamanho máximo da página)
+from core.configs import settings
+
 # Dependência para obter o usuário autenticado a partir do token JWT      
-from core.deps import get_current_user
+from core.deps import get_current_user, oauth2_schema, revoke_token
 
 # Função para gerar JWT
 from core.auth import create_access_token
 
+# IP do cliente para o limite de tentativas de login
+from core.rate_limit import client_ip
+
 # Inicializa o roteador responsável pelas rotas de usuários
 router = APIRouter()
 
@@ -44,6 +53,19 @@ def get_logged_user(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
+@router.get('/search', response_model=List[UserSearchResultSchema])
+def get_search_users(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Busca usuários por trecho do nome, login, CPF ou e-mail, sem diferenciar
+    acentos ou maiúsculas. Os resultados vêm ordenados por relevância.
+    """
+    return search_users(q, limit=limit)
+
+
 @router.post('/signup', status_code=status.HTTP_201_CREATED, response_model=UserSchemaBase)
 def post_user(user: UserSchemaCreate):
     """
@@ -59,10 +81,14 @@ def post_user(user: UserSchemaCreate):
 
 
 @router.post('/login')
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
+def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     """
     Realiza login com e-mail e senha, retornando um token JWT válido.
+    Tentativas demais do mesmo IP ou falhas demais para o mesmo e-mail
+    recebem 429.
     """
+    check_login_rate(client_ip(request), form_data.username)
+
     user = authenticate_user(
         email=form_data.username,
         senha_api=form_data.password
@@ -73,6 +99,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail='Invalid login credentials.'
         )
+    refund_login_rate(form_data.username)
 
     return JSONResponse(content={
         "access_token": create_access_token(sub=user["user_id"]),
@@ -80,16 +107,22 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
     })
 
 
+@router.post('/logout', status_code=status.HTTP_204_NO_CONTENT)
+def logout(token: str = Depends(oauth2_schema), current_user: dict = Depends(get_current_user)):
+    """
+    Revoga o token atual até a sua expiração.
+    """
+    revoke_token(token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 # ---------------------- ROTAS DINÂMICAS ----------------------
 
 @router.get('/', response_model=UserPaginationSchema)
-def get_users(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1), current_user: dict = Depends(get_current_user)):
+def get_users(skip: int = Query(0, ge=0), limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE), current_user: dict = Depends(get_current_user)):
     """
     Retorna todos os usuários cadastrados no sistema.
     """
-    usuarios = get_all(skip=skip, limit=limit)
-    total = count_users()
-
     return get_all(skip=skip, limit=limit)
 
 
@@ -0,0 +1,62 @@
+# endpoints/health_endpoint.py
+
+from fastapi import APIRouter, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from core import admission, metrics, warmup
+from core.cache import all_caches
+from core.change_listener import listener as change_listener
+from core.database import get_pool, get_replicas, ping
+from core.jobs import runner as job_runner
+
+# Rotas de saúde da instância, montadas na raiz (fora de /api/v1) para o balanceador
+router = APIRouter()
+
+
+@router.get('/health/live')
+def live():
+    """
+    Liveness: o processo está de pé e atendendo. Não consulta o banco.
+    """
+    return {"status": "ok"}
+
+
+@router.get('/health/ready')
+async def ready():
+    """
+    Readiness: a instância terminou o aquecimento e o banco responde.
+    Retorna 503 enquanto não estiver pronta, para o balanceador não enviar tráfego.
+    """
+    aquecimento = warmup.state.snapshot()
+    banco = {"ok": False, "latency_ms": None, "error": None}
+    try:
+        banco["latency_ms"] = round(await run_in_threadpool(ping) * 1000, 2)
+        banco["ok"] = True
+    except Exception as e:
+        banco["error"] = f"{type(e).__name__}: {e}"
+
+    pronto = aquecimento["ready"] and banco["ok"]
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if pronto else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if pronto else "not_ready",
+            "warmup": aquecimento,
+            "database": banco,
+            "pool": get_pool().stats(),
+            "read_replicas": get_replicas().stats() if get_replicas() is not None else [],
+            "caches": {nome: cache.stats() for nome, cache in all_caches().items()},
+            "change_listener": change_listener.stats(),
+            "jobs": job_runner.stats(),
+            "admission": admission.stats(),
+        },
+    )
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+def metrics_text():
+    """
+    Métricas deste worker no formato do Prometheus (disjuntores e pools do
+    banco, leituras repetidas, entre outras).
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
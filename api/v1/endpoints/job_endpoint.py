@@ -0,0 +1,70 @@
+# endpoints/job_endpoint.py
+
+import os
+from typing import List
+from fastapi import APIRouter, status, Depends
+from fastapi.responses import FileResponse
+
+# Schemas de entrada e saída das tarefas
+from api.v1.schemas.job_schema import JobCreateSchema, JobSchema
+
+# Controller das tarefas em segundo plano
+from api.v1.controllers.job_controller import (
+    create_job,
+    get_job,
+    list_jobs,
+    cancel_job,
+    job_file
+)
+
+# Dependência para obter o usuário autenticado a partir do token JWT
+from core.deps import get_current_user
+
+# Inicializa o roteador responsável pelas rotas de tarefas
+router = APIRouter()
+
+
+# ---------------------- ROTAS FIXAS ----------------------
+
+@router.post('/', response_model=JobSchema, status_code=status.HTTP_202_ACCEPTED)
+def create(job: JobCreateSchema, current_user: dict = Depends(get_current_user)):
+    """
+    Enfileira uma tarefa demorada (exportação, reconstrução do resumo) e
+    responde na hora com o ID. Acompanhe por GET /jobs/{id}.
+    """
+    return create_job(job.tipo, job.params, current_user)
+
+
+@router.get('/', response_model=List[JobSchema])
+def get_all(current_user: dict = Depends(get_current_user)):
+    """
+    Lista as tarefas do usuário autenticado, das mais recentes às mais antigas.
+    """
+    return list_jobs(current_user)
+
+
+# ---------------------- ROTAS DINÂMICAS ----------------------
+
+@router.get('/{job_id}', response_model=JobSchema)
+def get(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Retorna a situação, o progresso e o resultado de uma tarefa.
+    """
+    return get_job(job_id, current_user)
+
+
+@router.delete('/{job_id}', response_model=JobSchema)
+def cancel(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Cancela a tarefa: sai da fila se ainda não começou, ou para no próximo bloco.
+    """
+    return cancel_job(job_id, current_user)
+
+
+@router.get('/{job_id}/download')
+def download(job_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Baixa o arquivo gerado pela tarefa (disponível até expira_em).
+    """
+    caminho = job_file(job_id, current_user)
+    return FileResponse(caminho, filename=os.path.basename(caminho))
@@ -0,0 +1,13 @@
+# endpoints/t_ato_endpoint.py
+
+# Schemas para saída de dados e filtros
+from api.v1.schemas.caixa.t_ato_schema import TAtoSchema, TAtoFiltroSchema
+
+# Descrição da tabela T_ATO para o motor genérico de leitura
+from api.v1.models.caixa.t_ato_model import ATOS
+
+# Rotas geradas a partir do Resource: /, /count, /batch, /export e /{ato_id}
+from core.resource_router import build_router
+
+# Inicializa o roteador responsável pelas rotas de atos
+router = build_router(ATOS, item=TAtoSchema, filtros_schema=TAtoFiltroSchema)
@@ -0,0 +1,249 @@
+# models/c_caixa_analytics_model.py
+#
+# Cópia colunar de C_CAIXA_ITEM na memória do worker, para análises ad hoc
+# (por apresentante, hora, dia, mês; diferença entre VALOR_SERVICO e
+# VALOR_PAGO) sem consultar o banco de produção a cada pergunta.
+#
+#   ids            int64
+#   data           datetime64[s] (NaT quando não há data de pagamento)
+#   servico, pago  int64 em centavos (dinheiro em inteiro escalado)
+#   apresentante   int32, código no dicionário de nomes (-1 = sem nome)
+#
+# A carga é incremental por CAIXA_ITEM_ID (itens novos a cada
+# ANALYTICS_REFRESH_SECONDS) e completa a cada ANALYTICS_RELOAD_SECONDS,
+# que é quando alterações e exclusões de itens antigos aparecem.
+# Requer NumPy (opcional: sem ele a análise fica indisponível).
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from core.configs import settings
+from api.v1.models.caixa.c_caixa_item_model import CCaixaItemModel
+
+ESCALA = 100  # Centavos
+AGRUPAMENTOS = ("apresentante", "hora", "dia", "dia_semana", "mes")
+ORDENACOES = ("quantidade", "valor_servico", "valor_pago", "diferenca", "grupo")
+_CAMPOS = ["caixa_item_id", "data_pagamento", "valor_servico", "valor_pago", "apresentante"]
+_DIAS_SEMANA = ("segunda", "terça", "quarta", "quinta", "sexta", "sábado", "domingo")
+
+
+def numpy_disponivel() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _centavos(valor) -> int:
+    if valor is None:
+        return 0
+    return int((Decimal(str(valor)) * ESCALA).to_integral_value(ROUND_HALF_UP))
+
+
+def _reais(centavos) -> Decimal:
+    return (Decimal(int(centavos)) / ESCALA).quantize(Decimal("0.01"))
+
+
+class _Colunas:
+    """Arrays de uma versão da carga. Nunca são alterados: a atualização cria outra versão."""
+
+    def __init__(self, np, ids, data, servico, pago, apresentante, nomes):
+        self.np = np
+        self.ids = ids
+        self.data = data
+        self.servico = servico
+        self.pago = pago
+        self.apresentante = apresentante
+        self.nomes = nomes      # código -> nome (lista compartilhada, só cresce)
+
+    @property
+    def linhas(self) -> int:
+        return len(self.ids)
+
+    @property
+    def bytes(self) -> int:
+        return sum(a.nbytes for a in (self.ids, self.data, self.servico, self.pago, self.apresentante))
+
+
+class _Armazem:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._colunas: _Colunas | None = None
+        self._codigos: dict[str, int] = {}
+        self._nomes: list[str] = []
+        self.atualizado_em = 0.0
+        self.recarregado_em = 0.0
+        self.carregado_em: datetime | None = None
+
+    def _converter(self, np, itens: list[dict]) -> tuple:
+        codigos = self._codigos
+        apresentantes = []
+        for item in itens:
+            nome = item["apresentante"]
+            if nome is None:
+                apresentantes.append(-1)
+                continue
+            codigo = codigos.get(nome)
+            if codigo is None:
+                codigo = codigos[nome] = len(self._nomes)
+                self._nomes.append(nome)
+            apresentantes.append(codigo)
+        return (
+            np.fromiter((i["caixa_item_id"] for i in itens), dtype=np.int64, count=len(itens)),
+            np.array([i["data_pagamento"] for i in itens], dtype="datetime64[s]"),
+            np.fromiter((_centavos(i["valor_servico"]) for i in itens), dtype=np.int64, count=len(itens)),
+            np.fromiter((_centavos(i["valor_pago"]) for i in itens), dtype=np.int64, count=len(itens)),
+            np.array(apresentantes, dtype=np.int32),
+        )
+
+    def _carregar(self, np, base: _Colunas | None) -> _Colunas:
+        """Lê por chave os itens acima do último ID de `base` e devolve a nova versão."""
+        partes = [] if base is None else [(base.ids, base.data, base.servico, base.pago, base.apresentante)]
+        ultimo = int(base.ids[-1]) if base is not None and base.linhas else None
+        while True:
+            itens = CCaixaItemModel.get_after(ultimo, settings.ANALYTICS_BATCH_SIZE, campos=_CAMPOS)
+            if not itens:
+                break
+            partes.append(self._converter(np, itens))
+            ultimo = itens[-1]["caixa_item_id"]
+            if len(itens) < settings.ANALYTICS_BATCH_SIZE:
+                break
+        if not partes:
+            vazios = self._converter(np, [])
+            return _Colunas(np, *vazios, self._nomes)
+        if len(partes) == 1:
+            return _Colunas(np, *partes[0], self._nomes)
+        return _Colunas(np, *(np.concatenate(coluna) for coluna in zip(*partes)), self._nomes)
+
+    def colunas(self) -> _Colunas:
+        """Versão atual, carregada ou atualizada conforme os intervalos configurados."""
+        import numpy as np
+
+        agora = time.monotonic()
+        atual = self._colunas
+        if atual is not None and agora - self.atualizado_em < settings.ANALYTICS_REFRESH_SECONDS:
+            return atual
+        # Só uma thread carrega; se já houver uma versão, as outras seguem com ela
+        if not self._lock.acquire(blocking=atual is None):
+            return atual
+        try:
+            atual = self._colunas
+            agora = time.monotonic()
+            if atual is not None and agora - self.atualizado_em < settings.ANALYTICS_REFRESH_SECONDS:
+                return atual
+            if atual is None or agora - self.recarregado_em >= settings.ANALYTICS_RELOAD_SECONDS:
+                self._codigos, self._nomes = {}, []
+                atual = self._carregar(np, None)
+                self.recarregado_em = agora
+            else:
+                atual = self._carregar(np, atual)
+            self._colunas = atual
+            self.atualizado_em = agora
+            self.carregado_em = datetime.now()
+            return atual
+        finally:
+            self._lock.release()
+
+
+_armazem = _Armazem()
+
+
+class CCaixaAnalyticsModel:
+    """
+    Consultas de agrupamento e filtro sobre a cópia colunar dos itens de caixa.
+    Lança RuntimeError se a carga falhar.
+    """
+
+    @staticmethod
+    def breakdown(agrupar: str, inicio: date | None = None, fim: date | None = None,
+                  apresentante: str | None = None, somente_diferenca: bool = False,
+                  ordenar: str = "quantidade", limite: int = 50) -> dict:
+        """
+        Agrupa os itens filtrados e retorna, por grupo: quantidade, somas de
+        VALOR_SERVICO e VALOR_PAGO, diferença (serviço - pago) e quantos itens
+        têm diferença. `fim` é inclusivo; `apresentante` filtra por prefixo.
+        """
+        if agrupar not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento inválido: {agrupar}. Disponíveis: {', '.join(AGRUPAMENTOS)}.")
+        if ordenar not in ORDENACOES:
+            raise ValueError(f"Ordenação inválida: {ordenar}. Disponíveis: {', '.join(ORDENACOES)}.")
+
+        inicio_execucao = time.perf_counter()
+        c = _armazem.colunas()
+        np = c.np
+
+        filtro = np.ones(c.linhas, dtype=bool)
+        if agrupar != "apresentante" or inicio or fim:
+            filtro &= ~np.isnat(c.data)
+        if inicio:
+            filtro &= c.data >= np.datetime64(datetime.combine(inicio, datetime.min.time()), "s")
+        if fim:
+            filtro &= c.data < np.datetime64(datetime.combine(fim + timedelta(days=1), datetime.min.time()), "s")
+        if apresentante:
+            prefixo = apresentante.casefold()
+            codigos = [i for i, nome in enumerate(c.nomes) if nome.casefold().startswith(prefixo)]
+            filtro &= np.isin(c.apresentante, np.array(codigos, dtype=np.int32))
+        diferenca = c.servico - c.pago
+        if somente_diferenca:
+            filtro &= diferenca != 0
+
+        if agrupar == "apresentante":
+            chaves = c.apresentante[filtro]
+        else:
+            datas = c.data[filtro]
+            if agrupar == "hora":
+                chaves = datas.astype("datetime64[h]").astype(np.int64) % 24
+            elif agrupar == "dia":
+                chaves = datas.astype("datetime64[D]")
+            elif agrupar == "dia_semana":
+                # 1970-01-01 foi uma quinta-feira: +3 faz segunda-feira = 0
+                chaves = (datas.astype("datetime64[D]").astype(np.int64) + 3) % 7
+            else:
+                chaves = datas.astype("datetime64[M]")
+
+        grupos, posicao = np.unique(chaves, return_inverse=True)
+        quantidade = np.bincount(posicao, minlength=len(grupos))
+        # bincount soma em float64: exato para totais abaixo de 2**53 centavos
+        somar = lambda valores: np.rint(np.bincount(posicao, weights=valores[filtro], minlength=len(grupos))).astype(np.int64)
+        servico, pago, dif = somar(c.servico), somar(c.pago), somar(diferenca)
+        com_diferenca = np.bincount(posicao, weights=(diferenca[filtro] != 0), minlength=len(grupos)).astype(np.int64)
+
+        if ordenar == "grupo" and agrupar == "apresentante":
+            ordem = sorted(range(len(grupos)), key=lambda i: (grupos[i] < 0, c.nomes[int(grupos[i])] if grupos[i] >= 0 else ""))
+        elif ordenar == "grupo":
+            ordem = np.arange(len(grupos))
+        else:
+            valores = {"quantidade": quantidade, "valor_servico": servico, "valor_pago": pago, "diferenca": dif}[ordenar]
+            ordem = np.argsort(-valores, kind="stable")
+
+        def rotulo(grupo):
+            if agrupar == "apresentante":
+                return c.nomes[int(grupo)] if grupo >= 0 else None
+            if agrupar == "hora":
+                return f"{int(grupo):02d}"
+            if agrupar == "dia_semana":
+                return _DIAS_SEMANA[int(grupo)]
+            return str(grupo)
+
+        return {
+            "linhas": c.linhas,
+            "filtradas": int(filtro.sum()),
+            "grupos": len(grupos),
+            "dados": [
+                {
+                    "grupo": rotulo(grupos[i]),
+                    "quantidade": int(quantidade[i]),
+                    "valor_servico": _reais(servico[i]),
+                    "valor_pago": _reais(pago[i]),
+                    "diferenca": _reais(dif[i]),
+                    "quantidade_com_diferenca": int(com_diferenca[i]),
+                }
+                for i in ordem[:limite]
+            ],
+            "memoria_bytes": c.bytes,
+            "carregado_em": _armazem.carregado_em,
+            "tempo_ms": round((time.perf_counter() - inicio_execucao) * 1000, 2),
+        }
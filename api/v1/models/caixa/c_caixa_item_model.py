@@ -1,87 +1,193 @@
 # models/c_caixa_item_model.py
 
-from firebird.driver.types import DatabaseError # Importe esta exceção específica
-from core.database import get_connection
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from core import database # database.DatabaseError: exceção do driver, carregada sob demanda
+from core.database import get_connection, read_with_retry
+from core.resource import Resource, Column, Filter
+from core.parquet_export import ParquetExport
+
+logger = logging.getLogger(__name__)
+
 # Se você tiver core.configs, pode ser útil para logs ou configurações
 # from core.configs import settings
 
+# Índices recomendados para os filtros de /caixa_itens (ver migrations/001_indices_c_caixa_item.sql).
+# A chave é a coluna filtrada, que precisa ser a primeira coluna de algum índice ativo.
+INDICES_RECOMENDADOS = {
+    "DATA_PAGAMENTO": "CREATE INDEX IDX_C_CAIXA_ITEM_DATA_PAGAMENTO ON C_CAIXA_ITEM (DATA_PAGAMENTO)",
+    "APRESENTANTE": "CREATE INDEX IDX_C_CAIXA_ITEM_APRESENTANTE ON C_CAIXA_ITEM (APRESENTANTE)",
+    "VALOR_PAGO": "CREATE INDEX IDX_C_CAIXA_ITEM_VALOR_PAGO ON C_CAIXA_ITEM (VALOR_PAGO)",
+}
+
+# Descrição de C_CAIXA_ITEM para o motor genérico de leitura (core/resource.py).
+# Os filtros recebem valores já convertidos pelo controller.
+CAIXA_ITENS = Resource(
+    name="itens de caixa",
+    table="C_CAIXA_ITEM",
+    key="caixa_item_id",
+    columns={
+        "caixa_item_id": Column("CAIXA_ITEM_ID", int),
+        "descricao": Column("DESCRICAO"),
+        "data_pagamento": Column("DATA_PAGAMENTO", datetime),
+        "valor_servico": Column("VALOR_SERVICO", Decimal),
+        "valor_pago": Column("VALOR_PAGO", Decimal),
+        "apresentante": Column("APRESENTANTE"),
+    },
+    filters={
+        "data_pagamento_inicio": Filter("data_pagamento", ">="),
+        "data_pagamento_fim": Filter("data_pagamento", "<"),
+        "apresentante": Filter("apresentante", "starting"),
+        "valor_pago_min": Filter("valor_pago", ">="),
+        "valor_pago_max": Filter("valor_pago", "<="),
+    },
+)
+
+# Exportação Parquet para BI: uma partição por mês de pagamento, incremental por ID
+CAIXA_ITENS_PARQUET = ParquetExport(
+    resource=CAIXA_ITENS,
+    pasta="c_caixa_item",
+    particionar_por="data_pagamento",
+)
+
 class CCaixaItemModel:
     """
     Classe responsável por interagir diretamente com o banco de dados Firebird.
     Nenhuma validação ou sanitização deve ser feita aqui.
+    As leituras usam o Resource CAIXA_ITENS.
     """
 
     @staticmethod
     def get_by_id(caixa_item_id: int) -> dict | None:
         """
-        Retorna um usuário com base no ID, ou None se não encontrado.
+        Retorna um item com base no ID, ou None se não encontrado.
         Lança exceções em caso de falha no banco de dados.
         """
-        conn = None
-        cur = None
+        return CAIXA_ITENS.get(caixa_item_id)
+
+    @staticmethod
+    def count_items(filtros: dict | None = None) -> int:
+        """
+        Retorna a quantidade de itens, respeitando os filtros informados.
+        """
+        return CAIXA_ITENS.count(filtros)
+
+    @staticmethod
+    def get_all_caixa_itens(skip: int = 0, limit: int = 10, filtros: dict | None = None) -> list[dict]:
+        """
+        Retorna os itens cadastrados no banco de dados, respeitando os filtros informados.
+        Lança exceções em caso de falha no banco de dados.
+        """
+        return CAIXA_ITENS.page_offset(skip=skip, limit=limit, filtros=filtros)
+
+    @staticmethod
+    def get_after(after_id: int | None, limit: int, campos: list[str] | None = None) -> list[dict]:
+        """
+        Retorna até `limit` itens com ID maior que `after_id`, em ordem de ID
+        (itens novos para o feed ao vivo e carga incremental da análise).
+        """
+        return CAIXA_ITENS.page(after=after_id, limit=limit, campos=campos)
+
+    @staticmethod
+    def export(formato: str = "ndjson", filtros: dict | None = None, lote: int = 1000):
+        """
+        Gera a exportação dos itens filtrados em NDJSON ou CSV, em blocos de `lote` linhas.
+        """
+        return CAIXA_ITENS.export(filtros=filtros, formato=formato, lote=lote)
+
+    @staticmethod
+    def get_last_id() -> int | None:
+        """
+        Retorna o maior CAIXA_ITEM_ID, ou None se a tabela estiver vazia.
+        """
+        def consulta(cur):
+            cur.execute("SELECT MAX(CAIXA_ITEM_ID) FROM C_CAIXA_ITEM")
+            return cur.fetchone()[0]
+
         try:
-            conn = get_connection()
-            cur = conn.cursor()
+            return read_with_retry(consulta)
+        except database.DatabaseError as e:
+            logger.error("Database error in get_last_id: %s", e)
+            raise RuntimeError(f"Erro ao buscar o último item de caixa: {e}")
+        except Exception as e:
+            logger.exception("Unexpected error in get_last_id: %s", e)
+            raise RuntimeError(f"Erro inesperado ao buscar o último item de caixa: {e}")
 
+    @staticmethod
+    def get_totals(inicio: datetime, fim: datetime) -> dict:
+        """
+        Retorna quantidade e somas dos itens pagos em [inicio, fim),
+        usando o índice de DATA_PAGAMENTO.
+        """
+        def consulta(cur):
             cur.execute("""
-                SELECT CAIXA_ITEM_ID,
-                       DESCRICAO,
-                       DATA_PAGAMENTO,
-                       VALOR_SERVICO,
-                       VALOR_PAGO,
-                       APRESENTANTE
+                SELECT COUNT(*), COALESCE(SUM(VALOR_SERVICO), 0), COALESCE(SUM(VALOR_PAGO), 0)
                 FROM C_CAIXA_ITEM
-                WHERE CAIXA_ITEM_ID = ?
-            """, (caixa_item_id,))
-            row = cur.fetchone()
-
-            if row:
-                return {
-                    "caixa_item_id": row[0],
-                    "descricao": row[1],
-                    "data_pagamento": row[2],
-                    "valor_servico": row[3],
-                    "valor_pago": row[4],
-                    "apresentante": row[5],
-                }
-            return None
-        except DatabaseError as e:
-            print(f"Database error in get_by_id: {e}")
-            raise RuntimeError(f"Erro ao buscar item por ID no banco de dados: {e}")
+                WHERE DATA_PAGAMENTO >= ? AND DATA_PAGAMENTO < ?
+            """, (inicio, fim))
+            return cur.fetchone()
+
+        try:
+            quantidade, valor_servico, valor_pago = read_with_retry(consulta)
+            return {"quantidade": quantidade, "valor_servico": valor_servico, "valor_pago": valor_pago}
+        except database.DatabaseError as e:
+            logger.error("Database error in get_totals: %s", e)
+            raise RuntimeError(f"Erro ao totalizar os itens de caixa: {e}")
         except Exception as e:
-            print(f"Unexpected error in get_by_id: {e}")
-            raise RuntimeError(f"Erro inesperado ao buscar item por ID: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
+            logger.exception("Unexpected error in get_totals: %s", e)
+            raise RuntimeError(f"Erro inesperado ao totalizar os itens de caixa: {e}")
 
     @staticmethod
-    def count_items() -> int:
+    def get_daily_totals(after_id: int | None = None, ate_id: int | None = None,
+                         desde: datetime | None = None, antes: datetime | None = None) -> list[tuple]:
+        """
+        Retorna (dia, quantidade, soma VALOR_SERVICO, soma VALOR_PAGO, maior ID)
+        por dia de pagamento, para os itens com after_id < ID <= ate_id e
+        desde <= DATA_PAGAMENTO < antes (limites opcionais). Itens sem data vêm com dia None.
         """
-        Retorna a quantidade de usuários.
-        """        
+        condicoes = []
+        params = []
+        if after_id is not None:
+            condicoes.append("CAIXA_ITEM_ID > ?")
+            params.append(after_id)
+        if ate_id is not None:
+            condicoes.append("CAIXA_ITEM_ID <= ?")
+            params.append(ate_id)
+        if desde is not None:
+            condicoes.append("DATA_PAGAMENTO >= ?")
+            params.append(desde)
+        if antes is not None:
+            condicoes.append("DATA_PAGAMENTO < ?")
+            params.append(antes)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+        def consulta(cur):
+            cur.execute(f"""
+                SELECT CAST(DATA_PAGAMENTO AS DATE), COUNT(*),
+                       SUM(VALOR_SERVICO), SUM(VALOR_PAGO), MAX(CAIXA_ITEM_ID)
+                FROM C_CAIXA_ITEM
+                {where}
+                GROUP BY CAST(DATA_PAGAMENTO AS DATE)
+            """, tuple(params))
+            return cur.fetchall()
+
         try:
-            conn = get_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM C_CAIXA_ITEM")
-            total = cur.fetchone()[0]
-            return total
+            # Sem tempo limite: na reconstrução a consulta percorre a tabela inteira
+            return read_with_retry(consulta, timeout=0)
+        except database.DatabaseError as e:
+            logger.error("Database error in get_daily_totals: %s", e)
+            raise RuntimeError(f"Erro ao totalizar os itens de caixa por dia: {e}")
         except Exception as e:
-            raise RuntimeError(f"Erro ao contar itens: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()     
-
+            logger.exception("Unexpected error in get_daily_totals: %s", e)
+            raise RuntimeError(f"Erro inesperado ao totalizar os itens de caixa por dia: {e}")
 
     @staticmethod
-    def get_all_caixa_itens(skip: int = 0, limit: int = 10) -> list[dict]:
+    def colunas_sem_indice() -> list[str]:
         """
-        Retorna todos os itens cadastrados no banco de dados.
-        Lança exceções em caso de falha no banco de dados.
+        Retorna as colunas filtráveis que não são a primeira coluna de nenhum
+        índice ativo de C_CAIXA_ITEM, consultando as tabelas de sistema do Firebird.
         """
         conn = None
         cur = None
@@ -89,40 +195,25 @@ class CCaixaItemModel:
             conn = get_connection()
             cur = conn.cursor()
 
-            query = f"""
-                SELECT FIRST {limit} SKIP {skip}
-                    CAIXA_ITEM_ID,
-                       DESCRICAO,
-                       DATA_PAGAMENTO,
-                       VALOR_SERVICO,
-                       VALOR_PAGO,
-                       APRESENTANTE
-                FROM C_CAIXA_ITEM
-                ORDER BY CAIXA_ITEM_ID
-            """           
-
-            cur.execute(query)
-            rows = cur.fetchall()
-
-            return [
-                {
-                    "caixa_item_id": r[0],
-                    "descricao": r[1],
-                    "data_pagamento": r[2],
-                    "valor_servico": r[3],
-                    "valor_pago": r[4],
-                    "apresentante": r[5],
-                }
-                for r in rows
-            ]
-        except DatabaseError as e:
-            print(f"Database error in get_all: {e}")
-            raise RuntimeError(f"Erro ao buscar todos os itens no banco de dados: {e}")
+            cur.execute("""
+                SELECT TRIM(S.RDB$FIELD_NAME)
+                FROM RDB$INDICES I
+                JOIN RDB$INDEX_SEGMENTS S ON S.RDB$INDEX_NAME = I.RDB$INDEX_NAME
+                WHERE I.RDB$RELATION_NAME = 'C_CAIXA_ITEM'
+                  AND S.RDB$FIELD_POSITION = 0
+                  AND COALESCE(I.RDB$INDEX_INACTIVE, 0) = 0
+            """)
+            indexadas = {r[0] for r in cur.fetchall()}
+
+            return [coluna for coluna in INDICES_RECOMENDADOS if coluna not in indexadas]
+        except database.DatabaseError as e:
+            logger.error("Database error in colunas_sem_indice: %s", e)
+            raise RuntimeError(f"Erro ao verificar os índices de C_CAIXA_ITEM: {e}")
         except Exception as e:
-            print(f"Unexpected error in get_all: {e}")
-            raise RuntimeError(f"Erro inesperado ao buscar todos os itens: {e}")
+            logger.exception("Unexpected error in colunas_sem_indice: %s", e)
+            raise RuntimeError(f"Erro inesperado ao verificar os índices: {e}")
         finally:
             if cur:
                 cur.close()
             if conn:
-                conn.close()    
\ No newline at end of file
+                conn.close()
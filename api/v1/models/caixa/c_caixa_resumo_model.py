@@ -0,0 +1,250 @@
+# models/c_caixa_resumo_model.py
+#
+# Resumo diário de C_CAIXA_ITEM (quantidade, soma de VALOR_SERVICO e de
+# VALOR_PAGO por dia de pagamento) guardado em um arquivo SQLite local.
+# Os relatórios por dia/mês leem o resumo (uma linha por dia) em vez de
+# varrer os itens. O resumo avança pelos itens com CAIXA_ITEM_ID acima da
+# marca d'água e, a cada atualização, refaz por inteiro os dias recentes
+# (hoje e os SUMMARY_RECENT_DAYS anteriores): o Firebird numera o ID no
+# INSERT, não no commit, então um item de ID menor pode ser confirmado
+# depois que um de ID maior já foi somado; refazendo a janela, ele entra na
+# atualização seguinte. Itens confirmados fora de ordem com pagamento mais
+# antigo que a janela, alterações e exclusões de itens antigos só entram com
+# a reconstrução (scripts/resumo_caixa.py ou POST /caixa_itens/resumo/rebuild).
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from core.configs import settings
+from api.v1.models.caixa.c_caixa_item_model import CCaixaItemModel
+
+logger = logging.getLogger(__name__)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS RESUMO_DIARIO (
+    DIA TEXT PRIMARY KEY,           -- AAAA-MM-DD
+    QUANTIDADE INTEGER NOT NULL,
+    VALOR_SERVICO TEXT NOT NULL,    -- Decimal em texto (REAL perderia centavos)
+    VALOR_PAGO TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS CONTROLE (
+    CHAVE TEXT PRIMARY KEY,
+    VALOR TEXT
+);
+"""
+
+# Última atualização incremental feita por este processo (time.monotonic)
+_atualizado_em = 0.0
+
+
+def _conectar(timeout: float = 5.0) -> sqlite3.Connection:
+    pasta = os.path.dirname(settings.SUMMARY_DB_PATH)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    # isolation_level=None: as transações são abertas explicitamente (BEGIN IMMEDIATE)
+    conn = sqlite3.connect(settings.SUMMARY_DB_PATH, timeout=timeout, isolation_level=None)
+    # WAL: os workers leem o resumo enquanto um deles o atualiza
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_ESQUEMA)
+    return conn
+
+
+def _dec(valor) -> Decimal:
+    return Decimal(str(valor)) if valor is not None else Decimal(0)
+
+
+def _dia(valor) -> str | None:
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        valor = valor.date()
+    return valor.isoformat() if isinstance(valor, date) else str(valor)[:10]
+
+
+def _watermark(conn: sqlite3.Connection) -> int | None:
+    linha = conn.execute("SELECT VALOR FROM CONTROLE WHERE CHAVE = 'watermark'").fetchone()
+    return int(linha[0]) if linha and linha[0] is not None else None
+
+
+def _gravar_controle(conn: sqlite3.Connection, watermark: int | None) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO CONTROLE (CHAVE, VALOR) VALUES (?, ?)",
+        [("watermark", None if watermark is None else str(watermark)),
+         ("atualizado_em", datetime.now().isoformat(timespec="seconds"))],
+    )
+
+
+def _somar(conn: sqlite3.Connection, grupos: list[tuple]) -> None:
+    """Soma os totais por dia vindos do Firebird às linhas do resumo."""
+    for dia, quantidade, valor_servico, valor_pago, _ in grupos:
+        dia = _dia(dia)
+        if dia is None:
+            continue  # Itens sem data de pagamento não entram em nenhum dia
+        atual = conn.execute(
+            "SELECT QUANTIDADE, VALOR_SERVICO, VALOR_PAGO FROM RESUMO_DIARIO WHERE DIA = ?", (dia,)
+        ).fetchone() or (0, "0", "0")
+        conn.execute(
+            "INSERT OR REPLACE INTO RESUMO_DIARIO (DIA, QUANTIDADE, VALOR_SERVICO, VALOR_PAGO) VALUES (?, ?, ?, ?)",
+            (dia, atual[0] + quantidade,
+             str(_dec(atual[1]) + _dec(valor_servico)), str(_dec(atual[2]) + _dec(valor_pago))),
+        )
+
+
+def _maior_id(grupos: list[tuple], atual: int | None) -> int | None:
+    ids = [g[4] for g in grupos if g[4] is not None]
+    if atual is not None:
+        ids.append(atual)
+    return max(ids) if ids else None
+
+
+class CCaixaResumoModel:
+    """
+    Acesso ao resumo diário em SQLite. Os totais vêm de CCaixaItemModel
+    (Firebird); aqui só se grava e consulta o resumo.
+    """
+
+    @staticmethod
+    def atualizar(forcar: bool = False) -> dict:
+        """
+        Refaz os dias recentes e soma ao resumo os demais itens com ID acima
+        da marca d'água. Sem `forcar`, respeita o intervalo
+        SUMMARY_REFRESH_SECONDS. Se outro worker estiver atualizando, não
+        espera: o resumo dele vale para todos. Se o resumo ainda não foi
+        construído, não faz nada e retorna `vazio`.
+        """
+        global _atualizado_em
+        if not forcar and time.monotonic() - _atualizado_em < settings.SUMMARY_REFRESH_SECONDS:
+            return {"atualizado": False}
+
+        conn = None
+        try:
+            conn = _conectar(timeout=0.1)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                return {"atualizado": False}  # Outro processo está atualizando
+            try:
+                watermark = _watermark(conn)
+                if watermark is None and not conn.execute("SELECT 1 FROM CONTROLE").fetchone():
+                    # Resumo nunca construído: a carga completa fica para a tarefa
+                    # caixa_resumo_rebuild (ou o script), fora da requisição
+                    conn.execute("ROLLBACK")
+                    return {"atualizado": False, "vazio": True}
+                # Dias recentes: refeitos por inteiro (pega os itens confirmados fora
+                # de ordem de ID); dias anteriores: só os itens acima da marca d'água
+                inicio_janela = date.today() - timedelta(days=settings.SUMMARY_RECENT_DAYS)
+                janela = datetime.combine(inicio_janela, datetime.min.time())
+                recentes = CCaixaItemModel.get_daily_totals(desde=janela)
+                anteriores = CCaixaItemModel.get_daily_totals(after_id=watermark, antes=janela)
+                conn.execute("DELETE FROM RESUMO_DIARIO WHERE DIA >= ?", (inicio_janela.isoformat(),))
+                grupos = recentes + anteriores
+                _somar(conn, grupos)
+                watermark = _maior_id(grupos, watermark)
+                _gravar_controle(conn, watermark)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            _atualizado_em = time.monotonic()
+            return {"atualizado": True, "dias": len(grupos), "watermark": watermark}
+        except sqlite3.Error as e:
+            logger.error("SQLite error in CCaixaResumoModel.atualizar: %s", e)
+            raise RuntimeError(f"Erro ao atualizar o resumo diário do caixa: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def reconstruir(desde: date | None = None, se_vazio: bool = False) -> dict:
+        """
+        Refaz o resumo a partir de C_CAIXA_ITEM: por inteiro ou, com `desde`,
+        só os dias a partir dessa data (até a marca d'água atual, para que a
+        atualização incremental continue de onde estava). Com `se_vazio`, só
+        constrói se ninguém o construiu enquanto se esperava pelo bloqueio.
+        """
+        global _atualizado_em
+        conn = None
+        try:
+            conn = _conectar(timeout=settings.SUMMARY_REBUILD_LOCK_SECONDS)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if se_vazio and conn.execute("SELECT 1 FROM CONTROLE").fetchone():
+                    # Outro worker/tarefa construiu o resumo enquanto se esperava
+                    watermark = _watermark(conn)
+                    conn.execute("ROLLBACK")
+                    return {"atualizado": False, "dias": 0, "watermark": watermark}
+                watermark = _watermark(conn)
+                if desde is not None and watermark is not None:
+                    grupos = CCaixaItemModel.get_daily_totals(
+                        ate_id=watermark, desde=datetime.combine(desde, datetime.min.time())
+                    )
+                    conn.execute("DELETE FROM RESUMO_DIARIO WHERE DIA >= ?", (desde.isoformat(),))
+                else:
+                    grupos = CCaixaItemModel.get_daily_totals()
+                    conn.execute("DELETE FROM RESUMO_DIARIO")
+                    watermark = _maior_id(grupos, None)
+                _somar(conn, grupos)
+                _gravar_controle(conn, watermark)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            _atualizado_em = time.monotonic()
+            return {"atualizado": True, "dias": len(grupos), "watermark": watermark}
+        except sqlite3.Error as e:
+            logger.error("SQLite error in CCaixaResumoModel.reconstruir: %s", e)
+            raise RuntimeError(f"Erro ao reconstruir o resumo diário do caixa: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def get_days(inicio: date, fim: date) -> list[dict]:
+        """
+        Retorna as linhas do resumo entre `inicio` e `fim` (inclusivos), por dia.
+        """
+        conn = None
+        try:
+            conn = _conectar()
+            linhas = conn.execute(
+                """
+                SELECT DIA, QUANTIDADE, VALOR_SERVICO, VALOR_PAGO FROM RESUMO_DIARIO
+                WHERE DIA >= ? AND DIA <= ? ORDER BY DIA
+                """,
+                (inicio.isoformat(), fim.isoformat()),
+            ).fetchall()
+            return [
+                {"dia": date.fromisoformat(dia), "quantidade": quantidade,
+                 "valor_servico": Decimal(servico), "valor_pago": Decimal(pago)}
+                for dia, quantidade, servico, pago in linhas
+            ]
+        except sqlite3.Error as e:
+            logger.error("SQLite error in CCaixaResumoModel.get_days: %s", e)
+            raise RuntimeError(f"Erro ao consultar o resumo diário do caixa: {e}")
+        finally:
+            if conn:
+                conn.close()
+
+    @staticmethod
+    def get_status() -> dict:
+        """
+        Retorna a marca d'água e o momento da última atualização do resumo.
+        """
+        conn = None
+        try:
+            conn = _conectar()
+            controle = dict(conn.execute("SELECT CHAVE, VALOR FROM CONTROLE").fetchall())
+            return {
+                "watermark": int(controle["watermark"]) if controle.get("watermark") else None,
+                "atualizado_em": controle.get("atualizado_em"),
+            }
+        except sqlite3.Error as e:
+            logger.error("SQLite error in CCaixaResumoModel.get_status: %s", e)
+            raise RuntimeError(f"Erro ao consultar o resumo diário do caixa: {e}")
+        finally:
+            if conn:
+                conn.close()
@@ -0,0 +1,45 @@
+# models/t_ato_model.py
+
+from datetime import datetime, date
+from decimal import Decimal
+
+from core.resource import Resource, Column, Filter, Include
+
+# T_ATO é a tabela de maior volume: a listagem pagina por chave (ATO_ID > último
+# visto, sem SKIP), busca só as colunas pedidas e traz os pagamentos de uma
+# página inteira em uma única consulta com JOIN (ver core/resource.py).
+ATOS = Resource(
+    name="atos",
+    table="T_ATO",
+    key="ato_id",
+    columns={
+        "ato_id": Column("ATO_ID", int),
+        "protocolo": Column("PROTOCOLO"),
+        "livro": Column("LIVRO"),
+        "folha": Column("FOLHA"),
+        "tipo_ato": Column("TIPO_ATO"),
+        "data_ato": Column("DATA_ATO", datetime),
+        "situacao": Column("SITUACAO"),
+    },
+    filters={
+        "data_ato_inicio": Filter("data_ato", "date_from", date),
+        "data_ato_fim": Filter("data_ato", "date_to", date),
+        "tipo_ato": Filter("tipo_ato"),
+        "situacao": Filter("situacao"),
+        "protocolo": Filter("protocolo"),
+    },
+    includes={
+        # Pagamentos (C_CAIXA_ITEM) vinculados ao ato por ATO_ID
+        "pagamentos": Include(
+            table="C_CAIXA_ITEM",
+            foreign_key="ATO_ID",
+            columns={
+                "caixa_item_id": Column("CAIXA_ITEM_ID", int),
+                "descricao": Column("DESCRICAO"),
+                "data_pagamento": Column("DATA_PAGAMENTO", datetime),
+                "valor_servico": Column("VALOR_SERVICO", Decimal),
+                "valor_pago": Column("VALOR_PAGO", Decimal),
+            },
+        ),
+    },
+)
@@ -1,14 +1,79 @@
 # models/g_usuario_model.py
 
-from firebird.driver.types import DatabaseError # Importe esta exceção específica
-from core.database import get_connection
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from core import database # database.DatabaseError: exceção do driver, carregada sob demanda
+from core.database import get_connection, read_with_retry
+from core.resource import Resource, Column
+from core.parquet_export import ParquetExport
+
+logger = logging.getLogger(__name__)
+
 # Se você tiver core.configs, pode ser útil para logs ou configurações
 # from core.configs import settings
 
+# Descrição de G_USUARIO para o motor genérico de leitura (core/resource.py).
+# SENHA_API fica de fora: só get_by_email (login) a lê.
+USUARIOS = Resource(
+    name="usuários",
+    table="G_USUARIO",
+    key="usuario_id",
+    columns={
+        "usuario_id": Column("USUARIO_ID", int),
+        "trocarsenha": Column("TROCARSENHA"),
+        "login": Column("LOGIN"),
+        "situacao": Column("SITUACAO"),
+        "nome_completo": Column("NOME_COMPLETO"),
+        "funcao": Column("FUNCAO"),
+        "assina": Column("ASSINA"),
+        "sigla": Column("SIGLA"),
+        "usuario_tab": Column("USUARIO_TAB", Decimal),
+        "ultimo_login": Column("ULTIMO_LOGIN", datetime),
+        "ultimo_login_regs": Column("ULTIMO_LOGIN_REGS", datetime),
+        "data_expiracao": Column("DATA_EXPIRACAO", datetime),
+        "andamento_padrao": Column("ANDAMENTO_PADRAO", Decimal),
+        "lembrete_pergunta": Column("LEMBRETE_PERGUNTA"),
+        "lembrete_resposta": Column("LEMBRETE_RESPOSTA"),
+        "andamento_padrao2": Column("ANDAMENTO_PADRAO2", Decimal),
+        "receber_mensagem_arrolamento": Column("RECEBER_MENSAGEM_ARROLAMENTO"),
+        "email": Column("EMAIL"),
+        "assina_certidao": Column("ASSINA_CERTIDAO"),
+        "receber_email_penhora": Column("RECEBER_EMAIL_PENHORA"),
+        "foto": Column("FOTO", bytes),
+        "nao_receber_chat_todos": Column("NAO_RECEBER_CHAT_TODOS"),
+        "pode_alterar_caixa": Column("PODE_ALTERAR_CAIXA"),
+        "receber_chat_certidao_online": Column("RECEBER_CHAT_CERTIDAO_ONLINE"),
+        "receber_chat_cancelamento": Column("RECEBER_CHAT_CANCELAMENTO"),
+        "cpf": Column("CPF"),
+        "somente_leitura": Column("SOMENTE_LEITURA"),
+        "receber_chat_envio_onr": Column("RECEBER_CHAT_ENVIO_ONR"),
+        "tipo_usuario": Column("TIPO_USUARIO"),
+        "data_cadastro": Column("DATA_CADASTRO", datetime),
+        "telefone": Column("TELEFONE"),
+    },
+)
+
+# Exportação Parquet para BI: sem dados sigilosos (SENHA_API já não está no
+# Resource; o lembrete de senha também não sai) nem a foto. Reescrita a cada
+# execução: a tabela é pequena e alterações de cadastro não aparecem numa carga por ID.
+USUARIOS_PARQUET = ParquetExport(
+    resource=USUARIOS,
+    pasta="g_usuario",
+    excluir=("lembrete_pergunta", "lembrete_resposta", "foto"),
+    incremental=False,
+)
+
+# Campos usados pelo índice de busca de usuários
+CAMPOS_BUSCA = ["usuario_id", "nome_completo", "login", "cpf", "email"]
+
+
 class UserModel:
     """
     Classe responsável por interagir diretamente com o banco de dados Firebird.
     Nenhuma validação ou sanitização deve ser feita aqui.
+    As leituras por ID e as listagens usam o Resource USUARIOS.
     """
 
     @staticmethod
@@ -17,18 +82,17 @@ class UserModel:
         Retorna um usuário com base no e-mail, ou None se não encontrado.
         Lança exceções em caso de falha no banco de dados.
         """
-        conn = None
-        cur = None
-        try:
-            conn = get_connection()
-            cur = conn.cursor()
-
+        def consulta(cur):
             cur.execute("""
                 SELECT USUARIO_ID, EMAIL, SENHA_API, NOME_COMPLETO
                 FROM G_USUARIO
                 WHERE EMAIL = ?
             """, (email,))
-            row = cur.fetchone()
+            return cur.fetchone()
+
+        try:
+            # No primário: a senha recém-alterada tem que valer já no próximo login
+            row = read_with_retry(consulta, read_only=False)
 
             if row:
                 return {
@@ -38,19 +102,14 @@ class UserModel:
                     "nome_completo": row[3],
                 }
             return None
-        except DatabaseError as e:
+        except database.DatabaseError as e:
             # Erros específicos do Firebird (ex: problema na conexão, query inválida)
-            print(f"Database error in get_by_email: {e}")
+            logger.error("Database error in get_by_email: %s", e)
             raise RuntimeError(f"Erro ao buscar usuário por e-mail no banco de dados: {e}")
         except Exception as e:
             # Qualquer outro erro inesperado
-            print(f"Unexpected error in get_by_email: {e}")
+            logger.exception("Unexpected error in get_by_email: %s", e)
             raise RuntimeError(f"Erro inesperado ao buscar usuário por e-mail: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
 
     @staticmethod
     def get_by_id(user_id: int) -> dict | None:
@@ -58,61 +117,17 @@ class UserModel:
         Retorna um usuário com base no ID, ou None se não encontrado.
         Lança exceções em caso de falha no banco de dados.
         """
-        conn = None
-        cur = None
-        try:
-            conn = get_connection()
-            cur = conn.cursor()
-
-            cur.execute("""
-                SELECT USUARIO_ID, 
-                       NOME_COMPLETO, 
-                       EMAIL,
-                       TELEFONE
-                FROM G_USUARIO
-                WHERE USUARIO_ID = ?
-            """, (user_id,))
-            row = cur.fetchone()
-
-            if row:
-                return {
-                    "user_id": row[0],
-                    "nome_completo": row[1],
-                    "email": row[2],
-                    "telefone": row[3],
-                }
-            return None
-        except DatabaseError as e:
-            print(f"Database error in get_by_id: {e}")
-            raise RuntimeError(f"Erro ao buscar usuário por ID no banco de dados: {e}")
-        except Exception as e:
-            print(f"Unexpected error in get_by_id: {e}")
-            raise RuntimeError(f"Erro inesperado ao buscar usuário por ID: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
+        user = USUARIOS.get(user_id, campos=["nome_completo", "email", "telefone"])
+        if user:
+            user["user_id"] = user.pop("usuario_id")
+        return user
 
     @staticmethod
     def count_users() -> int:
         """
         Retorna a quantidade de usuários.
-        """        
-        try:
-            conn = get_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM G_USUARIO")
-            total = cur.fetchone()[0]
-            return total
-        except Exception as e:
-            raise RuntimeError(f"Erro ao contar usuários: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()     
-
+        """
+        return USUARIOS.count()
 
     @staticmethod
     def get_all(skip: int = 0, limit: int = 10) -> list[dict]:
@@ -120,99 +135,19 @@ class UserModel:
         Retorna todos os usuários cadastrados no banco de dados.
         Lança exceções em caso de falha no banco de dados.
         """
-        conn = None
-        cur = None
-        try:
-            conn = get_connection()
-            cur = conn.cursor()
+        return USUARIOS.page_offset(skip=skip, limit=limit)
 
-            query = f"""
-                SELECT FIRST {limit} SKIP {skip}
-                    USUARIO_ID, 
-                    TROCARSENHA, 
-                    LOGIN, 
-                    SITUACAO, 
-                    NOME_COMPLETO, 
-                    FUNCAO,
-                    ASSINA, 
-                    SIGLA, 
-                    USUARIO_TAB, 
-                    ULTIMO_LOGIN, 
-                    ULTIMO_LOGIN_REGS,
-                    DATA_EXPIRACAO,
-                    ANDAMENTO_PADRAO, 
-                    LEMBRETE_PERGUNTA, 
-                    LEMBRETE_RESPOSTA,
-                    ANDAMENTO_PADRAO2, 
-                    RECEBER_MENSAGEM_ARROLAMENTO, 
-                    EMAIL, 
-                    ASSINA_CERTIDAO,
-                    RECEBER_EMAIL_PENHORA, 
-                    FOTO, 
-                    NAO_RECEBER_CHAT_TODOS, 
-                    PODE_ALTERAR_CAIXA,
-                    RECEBER_CHAT_CERTIDAO_ONLINE, 
-                    RECEBER_CHAT_CANCELAMENTO, 
-                    CPF, 
-                    SOMENTE_LEITURA,
-                    RECEBER_CHAT_ENVIO_ONR, 
-                    TIPO_USUARIO, 
-                    DATA_CADASTRO,
-                    TELEFONE
-                FROM G_USUARIO
-                ORDER BY USUARIO_ID
-            """           
-
-            cur.execute(query)
-            rows = cur.fetchall()
-
-            return [
-                {
-                    "usuario_id": r[0],
-                    "trocarsenha": r[1],
-                    "login": r[2],
-                    "situacao": r[3],
-                    "nome_completo": r[4],
-                    "funcao": r[5],
-                    "assina": r[6],
-                    "sigla": r[7],
-                    "usuario_tab": r[8],
-                    "ultimo_login": r[9],
-                    "ultimo_login_regs": r[10],
-                    "data_expiracao": r[11],
-                    "andamento_padrao": r[12],
-                    "lembrete_pergunta": r[13],
-                    "lembrete_resposta": r[14],
-                    "andamento_padrao2": r[15],
-                    "receber_mensagem_arrolamento": r[16],
-                    "email": r[17],
-                    "assina_certidao": r[18],
-                    "receber_email_penhora": r[19],
-                    "foto": r[20],
-                    "nao_receber_chat_todos": r[21],
-                    "pode_alterar_caixa": r[22],
-                    "receber_chat_certidao_online": r[23],
-                    "receber_chat_cancelamento": r[24],
-                    "cpf": r[25],
-                    "somente_leitura": r[26],
-                    "receber_chat_envio_onr": r[27],
-                    "tipo_usuario": r[28],
-                    "data_cadastro": r[29],
-                    "telefone": r[30],
-                }
-                for r in rows
-            ]
-        except DatabaseError as e:
-            print(f"Database error in get_all: {e}")
-            raise RuntimeError(f"Erro ao buscar todos os usuários no banco de dados: {e}")
-        except Exception as e:
-            print(f"Unexpected error in get_all: {e}")
-            raise RuntimeError(f"Erro inesperado ao buscar todos os usuários: {e}")
-        finally:
-            if cur:
-                cur.close()
-            if conn:
-                conn.close()
+    @staticmethod
+    def get_search_rows(user_id: int | None = None) -> list[dict]:
+        """
+        Retorna os campos usados pelo índice de busca de usuários
+        (todos os usuários ou apenas o ID informado).
+        Lança exceções em caso de falha no banco de dados.
+        """
+        if user_id is not None:
+            user = USUARIOS.get(user_id, campos=CAMPOS_BUSCA)
+            return [user] if user else []
+        return list(USUARIOS.stream(campos=CAMPOS_BUSCA))
 
     @staticmethod
     def create(nome_completo: str, email: str, senha_api: str) -> dict | None:
@@ -251,7 +186,7 @@ class UserModel:
                 "nome_completo": nome_completo,
                 "email": email,
             }
-        except DatabaseError as e:
+        except database.DatabaseError as e:
             if conn:
                 conn.rollback() # Desfaz a transação em caso de erro no DB
             error_message = str(e).lower()
@@ -276,7 +211,7 @@ class UserModel:
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Unexpected error in create: {e}")
+            logger.exception("Unexpected error in create: %s", e)
             raise RuntimeError(f"Erro inesperado ao criar usuário: {e}")
         finally:
             if cur:
@@ -331,7 +266,7 @@ class UserModel:
             conn.commit()
 
             return True
-        except DatabaseError as e:
+        except database.DatabaseError as e:
             if conn:
                 conn.rollback()
             error_message = str(e).lower()
@@ -346,7 +281,7 @@ class UserModel:
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Unexpected error in update: {e}")
+            logger.exception("Unexpected error in update: %s", e)
             raise RuntimeError(f"Erro inesperado ao atualizar usuário: {e}")
         finally:
             if cur:
@@ -374,10 +309,10 @@ class UserModel:
             conn.commit()
 
             return True
-        except DatabaseError as e:
+        except database.DatabaseError as e:
             if conn:
                 conn.rollback()
-            print(f"Database error in delete: {e}")
+            logger.error("Database error in delete: %s", e)
             raise RuntimeError(f"Erro no banco de dados ao excluir usuário: {e}")
         except KeyError as e:
             # Re-lança a exceção de não encontrado
@@ -385,7 +320,7 @@ class UserModel:
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Unexpected error in delete: {e}")
+            logger.exception("Unexpected error in delete: %s", e)
             raise RuntimeError(f"Erro inesperado ao excluir usuário: {e}")
         finally:
             if cur:
@@ -1,8 +1,8 @@
 # schemas/c_caixa_item_schema.py
 
-from typing import Optional, List
+from typing import Literal, Optional, List
 from pydantic import BaseModel, EmailStr
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal
 
 # Schema base usado para representar um caixa_item retornado pela API
@@ -31,4 +31,54 @@ class CCaixaItemPaginationSchema(BaseModel):
     total: int
     skip: int
     limit: int
-    data: List[CCaixaItemSchemaList]        
\ No newline at end of file
+    data: List[CCaixaItemSchemaList]
+
+
+# Filtros aceitos na listagem de itens (todos opcionais)
+class CCaixaItemFiltroSchema(BaseModel):
+    data_pagamento_inicio: Optional[date] = None    # Data inicial do pagamento (inclusiva)
+    data_pagamento_fim: Optional[date] = None       # Data final do pagamento (inclusiva)
+    apresentante: Optional[str] = None              # Prefixo do nome do apresentante
+    valor_pago_min: Optional[Decimal] = None        # Valor pago mínimo
+    valor_pago_max: Optional[Decimal] = None        # Valor pago máximo
+
+
+# Totais do dia enviados pelo feed ao vivo (/caixa_itens/feed)
+class CCaixaItemTotaisSchema(BaseModel):
+    dia: date
+    quantidade: int
+    valor_servico: Decimal
+    valor_pago: Decimal
+
+
+# Um grupo da análise em memória (/caixa_itens/analytics)
+class CCaixaItemAnaliseGrupoSchema(BaseModel):
+    grupo: Optional[str] = None
+    quantidade: int
+    valor_servico: Decimal
+    valor_pago: Decimal
+    diferenca: Decimal                  # Soma de VALOR_SERVICO - VALOR_PAGO
+    quantidade_com_diferenca: int       # Itens em que os dois valores diferem
+
+
+class CCaixaItemAnaliseSchema(BaseModel):
+    agrupar: str
+    linhas: int                         # Itens carregados na memória
+    filtradas: int                      # Itens que atendem aos filtros
+    grupos: int                         # Total de grupos (a lista vem limitada)
+    memoria_bytes: int
+    carregado_em: Optional[datetime] = None
+    tempo_ms: float
+    data: List[CCaixaItemAnaliseGrupoSchema]
+
+
+# Parâmetros da exportação de itens em segundo plano (tarefa caixa_itens_export)
+class CCaixaItemExportJobSchema(BaseModel):
+    formato: Literal["ndjson", "csv"] = "ndjson"
+    filtros: CCaixaItemFiltroSchema = CCaixaItemFiltroSchema()
+
+
+# Ticket do feed ao vivo (GET /caixa_itens/feed?ticket=...)
+class CCaixaFeedTicketSchema(BaseModel):
+    ticket: str
+    expires_in: int                         # Segundos até o ticket vencer
@@ -0,0 +1,31 @@
+# schemas/c_caixa_resumo_schema.py
+
+from typing import Optional, List
+from pydantic import BaseModel
+from datetime import date
+from decimal import Decimal
+
+
+# Totais de um período (dia AAAA-MM-DD ou mês AAAA-MM)
+class CCaixaResumoPeriodoSchema(BaseModel):
+    periodo: str
+    quantidade: int
+    valor_servico: Decimal
+    valor_pago: Decimal
+
+
+# Resposta de GET /caixa_itens/resumo
+class CCaixaResumoSchema(BaseModel):
+    agrupar: str
+    inicio: date
+    fim: date
+    watermark: Optional[int] = None         # Maior CAIXA_ITEM_ID já somado ao resumo
+    atualizado_em: Optional[str] = None     # Última atualização do resumo (horário do servidor)
+    total: CCaixaResumoPeriodoSchema
+    data: List[CCaixaResumoPeriodoSchema]
+
+
+# Parâmetros da reconstrução em segundo plano (tarefa caixa_resumo_rebuild)
+class CCaixaResumoRebuildJobSchema(BaseModel):
+    desde: Optional[date] = None            # Refaz só os dias a partir desta data
+    se_vazio: bool = False                  # Só constrói se o resumo ainda estiver vazio (carga inicial)
@@ -1,73 +1,41 @@
 # schemas/t_ato_schema.py
 
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-
-# Schema base usado para representar um usuário retornado pela API
-class TAtoSchemaBase(BaseModel):
-    user_id: Optional[int] = None       # ID do usuário (opcional)
-    nome_completo: Optional[str] = None     # Nome completo do usuário
-    email: Optional[EmailStr] = None    # E-mail validado do usuário
+from pydantic import BaseModel
+from datetime import datetime, date
+from decimal import Decimal
+
+
+# Pagamento (C_CAIXA_ITEM) vinculado a um ato
+class TAtoPagamentoSchema(BaseModel):
+    caixa_item_id: Optional[int] = None
+    descricao: Optional[str] = None
+    data_pagamento: Optional[datetime] = None
+    valor_servico: Optional[Decimal] = None
+    valor_pago: Optional[Decimal] = None
+
+
+# Schema de um ato. Todos os campos são opcionais porque a API devolve apenas
+# os campos pedidos em `fields` (os demais ficam de fora da resposta).
+# A página da listagem (limit/next_after/data) é gerada em core/resource_router.py
+class TAtoSchema(BaseModel):
+    ato_id: Optional[int] = None
+    protocolo: Optional[str] = None
+    livro: Optional[str] = None
+    folha: Optional[str] = None
+    tipo_ato: Optional[str] = None
+    data_ato: Optional[datetime] = None
+    situacao: Optional[str] = None
+    pagamentos: Optional[List[TAtoPagamentoSchema]] = None
 
     class Config:
         from_attributes = True  # Permite construir a partir de dicts ou ORMs (mesmo sem ORM aqui)
 
 
-# Schema usado para criação de um novo usuário
-class TAtoSchemaCreate(BaseModel):
-    nome_completo: str                    # Nome completo obrigatório
-    email: EmailStr                   # E-mail obrigatório e validado
-    senha_api: str                     # Senha enviada pelo cliente (será criptografada no backend)
-
-
-# Schema usado para atualização de dados do usuário
-# Todos os campos são opcionais para permitir atualizações parciais
-class TAtoSchemaUpdate(BaseModel):
-    nome_completo: Optional[str] = None   # Atualização do nome, se fornecido
-    email: Optional[EmailStr] = None  # Atualização do e-mail, se fornecido
-    senha_api: Optional[str] = None    # Atualização da senha, se fornecida
-
-    class Config:
-        from_attributes = True
-
-
-# Schema para listagem de registros com paginação
-class TAtoSchemaList(BaseModel):
-    usuario_id: float  # USUARIO_ID NUMERIC(10,2)
-    trocarsenha: Optional[str]
-    login: Optional[str]
-    situacao: Optional[str]
-    nome_completo: Optional[str]
-    funcao: Optional[str]
-    assina: Optional[str]
-    sigla: Optional[str]
-    usuario_tab: Optional[float]  # NUMERIC(10,2)
-    ultimo_login: Optional[datetime]
-    ultimo_login_regs: Optional[datetime]
-    data_expiracao: Optional[datetime]
-    andamento_padrao: Optional[float]  # NUMERIC(10,2)
-    lembrete_pergunta: Optional[str]
-    lembrete_resposta: Optional[str]
-    andamento_padrao2: Optional[float]  # NUMERIC(10,2)
-    receber_mensagem_arrolamento: Optional[str]
-    email: Optional[EmailStr]  # ou Optional[str] se preferir mais flexível
-    assina_certidao: Optional[str]
-    receber_email_penhora: Optional[str]
-    foto: Optional[bytes]  # BLOB SUB_TYPE BINARY
-    nao_receber_chat_todos: Optional[str]
-    pode_alterar_caixa: Optional[str]
-    receber_chat_certidao_online: Optional[str]
-    receber_chat_cancelamento: Optional[str]
-    cpf: Optional[str]
-    somente_leitura: Optional[str]
-    receber_chat_envio_onr: Optional[str]
-    tipo_usuario: Optional[str]
-    data_cadastro: Optional[datetime]
-
-
-class TAtoPaginationSchema(BaseModel):
-    total: int
-    skip: int
-    limit: int
-    data: List[TAtoSchemaList]
+# Filtros aceitos na listagem e na exportação de atos (todos opcionais)
+class TAtoFiltroSchema(BaseModel):
+    data_ato_inicio: Optional[date] = None      # Data inicial do ato (inclusiva)
+    data_ato_fim: Optional[date] = None         # Data final do ato (inclusiva)
+    tipo_ato: Optional[str] = None              # Tipo do ato
+    situacao: Optional[str] = None              # Situação do ato
+    protocolo: Optional[str] = None             # Número do protocolo
@@ -74,3 +74,13 @@ class UserPaginationSchema(BaseModel):
     skip: int
     limit: int
     data: List[UserSchemaList]
+
+
+# Schema de um resultado da busca de usuários (/usuarios/search)
+class UserSearchResultSchema(BaseModel):
+    usuario_id: float  # USUARIO_ID NUMERIC(10,2)
+    nome_completo: Optional[str] = None
+    login: Optional[str] = None
+    cpf: Optional[str] = None
+    email: Optional[str] = None  # str simples: há e-mails legados fora do padrão
+    score: float                 # Relevância do resultado (maior é melhor)
@@ -0,0 +1,36 @@
+# schemas/job_schema.py
+
+from typing import Any, Optional, List
+from pydantic import BaseModel
+
+
+# Pedido de uma tarefa em segundo plano (POST /jobs)
+class JobCreateSchema(BaseModel):
+    tipo: str                               # Ex: caixa_itens_export, caixa_resumo_rebuild, parquet_export
+    params: dict[str, Any] = {}             # Parâmetros do tipo (validados pelo schema de cada tipo)
+
+
+# Situação de uma tarefa
+class JobSchema(BaseModel):
+    id: str
+    tipo: str
+    params: dict[str, Any]
+    estado: str                             # pendente, executando, concluido, falhou ou cancelado
+    progresso: float                        # 0 a 1
+    mensagem: Optional[str] = None
+    resultado: Optional[dict[str, Any]] = None
+    erro: Optional[str] = None
+    criado_em: str
+    iniciado_em: Optional[str] = None
+    terminado_em: Optional[str] = None
+    expira_em: Optional[str] = None         # Quando a tarefa e seus arquivos serão apagados
+    download_url: Optional[str] = None      # Presente quando há arquivo de resultado
+
+
+# Parâmetros da exportação Parquet para BI (sempre incremental; refazer do
+# zero só pelo script: python scripts/export_parquet.py --full)
+class ParquetExportJobSchema(BaseModel):
+    tabelas: Optional[List[str]] = None     # Padrão: todas
+
+    class Config:
+        extra = "forbid"                    # Recusa "completo" em vez de ignorar
@@ -0,0 +1,109 @@
+# benchmarks/bench_external.py
+#
+# Compara o cliente HTTP antigo (um httpx.AsyncClient novo por chamada) com o
+# cliente compartilhado de services/http_client contra a API externa simulada
+# (mock_external_api.py, iniciada aqui mesmo em uma thread), e o enriquecimento
+# de uma página sequencial x em lote (services/fanout).
+#
+# Uso: python benchmarks/bench_external.py [--calls 200] [--distinct 50] [--fail-rate 0.05]
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+import httpx
+
+import mock_external_api
+
+
+async def _medir(chamada, params: list[str]) -> tuple[list[float], int]:
+    latencias, erros = [], 0
+    for param in params:
+        inicio = time.perf_counter()
+        try:
+            await chamada(param)
+        except Exception:
+            erros += 1
+        latencias.append(time.perf_counter() - inicio)
+    return latencias, erros
+
+
+def _resumo(nome: str, latencias: list[float], erros: int) -> None:
+    ordenadas = sorted(latencias)
+    p99 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))]
+    print(f"{nome:<28} média {statistics.fmean(ordenadas) * 1000:8.2f} ms  "
+          f"p99 {p99 * 1000:8.2f} ms  erros {erros}")
+
+
+async def executar(args, base_url: str) -> None:
+    from core.configs import settings
+    settings.EXTERNAL_API_BASE_URL = base_url
+
+    from services.http_client import start_http_client, close_http_client
+    from services.api_externa_1 import buscar_dados_externos
+    from services.fanout import buscar_em_lote
+
+    params = [f"ato-{i % args.distinct}" for i in range(args.calls)]
+
+    async def antigo(param: str):
+        # Comportamento anterior: cliente (e conexão) novos a cada chamada
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(f"{base_url}/{param}")
+            response.raise_for_status()
+            return response.json()
+
+    _resumo("cliente por chamada", *await _medir(antigo, params))
+
+    cliente = start_http_client()
+    try:
+        _resumo("cliente compartilhado", *await _medir(buscar_dados_externos, params))
+
+        # Página de itens enriquecida: sequencial x em lote (cache limpo nos dois)
+        pagina = [f"pagina-{i}" for i in range(args.page)]
+        cliente.cache.clear()
+        inicio = time.perf_counter()
+        for param in pagina:
+            await buscar_dados_externos(param)
+        sequencial = time.perf_counter() - inicio
+        cliente.cache.clear()
+        inicio = time.perf_counter()
+        lote = await buscar_em_lote(pagina)
+        em_lote = time.perf_counter() - inicio
+        print(f"página de {args.page}: sequencial {sequencial * 1000:.1f} ms, "
+              f"em lote {em_lote * 1000:.1f} ms ({len(lote.errors)} erros)")
+
+        print(f"\ncache: {cliente.cache.stats()}")
+        print(f"disjuntores: {cliente.stats()['breakers']}")
+    finally:
+        await close_http_client()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cliente HTTP por chamada x compartilhado")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=50, help="parâmetros distintos (o resto repete)")
+    parser.add_argument("--page", type=int, default=100, help="itens da página enriquecida em lote")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    estado = mock_external_api.MockState(args.latency_ms / 1000, args.fail_rate, max_age=60, semente=42)
+    servidor = mock_external_api.servir("127.0.0.1", 0, estado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(executar(args, f"http://127.0.0.1:{servidor.server_address[1]}"))
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
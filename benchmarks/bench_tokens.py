@@ -0,0 +1,101 @@
+# benchmarks/bench_tokens.py
+#
+# Mede a vazão (operações por segundo) de emissão e verificação de tokens JWT
+# para cada algoritmo suportado por core.signing, e para a implementação
+# anterior com python-jose (quando instalada), como referência.
+#
+# Uso: python benchmarks/bench_tokens.py [--seconds 1.0]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.signing import KeyRing, HMACSigner, EdDSASigner, ECDSASigner
+
+
+def _payload() -> dict:
+    agora = int(time.time())
+    return {"type": "access_token", "exp": agora + 3600, "iat": agora, "sub": "123"}
+
+
+def _vazao(funcao, segundos: float) -> float:
+    # Repete a função em lotes até completar o tempo pedido
+    n = 0
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    while True:
+        for _ in range(100):
+            funcao()
+        n += 100
+        agora = time.perf_counter()
+        if agora >= fim:
+            return n / (agora - inicio)
+
+
+def _keyrings() -> dict:
+    keyrings = {}
+
+    hs = KeyRing()
+    hs.add(HMACSigner("hs-1", "segredo-de-benchmark"), active=True)
+    keyrings["HS256"] = hs
+
+    try:
+        from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+    except ImportError:
+        print("cryptography não instalado: EdDSA e ES256 ignorados")
+        return keyrings
+
+    ed = KeyRing()
+    ed.add(EdDSASigner("ed-1", private_key=ed25519.Ed25519PrivateKey.generate()), active=True)
+    keyrings["EdDSA"] = ed
+
+    es = KeyRing()
+    es.add(ECDSASigner("es-1", private_key=ec.generate_private_key(ec.SECP256R1())), active=True)
+    keyrings["ES256"] = es
+
+    return keyrings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vazão de emissão/verificação de tokens JWT")
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'algoritmo':<22} {'emissão/s':>12} {'verificação/s':>14}")
+
+    for nome, keyring in _keyrings().items():
+        token = keyring.encode(_payload())
+        emitir = _vazao(lambda: keyring.encode(_payload()), args.seconds)
+        verificar = _vazao(lambda: keyring.decode(token), args.seconds)
+        print(f"{nome:<22} {emitir:12.0f} {verificar:14.0f}")
+
+    # Referência: implementação anterior (python-jose + pytz)
+    try:
+        from datetime import datetime, timedelta
+        from jose import jwt
+        from pytz import timezone
+    except ImportError:
+        print("python-jose/pytz não instalados: referência anterior ignorada")
+        return
+
+    def emitir_jose():
+        sp = timezone('America/Sao_Paulo')
+        payload = {
+            "type": "access_token",
+            "exp": datetime.now(tz=sp) + timedelta(hours=1),
+            "iat": datetime.now(tz=sp),
+            "sub": "123",
+        }
+        return jwt.encode(payload, "segredo-de-benchmark", algorithm="HS256")
+
+    token = emitir_jose()
+    emitir = _vazao(emitir_jose, args.seconds)
+    verificar = _vazao(lambda: jwt.decode(token, "segredo-de-benchmark", algorithms=["HS256"]), args.seconds)
+    print(f"{'HS256 (python-jose)':<22} {emitir:12.0f} {verificar:14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# benchmarks/dataset.py
+#
+# Cria e popula o banco SQLite usado pelo fake_firebird com dados sintéticos,
+# porém determinísticos (mesma semente -> mesmos dados), de G_USUARIO e
+# C_CAIXA_ITEM.
+
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+# Credenciais do usuário de benchmark (usadas no cenário de login)
+BENCH_EMAIL = "bench@orius.com.br"
+BENCH_SENHA = "benchmark"
+
+# Versão do esquema: mudar força a recriação dos arquivos já gerados
+_VERSAO_ESQUEMA = "4"
+
+_SCHEMA = """
+CREATE TABLE G_USUARIO (
+    USUARIO_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    TROCARSENHA TEXT, LOGIN TEXT, SITUACAO TEXT, NOME_COMPLETO TEXT, FUNCAO TEXT,
+    ASSINA TEXT, SIGLA TEXT, USUARIO_TAB NUMERIC, ULTIMO_LOGIN TEXT, ULTIMO_LOGIN_REGS TEXT,
+    DATA_EXPIRACAO TEXT, ANDAMENTO_PADRAO NUMERIC, LEMBRETE_PERGUNTA TEXT, LEMBRETE_RESPOSTA TEXT,
+    ANDAMENTO_PADRAO2 NUMERIC, RECEBER_MENSAGEM_ARROLAMENTO TEXT, EMAIL TEXT, ASSINA_CERTIDAO TEXT,
+    RECEBER_EMAIL_PENHORA TEXT, FOTO BLOB, NAO_RECEBER_CHAT_TODOS TEXT, PODE_ALTERAR_CAIXA TEXT,
+    RECEBER_CHAT_CERTIDAO_ONLINE TEXT, RECEBER_CHAT_CANCELAMENTO TEXT, CPF TEXT, SOMENTE_LEITURA TEXT,
+    RECEBER_CHAT_ENVIO_ONR TEXT, TIPO_USUARIO TEXT, DATA_CADASTRO TEXT, TELEFONE TEXT, SENHA_API TEXT
+);
+CREATE UNIQUE INDEX G_USUARIO_EMAIL ON G_USUARIO (EMAIL);
+
+CREATE TABLE C_CAIXA_ITEM (
+    CAIXA_ITEM_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    DESCRICAO TEXT,
+    DATA_PAGAMENTO TEXT,
+    VALOR_SERVICO NUMERIC,
+    VALOR_PAGO NUMERIC,
+    APRESENTANTE TEXT,
+    ATO_ID INTEGER
+);
+CREATE INDEX IDX_C_CAIXA_ITEM_ATO_ID ON C_CAIXA_ITEM (ATO_ID);
+
+CREATE TABLE T_ATO (
+    ATO_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    PROTOCOLO TEXT, LIVRO TEXT, FOLHA TEXT, TIPO_ATO TEXT, DATA_ATO TEXT, SITUACAO TEXT
+);
+CREATE INDEX IDX_T_ATO_DATA_ATO ON T_ATO (DATA_ATO);
+
+-- Tabelas de sistema do Firebird consultadas pela verificação de índices
+CREATE TABLE RDB$INDICES (RDB$INDEX_NAME TEXT, RDB$RELATION_NAME TEXT, RDB$INDEX_INACTIVE INTEGER);
+CREATE TABLE RDB$INDEX_SEGMENTS (RDB$INDEX_NAME TEXT, RDB$FIELD_NAME TEXT, RDB$FIELD_POSITION INTEGER);
+-- Tabela de uma linha usada pelo ping de /health/ready (SELECT 1 FROM RDB$DATABASE)
+CREATE TABLE RDB$DATABASE (RDB$RELATION_ID INTEGER);
+INSERT INTO RDB$DATABASE VALUES (128);
+
+CREATE TABLE BENCH_META (CHAVE TEXT PRIMARY KEY, VALOR TEXT);
+"""
+
+# Índices equivalentes aos de migrations/001_indices_c_caixa_item.sql
+_INDICES = {
+    "IDX_C_CAIXA_ITEM_DATA_PAGAMENTO": "DATA_PAGAMENTO",
+    "IDX_C_CAIXA_ITEM_APRESENTANTE": "APRESENTANTE",
+    "IDX_C_CAIXA_ITEM_VALOR_PAGO": "VALOR_PAGO",
+}
+
+_NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elaine", "Fábio", "Gisele", "Hélio", "Iara", "João",
+          "Karina", "Luís", "Márcia", "Nélson", "Otávio", "Patrícia", "Renata", "Sérgio", "Tânia", "Vítor"]
+_SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Conceição", "Pereira", "Lima", "Gonçalves",
+               "Araújo", "Ribeiro", "Almeida", "Carvalho", "Gomes", "Martins", "Rocha"]
+_SERVICOS = ["Reconhecimento de firma", "Autenticação", "Certidão de nascimento", "Escritura",
+             "Procuração", "Registro de imóvel", "Protesto", "Averbação"]
+
+
+def _nome(rng: random.Random) -> str:
+    return f"{rng.choice(_NOMES)} {rng.choice(_SOBRENOMES)} {rng.choice(_SOBRENOMES)}"
+
+
+def email_usuario(i: int) -> str:
+    """E-mail do i-ésimo usuário gerado (1 = usuário de benchmark); todos usam BENCH_SENHA."""
+    return BENCH_EMAIL if i == 1 else f"usuario{i}@orius.com.br"
+
+
+def _linhas_usuarios(rng: random.Random, total: int, senha_hash: str):
+    base = datetime(2020, 1, 1)
+    for i in range(1, total + 1):
+        email = email_usuario(i)
+        cadastro = base + timedelta(minutes=rng.randrange(2_000_000))
+        yield (
+            "N", f"USR{i}", "A", _nome(rng), "Escrevente", "N", f"U{i}", 1, cadastro.isoformat(sep=" "),
+            None, None, 0, None, None, 0, "N", email, "N", "N", None, "N", "S", "N", "N",
+            f"{rng.randrange(10**11):011d}", "N", "N", "1", cadastro.isoformat(sep=" "),
+            f"(62) 9{rng.randrange(10**8):08d}", senha_hash,
+        )
+
+
+def _linhas_itens(rng: random.Random, total: int, atos: int, rng_atos: random.Random):
+    base = datetime(2023, 1, 1, 8)
+    for _ in range(total):
+        pagamento = base + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+        valor = rng.randrange(500, 200_000)  # centavos
+        pago = valor if rng.random() < 0.9 else rng.randrange(0, valor)
+        # ~90% dos itens pagam um ato (gerador separado: os demais campos não mudam)
+        ato_id = rng_atos.randint(1, atos) if atos and rng_atos.random() < 0.9 else None
+        yield (
+            rng.choice(_SERVICOS), pagamento.isoformat(sep=" "),
+            f"{valor // 100}.{valor % 100:02d}", f"{pago // 100}.{pago % 100:02d}", _nome(rng), ato_id,
+        )
+
+
+def _linhas_atos(rng: random.Random, total: int):
+    base = datetime(2023, 1, 1, 8)
+    for i in range(1, total + 1):
+        data = base + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+        yield (
+            f"{i:08d}", str(1 + i // 300), str(1 + i % 300), rng.choice(_SERVICOS),
+            data.isoformat(sep=" "), rng.choice(["L", "L", "L", "C"]),
+        )
+
+
+def _meta(db: sqlite3.Connection) -> dict:
+    try:
+        return dict(db.execute("SELECT CHAVE, VALOR FROM BENCH_META"))
+    except sqlite3.Error:
+        return {}
+
+
+def atos_para(itens: int) -> int:
+    """Quantidade de atos gerada para uma escala (cerca de um ato a cada dois itens de caixa)."""
+    return max(1, itens // 2)
+
+
+def build(path: str, usuarios: int, itens: int, semente: int = 42, com_indices: bool = True) -> str:
+    """
+    Garante que `path` contenha o conjunto de dados pedido, reaproveitando o
+    arquivo se ele já foi gerado com os mesmos parâmetros.
+    """
+    esperado = {"usuarios": str(usuarios), "itens": str(itens), "semente": str(semente), "indices": str(com_indices),
+                "esquema": _VERSAO_ESQUEMA}
+
+    if os.path.exists(path):
+        db = sqlite3.connect(path)
+        meta = _meta(db)
+        db.close()
+        if meta == esperado:
+            return path
+        os.remove(path)
+
+    # O hash é calculado uma vez só e compartilhado: o custo do bcrypt fica no login, não na carga
+    from core.security import hash_senha_api
+    senha_hash = hash_senha_api(BENCH_SENHA)
+
+    rng = random.Random(semente)
+    atos = atos_para(itens)
+    db = sqlite3.connect(path)
+    db.executescript(_SCHEMA)
+    db.executemany(
+        "INSERT INTO G_USUARIO (TROCARSENHA, LOGIN, SITUACAO, NOME_COMPLETO, FUNCAO, ASSINA, SIGLA, USUARIO_TAB, "
+        "ULTIMO_LOGIN, ULTIMO_LOGIN_REGS, DATA_EXPIRACAO, ANDAMENTO_PADRAO, LEMBRETE_PERGUNTA, LEMBRETE_RESPOSTA, "
+        "ANDAMENTO_PADRAO2, RECEBER_MENSAGEM_ARROLAMENTO, EMAIL, ASSINA_CERTIDAO, RECEBER_EMAIL_PENHORA, FOTO, "
+        "NAO_RECEBER_CHAT_TODOS, PODE_ALTERAR_CAIXA, RECEBER_CHAT_CERTIDAO_ONLINE, RECEBER_CHAT_CANCELAMENTO, CPF, "
+        "SOMENTE_LEITURA, RECEBER_CHAT_ENVIO_ONR, TIPO_USUARIO, DATA_CADASTRO, TELEFONE, SENHA_API) "
+        "VALUES (" + ", ".join("?" * 31) + ")",
+        _linhas_usuarios(rng, usuarios, senha_hash),
+    )
+    db.executemany(
+        "INSERT INTO C_CAIXA_ITEM (DESCRICAO, DATA_PAGAMENTO, VALOR_SERVICO, VALOR_PAGO, APRESENTANTE, ATO_ID) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        _linhas_itens(rng, itens, atos, random.Random(semente + 1)),
+    )
+    db.executemany(
+        "INSERT INTO T_ATO (PROTOCOLO, LIVRO, FOLHA, TIPO_ATO, DATA_ATO, SITUACAO) VALUES (?, ?, ?, ?, ?, ?)",
+        _linhas_atos(random.Random(semente + 2), atos),
+    )
+
+    if com_indices:
+        for nome, coluna in _INDICES.items():
+            db.execute(f"CREATE INDEX {nome} ON C_CAIXA_ITEM ({coluna})")
+            db.execute("INSERT INTO RDB$INDICES VALUES (?, 'C_CAIXA_ITEM', 0)", (nome,))
+            db.execute("INSERT INTO RDB$INDEX_SEGMENTS VALUES (?, ?, 0)", (nome, coluna))
+
+    db.executemany("INSERT INTO BENCH_META VALUES (?, ?)", esperado.items())
+    db.commit()
+    db.execute("ANALYZE")
+    db.close()
+    return path
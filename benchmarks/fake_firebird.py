@@ -0,0 +1,164 @@
+# benchmarks/fake_firebird.py
+#
+# Substituto local do Firebird para benchmarks: imita a interface do
+# firebird-driver usada pela API (connect / cursor / execute / fetch* /
+# commit / rollback / close) sobre um arquivo SQLite, traduzindo as poucas
+# construções específicas do Firebird que os models utilizam.
+#
+# Não é um emulador completo: serve para exercitar o caminho real da API
+# (FastAPI -> controllers -> models) sem depender do servidor remoto.
+
+import re
+import sqlite3
+import sys
+import types
+from datetime import date, datetime
+from decimal import Decimal
+
+
+class DatabaseError(Exception):
+    """Equivalente ao firebird.driver.types.DatabaseError."""
+
+
+# Tipos Python usados pela API que o SQLite não conhece nativamente
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(sep=" "))
+sqlite3.register_adapter(date, lambda v: v.isoformat())
+
+_FIRST_SKIP = re.compile(r"\bSELECT\s+FIRST\s+(\?|\d+)(?:\s+SKIP\s+(\?|\d+))?", re.IGNORECASE)
+_STARTING_WITH = re.compile(r"\bSTARTING\s+WITH\s+\?", re.IGNORECASE)
+
+
+def _fim_do_select(sql: str, inicio: int) -> int | None:
+    """Posição do ')' que fecha o SELECT iniciado em `inicio`, ou None se ele não estiver entre parênteses."""
+    if sql[:inicio].count("(") <= sql[:inicio].count(")"):
+        return None
+    nivel = 0
+    for i in range(inicio, len(sql)):
+        if sql[i] == "(":
+            nivel += 1
+        elif sql[i] == ")":
+            if nivel == 0:
+                return i
+            nivel -= 1
+    return None
+
+
+def translate(sql: str, params: tuple = ()) -> tuple[str, tuple]:
+    """Converte o SQL no dialeto do Firebird para o dialeto do SQLite."""
+    params = list(params or ())
+
+    match = _FIRST_SKIP.search(sql)
+    if match:
+        first, skip = match.group(1), match.group(2)
+        # Parâmetros de FIRST/SKIP vêm antes de todos os outros da consulta
+        if first == "?":
+            first = str(int(params.pop(0)))
+        if skip == "?":
+            skip = str(int(params.pop(0)))
+        limite = f" LIMIT {first} OFFSET {skip or 0}"
+        sql = sql[:match.start()] + "SELECT" + sql[match.end():]
+        fim = _fim_do_select(sql, match.start())
+        if fim is None:
+            sql = sql.rstrip().rstrip(";") + limite
+        else:
+            # FIRST dentro de uma tabela derivada: o LIMIT fica dentro dos parênteses
+            sql = sql[:fim] + limite + sql[fim:]
+
+    sql = _STARTING_WITH.sub("LIKE ? || '%'", sql)
+    return sql, tuple(params)
+
+
+class FakeCursor:
+
+    def __init__(self, conn: "FakeConnection"):
+        self._conn = conn
+        self._cur = conn._db.cursor()
+
+    def execute(self, operation: str, parameters: tuple = ()):
+        sql, params = translate(operation, parameters)
+        try:
+            self._cur.execute(sql, params)
+        except sqlite3.Error as e:
+            raise DatabaseError(str(e)) from e
+        return self
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size: int = 1):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def close(self):
+        self._cur.close()
+
+
+class FakeConnection:
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def execute_immediate(self, sql: str) -> None:
+        # Só configurações de sessão (ex: SET STATEMENT TIMEOUT), sem efeito no SQLite
+        pass
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def close(self):
+        self._db.close()
+
+
+# Caminho do arquivo SQLite usado por todas as conexões falsas
+DATABASE_PATH = ":memory:"
+
+
+def connect(dsn: str = "", user: str = "", password: str = "", charset: str = "UTF8", **kwargs) -> FakeConnection:
+    return FakeConnection(DATABASE_PATH)
+
+
+def install(path: str) -> None:
+    """
+    Direciona a API para o banco SQLite em `path`.
+
+    Se o firebird-driver não estiver instalado, registra este módulo no lugar
+    dele para que os models possam ser importados.
+    """
+    global DATABASE_PATH
+    DATABASE_PATH = path
+
+    try:
+        import firebird.driver  # noqa: F401
+        import firebird.driver.types as fb_types
+        # Os models capturam a exceção do driver real: as falsas precisam ser subclasses dela
+        global DatabaseError
+        DatabaseError = type("DatabaseError", (fb_types.DatabaseError,), {})
+    except ImportError:
+        driver = types.ModuleType("firebird.driver")
+        driver.connect = connect
+        driver_types = types.ModuleType("firebird.driver.types")
+        driver_types.DatabaseError = DatabaseError
+        driver.types = driver_types
+        firebird = sys.modules.setdefault("firebird", types.ModuleType("firebird"))
+        firebird.driver = driver
+        sys.modules["firebird.driver"] = driver
+        sys.modules["firebird.driver.types"] = driver_types
+
+    import core.database
+    core.database.connect = connect
@@ -0,0 +1,109 @@
+# benchmarks/import_profile.py
+#
+# Auditoria do tempo de importação na partida da API. Executa `import main`
+# em processos novos com `python -X importtime`, soma o custo por pacote,
+# lista os módulos mais caros e compara o tempo de partida a frio com uma meta.
+#
+# Uso:
+#   python benchmarks/import_profile.py                  # 5 execuções, top 25
+#   python benchmarks/import_profile.py --target-ms 600  # falha (exit 1) se a mediana passar da meta
+#   python benchmarks/import_profile.py --json saida.json
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Meta de partida a frio (importar main e criar o app), em milissegundos
+COLD_START_TARGET_MS = 800
+
+# Módulos que devem ser carregados só sob demanda (primeira conexão, primeiro login...)
+LAZY_MODULES = ["firebird.driver", "passlib", "bcrypt", "jose", "cryptography"]
+
+# Linha do -X importtime: "import time:   self [us] | cumulative | imported package"
+_LINHA = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_PROGRAMA = (
+    "import sys, time; sys.path.insert(0, {raiz!r}); t = time.perf_counter(); "
+    "import main; sys.stdout.write(str((time.perf_counter() - t) * 1000)); "
+    "sys.stdout.write('\\n' + ' '.join(sorted(sys.modules)))"
+)
+
+
+def medir() -> tuple[float, list[tuple[str, int, int, int]], set[str]]:
+    """Importa main em um processo novo; retorna (ms, [(módulo, self_us, cumulativo_us, nível)], módulos)."""
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROGRAMA.format(raiz=RAIZ)],
+        cwd=RAIZ, capture_output=True, text=True,
+    )
+    if processo.returncode != 0:
+        sys.stderr.write(processo.stderr)
+        raise SystemExit("Falha ao importar main (dependências instaladas?)")
+
+    tempo_ms, modulos = processo.stdout.split("\n", 1)
+    linhas = []
+    for linha in processo.stderr.splitlines():
+        m = _LINHA.match(linha)
+        if m:
+            linhas.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return float(tempo_ms), linhas, set(modulos.split())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo de importação na partida da API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--target-ms", type=float, default=COLD_START_TARGET_MS)
+    parser.add_argument("--json", help="grava o relatório neste arquivo")
+    args = parser.parse_args()
+
+    tempos = []
+    for _ in range(args.runs):
+        tempo_ms, linhas, modulos = medir()
+        tempos.append(tempo_ms)
+
+    # Detalhes por módulo da última execução (caches de bytecode já aquecidos)
+    por_modulo = sorted(linhas, key=lambda l: -l[2])
+    por_pacote = defaultdict(int)
+    for nome, self_us, _, _ in linhas:
+        por_pacote[nome.split(".")[0]] += self_us
+
+    mediana = statistics.median(tempos)
+    print(f"import main: mediana {mediana:.1f} ms em {args.runs} execuções (meta {args.target_ms:.0f} ms)\n")
+
+    print(f"{'pacote':<32} {'self (ms)':>10}")
+    for pacote, us in sorted(por_pacote.items(), key=lambda p: -p[1])[:args.top]:
+        print(f"{pacote:<32} {us / 1000:10.2f}")
+
+    print(f"\n{'módulo':<48} {'cumulativo (ms)':>16}")
+    for nome, _, cumulativo, nivel in por_modulo[:args.top]:
+        print(f"{nome:<48} {cumulativo / 1000:16.2f}")
+
+    carregados = [m for m in LAZY_MODULES if m in modulos]
+    if carregados:
+        print(f"\nATENÇÃO: módulos que deveriam ser carregados sob demanda já na partida: {', '.join(carregados)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": time.time(),
+                "median_ms": mediana,
+                "runs_ms": tempos,
+                "target_ms": args.target_ms,
+                "packages_self_ms": {p: us / 1000 for p, us in por_pacote.items()},
+                "eager_lazy_modules": carregados,
+            }, f, indent=2)
+
+    if mediana > args.target_ms:
+        raise SystemExit(f"Partida a frio acima da meta: {mediana:.1f} ms > {args.target_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+# benchmarks/loadgen.py
+#
+# Gerador de carga em malha aberta com a mistura de tráfego de um cartório:
+# login, /usuarios/logado e listagem/detalhe de /caixa_itens/.
+#
+# Em malha aberta as requisições partem no horário agendado pela taxa alvo,
+# independentemente de as anteriores já terem respondido; a latência é medida
+# a partir do horário agendado, então filas no servidor aparecem nos números
+# (sem "coordinated omission").
+#
+# Uso:
+#   # App em processo (ASGI) sobre o Firebird simulado
+#   python benchmarks/loadgen.py --rps 50 --duration 60
+#
+#   # Instância real via HTTP (um --email por escrevente; os tokens se repetem se houver menos)
+#   python benchmarks/loadgen.py --url http://localhost:8000 --email a@y --email b@y --password ... --rps 30
+#
+#   # Mistura personalizada (pesos relativos)
+#   python benchmarks/loadgen.py --mix login=1,logado=10,caixa_lista=4,caixa_detalhe=8
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+# Mistura padrão: cada escrevente faz login raramente e consulta o caixa com frequência
+MIX_PADRAO = {"login": 1, "logado": 10, "caixa_lista": 4, "caixa_detalhe": 8}
+
+# Limites (em ms) das faixas do histograma de latência
+FAIXAS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+
+class Histograma:
+    """Histograma de latência com faixas fixas e lista completa para percentis."""
+
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_MS) + 1)
+        self.valores: list[float] = []
+
+    def registrar(self, ms: float) -> None:
+        self.contagens[bisect.bisect_left(FAIXAS_MS, ms)] += 1
+        self.valores.append(ms)
+
+    def percentil(self, p: float) -> float:
+        if not self.valores:
+            return 0.0
+        ordenados = sorted(self.valores)
+        return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+    def resumo(self) -> dict:
+        faixas = {}
+        anterior = 0
+        for limite, n in zip(FAIXAS_MS + [None], self.contagens):
+            rotulo = f"{anterior}-{limite}ms" if limite is not None else f">{anterior}ms"
+            faixas[rotulo] = n
+            anterior = limite
+        return {
+            "count": len(self.valores),
+            "p50_ms": round(self.percentil(50), 2),
+            "p90_ms": round(self.percentil(90), 2),
+            "p99_ms": round(self.percentil(99), 2),
+            "max_ms": round(max(self.valores), 2) if self.valores else 0.0,
+            "histogram": faixas,
+        }
+
+
+def parse_mix(texto: str) -> dict:
+    mix = {}
+    for parte in texto.split(","):
+        nome, _, peso = parte.partition("=")
+        mix[nome.strip()] = float(peso)
+    return mix
+
+
+class Cenario:
+    """Monta as requisições de cada tipo de operação."""
+
+    def __init__(self, prefixo: str, email: str, senha: str, tokens: list[str], max_item_id: int, rng: random.Random):
+        self.prefixo = prefixo
+        self.email = email
+        self.senha = senha
+        self.tokens = tokens
+        self.max_item_id = max_item_id
+        self.rng = rng
+
+    def _auth(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def requisicao(self, operacao: str) -> tuple[str, str, dict]:
+        if operacao == "login":
+            return "POST", f"{self.prefixo}/usuarios/login", {"data": {"username": self.email, "password": self.senha}}
+        if operacao == "logado":
+            return "GET", f"{self.prefixo}/usuarios/logado", {"headers": self._auth()}
+        if operacao == "caixa_lista":
+            skip = self.rng.choice([0, 0, 0, 50, 100, 500])  # a maioria olha a primeira página
+            return "GET", f"{self.prefixo}/caixa_itens/?skip={skip}&limit=50", {"headers": self._auth()}
+        if operacao == "caixa_detalhe":
+            return "GET", f"{self.prefixo}/caixa_itens/{self.rng.randint(1, self.max_item_id)}", {"headers": self._auth()}
+        raise ValueError(f"Operação desconhecida: {operacao}")
+
+
+async def executar_carga(client, cenario: Cenario, mix: dict, rps: float, duracao: float,
+                         max_em_voo: int, poisson: bool, rng: random.Random) -> dict:
+    operacoes = list(mix)
+    pesos = [mix[o] for o in operacoes]
+    histogramas = {o: Histograma() for o in operacoes}
+    status = {o: Counter() for o in operacoes}
+    descartadas = Counter()
+    em_voo: set[asyncio.Task] = set()
+
+    async def disparar(operacao: str, agendado: float):
+        metodo, url, kwargs = cenario.requisicao(operacao)
+        try:
+            resposta = await client.request(metodo, url, **kwargs)
+            status[operacao][resposta.status_code] += 1
+        except Exception as e:
+            status[operacao][type(e).__name__] += 1
+        histogramas[operacao].registrar((time.perf_counter() - agendado) * 1000)
+
+    inicio = time.perf_counter()
+    proximo = inicio
+    fim = inicio + duracao
+    while proximo < fim:
+        agora = time.perf_counter()
+        if proximo > agora:
+            await asyncio.sleep(proximo - agora)
+
+        operacao = rng.choices(operacoes, pesos)[0]
+        if len(em_voo) >= max_em_voo:
+            # O cliente não acompanha a taxa: registra em vez de atrasar o agendamento
+            descartadas[operacao] += 1
+        else:
+            tarefa = asyncio.create_task(disparar(operacao, proximo))
+            em_voo.add(tarefa)
+            tarefa.add_done_callback(em_voo.discard)
+
+        intervalo = rng.expovariate(rps) if poisson else 1.0 / rps
+        proximo += intervalo
+
+    if em_voo:
+        await asyncio.gather(*em_voo)
+    decorrido = time.perf_counter() - inicio
+
+    resultado = {}
+    for operacao in operacoes:
+        total = sum(status[operacao].values())
+        erros = sum(n for codigo, n in status[operacao].items() if not (isinstance(codigo, int) and codigo < 400))
+        resultado[operacao] = {
+            **histogramas[operacao].resumo(),
+            "status": {str(k): v for k, v in status[operacao].items()},
+            "error_rate": round(erros / total, 4) if total else 0.0,
+            "dropped": descartadas[operacao],
+        }
+
+    concluidas = sum(r["count"] for r in resultado.values())
+    return {
+        "target_rps": rps,
+        "achieved_rps": round(concluidas / decorrido, 2),
+        "duration_s": round(decorrido, 2),
+        "operations": resultado,
+    }
+
+
+def imprimir(resultado: dict) -> None:
+    print(f"alvo {resultado['target_rps']} req/s, atingido {resultado['achieved_rps']} req/s "
+          f"em {resultado['duration_s']} s")
+    for operacao, r in resultado["operations"].items():
+        print(f"\n{operacao}: {r['count']} req, p50 {r['p50_ms']} ms, p90 {r['p90_ms']} ms, "
+              f"p99 {r['p99_ms']} ms, erros {r['error_rate'] * 100:.2f}%, descartadas {r['dropped']}")
+        maior = max(r["histogram"].values()) or 1
+        for faixa, n in r["histogram"].items():
+            if n:
+                print(f"  {faixa:>14} {n:7d} {'#' * max(1, round(n / maior * 40))}")
+
+
+async def principal(args) -> dict:
+    import httpx
+
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix) if args.mix else dict(MIX_PADRAO)
+    limites = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limites)
+        prefixo = args.prefix
+        emails, senha = args.email, args.password
+        max_item_id = args.max_item_id
+    else:
+        import dataset
+        import fake_firebird
+        from run_benchmarks import ESCALAS
+
+        escala = ESCALAS[args.scale]
+        os.makedirs(args.data_dir, exist_ok=True)
+        caminho = os.path.join(args.data_dir, f"bench_{args.scale}_{args.seed}.sqlite")
+        dataset.build(caminho, escala["usuarios"], escala["itens"], semente=args.seed)
+        fake_firebird.install(caminho)
+
+        from main import app
+        from core.configs import settings
+
+        # Todos os logins saem do mesmo cliente: o limite de tentativas recusaria a carga
+        settings.LOGIN_RATE_LIMIT_ENABLED = False
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=args.timeout)
+        prefixo = settings.API_V1_STR
+        # Um usuário distinto do banco simulado por escrevente
+        emails = [dataset.email_usuario(i) for i in range(1, min(args.clerks, escala["usuarios"]) + 1)]
+        senha = dataset.BENCH_SENHA
+        max_item_id = escala["itens"]
+
+    async with client:
+        # Cada escrevente simulado entra com um usuário (os e-mails se repetem
+        # se houver mais escreventes que usuários) e usa o seu próprio token
+        tokens = []
+        for i in range(args.clerks):
+            email = emails[i % len(emails)]
+            resposta = await client.post(f"{prefixo}/usuarios/login", data={"username": email, "password": senha})
+            resposta.raise_for_status()
+            tokens.append(resposta.json()["access_token"])
+
+        cenario = Cenario(prefixo, emails[0], senha, tokens, max_item_id, rng)
+        return await executar_carga(client, cenario, mix, args.rps, args.duration,
+                                    args.max_in_flight, not args.constant, rng)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gerador de carga em malha aberta")
+    parser.add_argument("--url", help="URL base da instância (padrão: app em processo via ASGI)")
+    parser.add_argument("--prefix", default="/api/v1")
+    parser.add_argument("--email", action="append", help="e-mail de login (modo HTTP; repetível, um por escrevente)")
+    parser.add_argument("--password", help="senha de login (modo HTTP; a mesma para todos os e-mails)")
+    parser.add_argument("--max-item-id", type=int, default=10_000, help="maior CAIXA_ITEM_ID para detalhes (modo HTTP)")
+    parser.add_argument("--scale", default="small", help="escala do banco simulado (modo ASGI)")
+    parser.add_argument("--data-dir", default=os.path.join(RAIZ, "benchmarks", ".data"))
+    parser.add_argument("--mix", help="pesos, ex: login=1,logado=10,caixa_lista=4,caixa_detalhe=8")
+    parser.add_argument("--rps", type=float, default=20.0, help="taxa alvo de requisições por segundo")
+    parser.add_argument("--duration", type=float, default=30.0, help="duração em segundos")
+    parser.add_argument("--clerks", type=int, default=10, help="escreventes simulados (um login e um token por escrevente)")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--constant", action="store_true", help="intervalo constante em vez de chegadas de Poisson")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="grava o resultado neste arquivo JSON")
+    args = parser.parse_args()
+
+    if args.url and not (args.email and args.password):
+        parser.error("--email e --password são obrigatórios com --url")
+
+    resultado = asyncio.run(principal(args))
+    imprimir(resultado)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/mock_external_api.py
+#
+# Servidor HTTP local que imita a API externa usada por services/api_externa_1,
+# para testar o cliente compartilhado (cache, novas tentativas, disjuntor) sem
+# depender da API real. Responde GET /<param> com um JSON, com latência e
+# taxa de falhas configuráveis, Cache-Control: max-age e ETag (responde 304
+# a If-None-Match).
+#
+# Uso:
+#   python benchmarks/mock_external_api.py --port 8081 --latency-ms 30 --fail-rate 0.1
+#   EXTERNAL_API_BASE_URL=http://127.0.0.1:8081 uvicorn main:app
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockState:
+    def __init__(self, latency: float, fail_rate: float, max_age: int, semente: int):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.max_age = max_age
+        self.rng = random.Random(semente)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.not_modified = 0
+
+
+def criar_handler(estado: MockState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # mantém a conexão aberta (keep-alive)
+
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, status: int, corpo: bytes = b"", cabecalhos: dict | None = None):
+            self.send_response(status)
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            if corpo:
+                self.wfile.write(corpo)
+
+        def do_GET(self):
+            with estado.lock:
+                estado.requests += 1
+                falhar = estado.rng.random() < estado.fail_rate
+            if estado.latency:
+                time.sleep(estado.latency)
+
+            if self.path == "/_stats":
+                corpo = json.dumps({
+                    "requests": estado.requests,
+                    "failures": estado.failures,
+                    "not_modified": estado.not_modified,
+                }).encode()
+                self._responder(200, corpo, {"Content-Type": "application/json", "Cache-Control": "no-store"})
+                return
+
+            if falhar:
+                with estado.lock:
+                    estado.failures += 1
+                self._responder(503, b'{"detail": "indisponivel"}', {"Content-Type": "application/json", "Retry-After": "0"})
+                return
+
+            param = self.path.lstrip("/")
+            corpo = json.dumps({"param": param, "valor": hashlib.sha1(param.encode()).hexdigest()[:8]}).encode()
+            etag = '"' + hashlib.sha1(corpo).hexdigest()[:16] + '"'
+            cabecalhos = {"Cache-Control": f"max-age={estado.max_age}", "ETag": etag}
+
+            if self.headers.get("If-None-Match") == etag:
+                with estado.lock:
+                    estado.not_modified += 1
+                self._responder(304, cabecalhos=cabecalhos)
+                return
+
+            self._responder(200, corpo, {"Content-Type": "application/json", **cabecalhos})
+
+    return Handler
+
+
+def servir(host: str, port: int, estado: MockState) -> ThreadingHTTPServer:
+    """Cria o servidor (chame serve_forever em uma thread)."""
+    return ThreadingHTTPServer((host, port), criar_handler(estado))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API externa simulada")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fração de respostas 503")
+    parser.add_argument("--max-age", type=int, default=60, help="segundos em Cache-Control: max-age")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    estado = MockState(args.latency_ms / 1000, args.fail_rate, args.max_age, args.seed)
+    servidor = servir(args.host, args.port, estado)
+    print(f"API externa simulada em http://{args.host}:{args.port} (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# benchmarks/run_benchmarks.py
+#
+# Suíte de benchmarks reprodutível da API. Sobe o app FastAPI real em processo
+# (transporte ASGI do httpx), apontado para o fake_firebird com dados
+# sintéticos, e mede vazão e latência (p50/p90/p99) de cada cenário.
+# O resultado é gravado em JSON para comparação entre execuções.
+#
+# Uso:
+#   python benchmarks/run_benchmarks.py --scale small            # 10 mil itens
+#   python benchmarks/run_benchmarks.py --scale large            # 1 milhão de itens
+#   python benchmarks/run_benchmarks.py --compare benchmarks/results/anterior.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+import dataset
+import fake_firebird
+
+# Quantidade de usuários e de itens de caixa por escala
+ESCALAS = {
+    "small": {"usuarios": 1_000, "itens": 10_000},
+    "large": {"usuarios": 10_000, "itens": 1_000_000},
+}
+
+
+def percentil(valores: list[float], p: float) -> float:
+    """Percentil pelo método do vizinho mais próximo (valores já ordenados)."""
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, round(p / 100 * len(valores) + 0.5) - 1))
+    return valores[indice]
+
+
+def resumir(latencias: list[float], erros: int, duracao: float, instrucoes: list[int]) -> dict:
+    ordenadas = sorted(latencias)
+    return {
+        "requests": len(latencias),
+        "errors": erros,
+        "statements_per_request": max(instrucoes) if instrucoes else None,
+        "throughput_rps": round(len(latencias) / duracao, 2) if duracao else 0.0,
+        "mean_ms": round(statistics.fmean(ordenadas) * 1000, 3) if ordenadas else 0.0,
+        "p50_ms": round(percentil(ordenadas, 50) * 1000, 3),
+        "p90_ms": round(percentil(ordenadas, 90) * 1000, 3),
+        "p99_ms": round(percentil(ordenadas, 99) * 1000, 3),
+        "max_ms": round(ordenadas[-1] * 1000, 3) if ordenadas else 0.0,
+    }
+
+
+async def rodar_cenario(client, gerar_requisicao, total: int, concorrencia: int, aquecimento: int) -> dict:
+    """Dispara `total` requisições com no máximo `concorrencia` simultâneas."""
+    for i in range(aquecimento):
+        metodo, url, kwargs = gerar_requisicao(i)
+        await client.request(metodo, url, **kwargs)
+
+    latencias: list[float] = []
+    instrucoes: list[int] = []
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def uma(i: int):
+        nonlocal erros
+        metodo, url, kwargs = gerar_requisicao(i)
+        async with semaforo:
+            inicio = time.perf_counter()
+            resposta = await client.request(metodo, url, **kwargs)
+            latencias.append(time.perf_counter() - inicio)
+        if resposta.status_code >= 400:
+            erros += 1
+        if "x-db-statements" in resposta.headers:
+            instrucoes.append(int(resposta.headers["x-db-statements"]))
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(uma(i) for i in range(total)))
+    return resumir(latencias, erros, time.perf_counter() - inicio, instrucoes)
+
+
+def cenarios(prefixo: str, token: str, usuarios: int, itens: int, semente: int) -> dict:
+    """Cenários medidos: cada um gera (método, url, kwargs) a partir do índice da requisição."""
+    rng = random.Random(semente)
+    auth = {"headers": {"Authorization": f"Bearer {token}"}}
+    pagina = 50
+    pagina_profunda = max(0, itens - pagina - 1)
+    atos = dataset.atos_para(itens)
+
+    return {
+        "login": lambda i: ("POST", f"{prefixo}/usuarios/login",
+                            {"data": {"username": dataset.BENCH_EMAIL, "password": dataset.BENCH_SENHA}}),
+        "usuarios_logado": lambda i: ("GET", f"{prefixo}/usuarios/logado", auth),
+        "usuarios_lista": lambda i: ("GET", f"{prefixo}/usuarios/?skip=0&limit={pagina}", auth),
+        "usuarios_detalhe": lambda i: ("GET", f"{prefixo}/usuarios/{rng.randint(1, usuarios)}", auth),
+        "caixa_itens_primeira_pagina": lambda i: ("GET", f"{prefixo}/caixa_itens/?skip=0&limit={pagina}", auth),
+        "caixa_itens_pagina_profunda": lambda i: ("GET", f"{prefixo}/caixa_itens/?skip={pagina_profunda}&limit={pagina}", auth),
+        "caixa_itens_detalhe": lambda i: ("GET", f"{prefixo}/caixa_itens/{rng.randint(1, itens)}", auth),
+        "atos_keyset": lambda i: ("GET", f"{prefixo}/atos/?after={rng.randint(0, atos)}&limit={pagina}", auth),
+        "atos_keyset_pagamentos": lambda i: (
+            "GET", f"{prefixo}/atos/?after={rng.randint(0, atos)}&limit={pagina}&include=pagamentos", auth),
+        "atos_detalhe": lambda i: ("GET", f"{prefixo}/atos/{rng.randint(1, atos)}", auth),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+async def executar(args) -> dict:
+    escala = ESCALAS[args.scale]
+    os.makedirs(args.data_dir, exist_ok=True)
+    caminho = os.path.join(args.data_dir, f"bench_{args.scale}_{args.seed}.sqlite")
+    dataset.build(caminho, escala["usuarios"], escala["itens"], semente=args.seed)
+    fake_firebird.install(caminho)
+
+    import httpx
+    from main import app
+    from core.configs import settings
+
+    # Registra quantas instruções SQL cada cenário executa por requisição
+    settings.DEBUG_QUERY_COUNT = True
+    # O cenário de login repete o mesmo e-mail: sem o limite de tentativas,
+    # mede o bcrypt em vez de respostas 429
+    settings.LOGIN_RATE_LIMIT_ENABLED = False
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as client:
+        login = await client.post(
+            f"{settings.API_V1_STR}/usuarios/login",
+            data={"username": dataset.BENCH_EMAIL, "password": dataset.BENCH_SENHA},
+        )
+        login.raise_for_status()
+        token = login.json()["access_token"]
+
+        resultados = {}
+        todos = cenarios(settings.API_V1_STR, token, escala["usuarios"], escala["itens"], args.seed)
+        selecionados = args.scenario or list(todos)
+        for nome in selecionados:
+            # O login roda bcrypt: usa menos requisições para não dominar o tempo total
+            total = max(1, args.requests // 10) if nome == "login" else args.requests
+            resultados[nome] = await rodar_cenario(client, todos[nome], total, args.concurrency, args.warmup)
+            r = resultados[nome]
+            print(f"{nome:<30} {r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f} ms  "
+                  f"p99 {r['p99_ms']:>8.2f} ms  sql/req {r['statements_per_request']}  erros {r['errors']}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            **escala,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "backend": "fake_firebird (sqlite)",
+        },
+        "scenarios": resultados,
+    }
+
+
+def comparar(atual: dict, anterior: dict) -> None:
+    """Imprime a variação percentual de cada métrica em relação à execução anterior."""
+    print(f"\nComparação com {anterior['meta'].get('commit')} ({anterior['meta'].get('timestamp')}):")
+    for nome, r in atual["scenarios"].items():
+        antes = anterior.get("scenarios", {}).get(nome)
+        if not antes:
+            continue
+        partes = []
+        for chave in ("throughput_rps", "p50_ms", "p99_ms"):
+            if antes[chave]:
+                partes.append(f"{chave} {(r[chave] - antes[chave]) / antes[chave] * 100:+.1f}%")
+        print(f"  {nome:<30} " + "  ".join(partes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks da API com Firebird local simulado")
+    parser.add_argument("--scale", choices=sorted(ESCALAS), default="small")
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenario", action="append", help="executa apenas o cenário informado (repetível)")
+    parser.add_argument("--data-dir", default=os.path.join(RAIZ, "benchmarks", ".data"))
+    parser.add_argument("--output", default=os.path.join(RAIZ, "benchmarks", "results"))
+    parser.add_argument("--compare", help="arquivo JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    resultado = asyncio.run(executar(args))
+
+    os.makedirs(args.output, exist_ok=True)
+    arquivo = os.path.join(
+        args.output, f"{resultado['meta']['timestamp'].replace(':', '')}_{resultado['meta']['commit']}_{args.scale}.json"
+    )
+    with open(arquivo, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"\nResultado gravado em {arquivo}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            comparar(resultado, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# core/admission.py
+#
+# Controle de admissão por grupo de rotas: cada grupo tem um número máximo
+# de requisições simultâneas por worker e uma fila. Uma rajada de listagens
+# pesadas espera (ou é recusada) na vaga dela, sem ocupar as threads e as
+# conexões do banco de que o login precisa.
+#
+#   prioridade  POST /usuarios/login e GET /usuarios/logado (vagas próprias)
+#   listagem    listagens, resumo e análises
+#   exportacao  GET .../export (ocupam a vaga enquanto o arquivo é enviado)
+#   padrao      demais rotas da API
+#
+# Fila cheia responde 429; espera (estimada ou real) acima de
+# ADMISSION_MAX_WAIT_SECONDS responde 503. Ambos com Retry-After. Rotas
+# fora da API (saúde, métricas) e o feed SSE não passam pelo controle.
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections import deque
+
+from core import metrics
+from core.configs import settings
+
+PRIORIDADE = "prioridade"
+LISTAGEM = "listagem"
+EXPORTACAO = "exportacao"
+PADRAO = "padrao"
+
+# (método, caminho depois de API_V1_STR, grupo); a primeira regra que casar vale.
+# Grupo None: a rota não passa pelo controle
+REGRAS = [
+    ("POST", re.compile(r"^/usuarios/login/?$"), PRIORIDADE),
+    ("GET", re.compile(r"^/usuarios/logado/?$"), PRIORIDADE),
+    ("GET", re.compile(r"^/caixa_itens/feed/?$"), None),   # SSE: conexão longa e barata
+    ("GET", re.compile(r"^/[^/]+/export/?$"), EXPORTACAO),
+    ("GET", re.compile(r"^/jobs/[0-9a-f]+/download/?$"), EXPORTACAO),
+    ("GET", re.compile(r"^/(caixa_itens|usuarios|atos)/?$"), LISTAGEM),
+    ("GET", re.compile(r"^/caixa_itens/(resumo|analytics)/?$"), LISTAGEM),
+    ("GET", re.compile(r"^/usuarios/search/?$"), LISTAGEM),
+]
+
+_recusadas = metrics.counter(
+    "admission_rejected_total", "Requisições recusadas pelo controle de admissão", ("group", "reason")
+)
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, motivo: str, retry_after: float):
+        self.status = status
+        self.motivo = motivo
+        self.retry_after = retry_after
+
+
+class Limiter:
+    """Vagas de um grupo e fila FIFO de quem espera por elas (no event loop do worker)."""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self._fila: deque[asyncio.Future] = deque()
+        self.duracao_media = 0.0   # média móvel do tempo de atendimento (segundos)
+        self.admitted = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._fila)
+
+    async def acquire(self, max_wait: float) -> None:
+        if self.in_flight < self.limit and not self._fila:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._fila) >= self.queue_size:
+            raise Rejected(429, "queue_full", max(1.0, self.duracao_media))
+        # Espera estimada: a fila à frente dividida entre as vagas
+        estimada = (len(self._fila) + 1) * self.duracao_media / self.limit
+        if estimada > max_wait:
+            raise Rejected(503, "latency_budget", estimada)
+
+        vez = asyncio.get_running_loop().create_future()
+        self._fila.append(vez)
+        try:
+            await asyncio.wait_for(asyncio.shield(vez), max_wait)
+        except asyncio.TimeoutError:
+            self._desistir(vez)
+            raise Rejected(503, "wait_timeout", max(1.0, estimada))
+        except asyncio.CancelledError:
+            # Cliente desconectou na fila
+            self._desistir(vez)
+            raise
+        self.admitted += 1
+
+    def _desistir(self, vez: asyncio.Future) -> None:
+        if vez.done() and not vez.cancelled():
+            # A vaga foi entregue no mesmo instante: repassa para o próximo
+            self.release(0.0, medir=False)
+            return
+        vez.cancel()
+        try:
+            self._fila.remove(vez)
+        except ValueError:
+            pass
+
+    def release(self, duracao: float, medir: bool = True) -> None:
+        if medir:
+            self.duracao_media = duracao if self.duracao_media == 0 else 0.9 * self.duracao_media + 0.1 * duracao
+        # A vaga passa direto para o primeiro da fila (sem disputa com quem chega)
+        while self._fila:
+            vez = self._fila.popleft()
+            if not vez.done():
+                vez.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._fila),
+            "admitted": self.admitted,
+            "avg_ms": round(self.duracao_media * 1000, 2),
+        }
+
+
+limiters: dict[str, Limiter] = {}
+
+
+def get_limiter(grupo: str) -> Limiter:
+    limiter = limiters.get(grupo)
+    if limiter is None:
+        limite = settings.ADMISSION_LIMITS.get(grupo, settings.ADMISSION_LIMITS.get(PADRAO, 16))
+        limiter = limiters[grupo] = Limiter(grupo, limite, settings.ADMISSION_QUEUE_SIZE)
+    return limiter
+
+
+def route_group(method: str, path: str) -> str | None:
+    """Grupo da requisição, ou None se ela não passa pelo controle."""
+    if not path.startswith(settings.API_V1_STR):
+        return None
+    relativo = path[len(settings.API_V1_STR):] or "/"
+    for metodo, padrao, grupo in REGRAS:
+        if metodo == method and padrao.match(relativo):
+            return grupo
+    return PADRAO
+
+
+def stats() -> dict:
+    return {nome: limiter.stats() for nome, limiter in limiters.items()}
+
+
+metrics.gauge(
+    "admission_in_flight", "Requisições em atendimento por grupo de rotas",
+    lambda: [({"group": nome}, l.in_flight) for nome, l in limiters.items()],
+)
+metrics.gauge(
+    "admission_queued", "Requisições aguardando vaga por grupo de rotas",
+    lambda: [({"group": nome}, l.queued) for nome, l in limiters.items()],
+)
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI do controle de admissão. A vaga fica ocupada até o fim
+    do envio da resposta (inclusive respostas em fluxo).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _recusar(self, send, grupo: str, erro: Rejected) -> None:
+        _recusadas.inc(group=grupo, reason=erro.motivo)
+        mensagem = ("Muitas requisições aguardando; tente novamente em instantes." if erro.status == 429
+                    else "Servidor sobrecarregado; tente novamente em instantes.")
+        corpo = json.dumps({"detail": mensagem}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": erro.status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(corpo)).encode()),
+                (b"retry-after", str(max(1, math.ceil(erro.retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": corpo})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        grupo = route_group(scope["method"], scope["path"])
+        if grupo is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = get_limiter(grupo)
+        try:
+            await limiter.acquire(settings.ADMISSION_MAX_WAIT_SECONDS)
+        except Rejected as e:
+            await self._recusar(send, grupo, e)
+            return
+
+        inicio = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - inicio)
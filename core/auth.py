@@ -1,10 +1,11 @@
-from pytz import timezone
-from datetime import datetime, timedelta
+import json
+import time
+from datetime import timedelta
 
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
 
 from core.configs import settings
+from core.signing import KeyRing, HMACSigner, load_pem_signer
 from api.v1.controllers.g_usuario_controller import authenticate_user
 
 # Define o esquema OAuth2 para login
@@ -12,18 +13,52 @@ oauth2_schema = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/usuarios/login"
 )
 
+
+# Monta o conjunto de chaves de assinatura a partir das configurações
+def build_keyring() -> KeyRing:
+    keyring = KeyRing()
+
+    # Chave HMAC padrão (JWT_SECRET); também verifica tokens antigos emitidos sem 'kid'
+    keyring.add(HMACSigner(settings.JWT_KID, settings.JWT_SECRET, settings.ALGORITHM), active=True)
+    keyring.fallback_kid = settings.JWT_KID
+
+    # Chaves adicionais (EdDSA/ES256 ou HMAC) para rotação, descritas em um arquivo JSON:
+    # [{"kid": "ed-2026-10", "alg": "EdDSA", "pem_file": "/keys/ed.pem", "active": true}, ...]
+    if settings.JWT_KEYS_FILE:
+        with open(settings.JWT_KEYS_FILE, encoding="utf-8") as f:
+            for chave in json.load(f):
+                if chave["alg"].startswith("HS"):
+                    signer = HMACSigner(chave["kid"], chave["secret"], chave["alg"])
+                else:
+                    with open(chave["pem_file"], "rb") as pem:
+                        signer = load_pem_signer(chave["kid"], chave["alg"], pem.read())
+                keyring.add(signer, active=chave.get("active", False))
+
+    return keyring
+
+
+# Conjunto de chaves usado para emitir e verificar os tokens
+keyring = build_keyring()
+
+
 # Função para criar um token JWT
 def create_token(tipo_token: str, tempo_vida: timedelta, sub: str) -> str:
-    payload = {}
-    sp = timezone('America/Sao_Paulo')
-    expira = datetime.now(tz=sp) + tempo_vida
+    # Timestamps em segundos UTC (epoch): sem consulta de fuso horário por chamada
+    agora = int(time.time())
 
-    payload["type"] = tipo_token
-    payload["exp"] = expira
-    payload["iat"] = datetime.now(tz=sp)
-    payload["sub"] = str(sub)
+    payload = {
+        "type": tipo_token,
+        "exp": agora + int(tempo_vida.total_seconds()),
+        "iat": agora,
+        "sub": str(sub),
+    }
 
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.ALGORITHM)
+    return keyring.encode(payload)
+
+
+# Verifica um token JWT e retorna o payload (lança TokenError se inválido)
+def decode_token(token: str) -> dict:
+    return keyring.decode(token)
 
 
 # Criação do token de acesso (access_token)
@@ -33,3 +68,13 @@ def create_access_token(sub: str) -> str:
         tempo_vida=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
         sub=sub
     )
+
+
+# Ticket do feed ao vivo (GET /caixa_itens/feed?ticket=...): o EventSource do
+# navegador não envia o cabeçalho Authorization. Vale só para o feed
+def create_feed_ticket(sub: str) -> str:
+    return create_token(
+        tipo_token='feed_ticket',
+        tempo_vida=timedelta(minutes=settings.FEED_TICKET_MINUTES),
+        sub=sub
+    )
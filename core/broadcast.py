@@ -0,0 +1,97 @@
+# core/broadcast.py
+#
+# Distribuição de mensagens por worker: uma única tarefa produtora (ex: um
+# laço que consulta o banco) publica e todos os assinantes conectados (ex:
+# painéis via SSE) recebem. O produtor só roda enquanto houver assinante,
+# então N painéis custam uma consulta por ciclo, e não N.
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Fila de um assinante. Se ela enche (cliente lento), o assinante é marcado
+    como atrasado e deixa de receber; quem o atende encerra a conexão para o
+    cliente reconectar e recuperar o que perdeu.
+    """
+
+    def __init__(self, tamanho: int):
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho)
+        self.lagged = False
+
+    async def get(self, timeout: float) -> tuple[str, Any] | None:
+        """Próxima mensagem (tipo, dados), ou None se nada chegar dentro de `timeout`."""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broadcast:
+    """Canal com um produtor compartilhado e vários assinantes (no mesmo event loop)."""
+
+    def __init__(self, name: str, produtor: Callable[["Broadcast"], Awaitable[None]], tamanho_fila: int):
+        self.name = name
+        self._produtor = produtor
+        self._tamanho_fila = tamanho_fila
+        self._assinantes: set[Subscription] = set()
+        self._tarefa: asyncio.Task | None = None
+        # Última mensagem de cada tipo guardado (ex: totais), entregue a quem chega
+        self.state: dict[str, Any] = {}
+        self.published = 0
+        self.lagged = 0
+
+    def publish(self, tipo: str, dados: Any, guardar: bool = False) -> None:
+        if guardar:
+            self.state[tipo] = dados
+        self.published += 1
+        for assinante in self._assinantes:
+            if assinante.lagged:
+                continue
+            try:
+                assinante.fila.put_nowait((tipo, dados))
+            except asyncio.QueueFull:
+                assinante.lagged = True
+                self.lagged += 1
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        assinante = Subscription(self._tamanho_fila)
+        for tipo, dados in self.state.items():
+            assinante.fila.put_nowait((tipo, dados))
+        self._assinantes.add(assinante)
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.create_task(self._executar())
+        try:
+            yield assinante
+        finally:
+            self._assinantes.discard(assinante)
+            if not self._assinantes and self._tarefa is not None:
+                # Ninguém ouvindo: para de consultar
+                self._tarefa.cancel()
+                self._tarefa = None
+                self.state.clear()
+
+    async def _executar(self) -> None:
+        try:
+            await self._produtor(self)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Broadcast %s producer failed: %s", self.name, e)
+            # Desliga todos: ao reconectar, um produtor novo é iniciado
+            for assinante in self._assinantes:
+                assinante.lagged = True
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._assinantes),
+            "producer_running": self._tarefa is not None and not self._tarefa.done(),
+            "published": self.published,
+            "lagged": self.lagged,
+        }
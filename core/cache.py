@@ -0,0 +1,84 @@
+# core/cache.py
+
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Cache em memória com prazo de validade por entrada, seguro entre threads.
+
+    Usado para valores caros e pouco voláteis (ex: total de registros das
+    listagens). Cada processo/worker tem o seu; a API invalida as entradas
+    quando ela mesma altera os dados e o prazo cobre alterações externas.
+    """
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self._dados: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chave: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entrada = self._dados.get(chave)
+            if entrada is not None and entrada[0] > time.monotonic():
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+            return default
+
+    def set(self, chave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._dados[chave] = (time.monotonic() + self.ttl, valor)
+
+    def get_or_load(self, chave: Hashable, carregar: Callable[[], Any]) -> Any:
+        """Devolve o valor em cache ou chama `carregar()` e guarda o resultado."""
+        sentinela = object()
+        valor = self.get(chave, sentinela)
+        if valor is sentinela:
+            # Carrega fora do lock: duas threads podem consultar ao mesmo tempo,
+            # mas nenhuma fica presa atrás de uma consulta lenta ao banco
+            valor = carregar()
+            self.set(chave, valor)
+        return valor
+
+    def invalidate(self, chave: Hashable | None = None) -> None:
+        """Remove uma entrada (ou todas, sem chave)."""
+        with self._lock:
+            if chave is None:
+                self._dados.clear()
+            else:
+                self._dados.pop(chave, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            agora = time.monotonic()
+            return {
+                "entries": sum(1 for expira, _ in self._dados.values() if expira > agora),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl,
+            }
+
+
+# Caches nomeados do processo (expostos em /health/ready)
+_caches: dict[str, TTLCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl: float) -> TTLCache:
+    """Devolve o cache com esse nome, criando-o no primeiro uso."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = TTLCache(name, ttl)
+        return cache
+
+
+def all_caches() -> dict[str, TTLCache]:
+    with _caches_lock:
+        return dict(_caches)
@@ -0,0 +1,249 @@
+# core/change_listener.py
+#
+# Invalida os caches da API quando G_USUARIO ou C_CAIXA_ITEM são alterados
+# fora dela (ex: sistema desktop). Os gatilhos de
+# migrations/003_eventos_alteracao.sql publicam um evento (POST_EVENT) e
+# incrementam um contador por tabela a cada alteração.
+#
+#   events   conexão dedicada assinando os eventos; o aviso chega no commit
+#   polling  consulta os contadores a cada CHANGE_POLL_SECONDS
+#   off      só o prazo de validade dos caches cobre alterações externas
+#
+# Na partida, o ouvinte confere em RDB$TRIGGERS e RDB$GENERATORS se a
+# migração 003 foi aplicada. Se faltar algum gatilho ou sequência, registra
+# um aviso e não inicia: sem os gatilhos não há eventos nem contadores que
+# subam, e só o prazo de validade dos caches cobre alterações externas
+# (como no modo "off"). No modo "events", se a conexão cair, o ouvinte passa
+# a consultar os contadores e tenta assinar de novo depois de
+# CHANGE_EVENTS_RETRY_SECONDS. Cada worker tem o seu ouvinte, como tem os
+# seus caches.
+
+import logging
+import threading
+import time
+from typing import Callable
+
+from core.configs import settings
+from core.database import get_connection, open_connection
+
+logger = logging.getLogger(__name__)
+
+# Tabela -> (evento publicado pelo gatilho, sequência contadora de alterações, gatilho)
+TABELAS = {
+    "G_USUARIO": ("G_USUARIO_ALTERADO", "SEQ_G_USUARIO_ALTERACOES", "TRG_G_USUARIO_API_ALTERADO"),
+    "C_CAIXA_ITEM": ("C_CAIXA_ITEM_ALTERADO", "SEQ_C_CAIXA_ITEM_ALTERACOES", "TRG_C_CAIXA_ITEM_API_ALTERADO"),
+}
+
+# Tempo máximo (segundos) de cada espera por eventos: limita a demora para parar
+_ESPERA_EVENTOS = 1.0
+
+_assinantes: dict[str, list[Callable[[], None]]] = {}
+_assinantes_lock = threading.Lock()
+
+
+def ao_alterar(tabela: str, funcao: Callable[[], None]) -> None:
+    """Registra `funcao` para ser chamada sempre que `tabela` for alterada."""
+    if tabela not in TABELAS:
+        raise ValueError(f"Tabela sem aviso de alteração: {tabela}.")
+    with _assinantes_lock:
+        _assinantes.setdefault(tabela, []).append(funcao)
+
+
+def notificar(tabela: str) -> None:
+    """Chama as funções registradas para a tabela (erros não interrompem as demais)."""
+    with _assinantes_lock:
+        funcoes = list(_assinantes.get(tabela, ()))
+    for funcao in funcoes:
+        try:
+            funcao()
+        except Exception as e:
+            logger.error("Error invalidating caches for %s: %s", tabela, e)
+
+
+def notificar_todas() -> None:
+    for tabela in TABELAS:
+        notificar(tabela)
+
+
+def ler_contadores() -> dict[str, int]:
+    """Valor atual do contador de alterações de cada tabela (sem incrementar)."""
+    colunas = ", ".join(f"GEN_ID({sequencia}, 0)" for _, sequencia, _ in TABELAS.values())
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT {colunas} FROM RDB$DATABASE")
+        return dict(zip(TABELAS, cur.fetchone()))
+    finally:
+        conn.close()
+
+
+def objetos_ausentes() -> list[str]:
+    """Gatilhos (ativos) e sequências da migração 003 que não existem no banco."""
+    gatilhos = [gatilho for _, _, gatilho in TABELAS.values()]
+    sequencias = [sequencia for _, sequencia, _ in TABELAS.values()]
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT TRIM(RDB$TRIGGER_NAME) FROM RDB$TRIGGERS "
+            f"WHERE RDB$TRIGGER_NAME IN ({', '.join('?' * len(gatilhos))}) "
+            f"AND COALESCE(RDB$TRIGGER_INACTIVE, 0) = 0",
+            gatilhos,
+        )
+        existentes = {linha[0] for linha in cur.fetchall()}
+        cur.execute(
+            f"SELECT TRIM(RDB$GENERATOR_NAME) FROM RDB$GENERATORS "
+            f"WHERE RDB$GENERATOR_NAME IN ({', '.join('?' * len(sequencias))})",
+            sequencias,
+        )
+        existentes.update(linha[0] for linha in cur.fetchall())
+    finally:
+        conn.close()
+    return [nome for nome in gatilhos + sequencias if nome not in existentes]
+
+
+class ChangeListener:
+    """Thread que recebe os avisos de alteração e invalida os caches."""
+
+    def __init__(self):
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.active: str | None = None      # "events", "polling" ou None (parado)
+        self.missing: list[str] = []        # Objetos da migração 003 ausentes (só validade dos caches)
+        self.activations = 0
+        self.changes: dict[str, int] = {tabela: 0 for tabela in TABELAS}
+        self.last_change_at: float | None = None
+        self.last_error: str | None = None
+
+    def start(self) -> None:
+        if settings.CHANGE_LISTENER_MODE == "off" or self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="change-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._ativar(None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": settings.CHANGE_LISTENER_MODE,
+                "active": self.active,
+                "missing_objects": list(self.missing),
+                "changes": dict(self.changes),
+                "seconds_since_change": (
+                    round(time.monotonic() - self.last_change_at, 1)
+                    if self.last_change_at is not None else None
+                ),
+                "last_error": self.last_error,
+            }
+
+    # ---------------------- INTERNOS ----------------------
+
+    def _executar(self) -> None:
+        if not self._conferir_migracao():
+            return
+        while not self._parar.is_set():
+            if settings.CHANGE_LISTENER_MODE == "events":
+                try:
+                    self._ouvir_eventos()
+                except Exception as e:
+                    self._erro("events", e)
+                # Sem eventos: consulta os contadores até tentar assinar de novo
+                self._consultar_contadores(settings.CHANGE_EVENTS_RETRY_SECONDS)
+            else:
+                self._consultar_contadores(None)
+
+    def _conferir_migracao(self) -> bool:
+        """Confere os objetos da migração 003; sem eles, o ouvinte não inicia."""
+        while not self._parar.is_set():
+            try:
+                ausentes = objetos_ausentes()
+            except Exception as e:
+                # Banco fora do ar na partida: tenta de novo no intervalo de consulta
+                self._erro("startup", e)
+                self._parar.wait(settings.CHANGE_POLL_SECONDS)
+                continue
+            if ausentes:
+                with self._lock:
+                    self.missing = ausentes
+                logger.warning(
+                    "Change listener disabled: %s not found (apply migrations/003_eventos_alteracao.sql); "
+                    "external changes only show up when caches expire", ", ".join(ausentes)
+                )
+                return False
+            return True
+        return False
+
+    def _ativar(self, modo: str | None) -> None:
+        primeira = False
+        with self._lock:
+            anterior, self.active = self.active, modo
+            if modo is not None:
+                self.activations += 1
+                primeira = self.activations == 1
+        if modo is not None and modo != anterior and not primeira:
+            # Alterações feitas durante a troca de modo não geraram aviso
+            notificar_todas()
+
+    def _alterou(self, tabela: str, quantidade: int = 1) -> None:
+        with self._lock:
+            self.changes[tabela] += quantidade
+            self.last_change_at = time.monotonic()
+        notificar(tabela)
+
+    def _erro(self, modo: str, e: Exception) -> None:
+        with self._lock:
+            self.last_error = f"{modo}: {type(e).__name__}: {e}"
+        logger.error("Change listener error (%s): %s", modo, e)
+
+    def _ouvir_eventos(self) -> None:
+        tabelas = {evento: tabela for tabela, (evento, _, _) in TABELAS.items()}
+        conn = open_connection(settings.DB_URL)
+        try:
+            with conn.event_collector(list(tabelas)) as coletor:
+                self._ativar("events")
+                while not self._parar.is_set():
+                    # Cada evento vem com a quantidade de POST_EVENT confirmados desde a última espera
+                    for evento, quantidade in (coletor.wait(timeout=_ESPERA_EVENTOS) or {}).items():
+                        if quantidade:
+                            self._alterou(tabelas[evento], quantidade)
+        finally:
+            conn.close()
+
+    def _consultar_contadores(self, duracao: float | None) -> None:
+        """Compara os contadores a cada intervalo; sem `duracao`, até parar."""
+        fim = None if duracao is None else time.monotonic() + duracao
+        self._ativar("polling")
+        anteriores: dict[str, int] | None = None
+        pendentes: set[str] = set()
+        intervalo = 0.0
+        while not self._parar.wait(intervalo):
+            intervalo = settings.CHANGE_POLL_SECONDS
+            try:
+                atuais = ler_contadores()
+            except Exception as e:
+                self._erro("polling", e)
+            else:
+                # O contador sobe na alteração, antes do commit: um cache recarregado
+                # nesse meio-tempo ainda teria o valor antigo, então invalida de novo
+                for tabela in pendentes:
+                    notificar(tabela)
+                pendentes = set()
+                if anteriores is not None:
+                    for tabela, valor in atuais.items():
+                        if valor != anteriores[tabela]:
+                            self._alterou(tabela)
+                            pendentes.add(tabela)
+                anteriores = atuais
+            if fim is not None and time.monotonic() >= fim:
+                return
+
+
+listener = ChangeListener()
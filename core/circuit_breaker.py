@@ -0,0 +1,121 @@
+# core/circuit_breaker.py
+
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """O circuito está aberto: a dependência falhou demais e as chamadas estão suspensas."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuito '{name}' aberto; nova tentativa em {retry_after:.1f}s.")
+
+
+class CircuitBreaker:
+    """
+    Disjuntor para dependências externas (API HTTP, banco de dados).
+
+    - fechado: as chamadas passam; `failure_threshold` falhas seguidas abrem o circuito;
+    - aberto: as chamadas falham na hora (CircuitOpenError) por `reset_timeout` segundos;
+    - meio-aberto: passado o prazo, uma única chamada de teste é liberada; se der
+      certo o circuito fecha, se falhar volta a abrir.
+
+    Seguro entre threads; pode ser usado também em código assíncrono.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self.opened_count = 0   # vezes em que o circuito abriu
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        # Chamada de teste que nunca informou o resultado (ex: cancelada): libera outra
+        if self._state == self.HALF_OPEN and self._probe_in_flight \
+                and time.monotonic() - self._probe_started >= self.reset_timeout:
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Levanta CircuitOpenError se a chamada não deve ser feita agora."""
+        with self._lock:
+            estado = self._current_state()
+            if estado == self.CLOSED:
+                return
+            if estado == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_started = time.monotonic()
+                return
+            restante = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(self.name, restante)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            estado = self._current_state()
+            if estado == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if estado != self.OPEN:
+                    self.opened_count += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """Executa `func` protegida pelo disjuntor (qualquer exceção conta como falha)."""
+        self.before_call()
+        try:
+            resultado = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return resultado
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self._failures,
+                "opened_count": self.opened_count,
+            }
+
+
+def find_circuit_open(exc: BaseException | None) -> CircuitOpenError | None:
+    """
+    Procura um CircuitOpenError na cadeia de exceções: os models e controllers
+    o convertem em RuntimeError/HTTPException, mas a causa original fica em
+    __cause__/__context__.
+    """
+    vistas = set()
+    while exc is not None and id(exc) not in vistas:
+        if isinstance(exc, CircuitOpenError):
+            return exc
+        vistas.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
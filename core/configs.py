@@ -20,12 +20,191 @@ class Settings(BaseSettings):
     secrets.token_urlsafe(32)
     """
 
-    # Algoritmo usado para assinar os tokens JWT
+    # Algoritmo usado para assinar os tokens JWT com JWT_SECRET (HS256, HS384 ou HS512)
     ALGORITHM: str = 'HS256'
 
+    # Identificador (kid) da chave JWT_SECRET no cabeçalho dos tokens
+    JWT_KID: str = 'hs-1'
+
+    # Arquivo JSON opcional com chaves adicionais (EdDSA/ES256/HMAC) para rotação
+    JWT_KEYS_FILE: str = ''
+
     # Tempo de expiração do token JWT (em minutos): 1 semana 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
 
+    # Conta conexões e instruções SQL por requisição e devolve nos cabeçalhos
+    # X-DB-Connections / X-DB-Statements (use apenas em desenvolvimento)
+    DEBUG_QUERY_COUNT: bool = False
+
+    # Quantidade máxima de tokens JWT já verificados mantidos em cache
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Intervalo (em segundos) para reconstruir o índice de busca de usuários,
+    # cobrindo alterações feitas fora da API (ex: sistema desktop)
+    USER_SEARCH_REBUILD_SECONDS: int = 300
+
+    # Linhas lidas do banco (e enviadas ao cliente) por bloco nas exportações
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Pool de conexões com o Firebird (por worker): conexões abertas na partida,
+    # máximo simultâneo e tempo máximo (segundos) de espera por uma conexão livre
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float = 10.0
+
+    # Réplicas somente leitura do Firebird (lista JSON de URLs no formato de DB_URL,
+    # cada uma com um pool do mesmo tamanho). Vazio: tudo vai para DB_URL.
+    # Intervalo (segundos) da verificação de saúde/latência das réplicas e tempo
+    # em que as leituras de quem acabou de gravar ficam no primário
+    DB_READ_URLS: list[str] = []
+    DB_READ_HEALTH_SECONDS: float = 10.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    # Resiliência do acesso ao banco: tempo máximo (segundos) de cada instrução
+    # (0 desliga; exportações e reconstruções não têm limite), novas tentativas
+    # das leituras em falha de rede e espera base entre elas, e disjuntor
+    # (falhas de rede seguidas que abrem o circuito e segundos até testar de novo)
+    DB_STATEMENT_TIMEOUT_SECONDS: float = 30.0
+    DB_READ_RETRIES: int = 2
+    DB_RETRY_BACKOFF_SECONDS: float = 0.2
+    DB_BREAKER_FAILURES: int = 5
+    DB_BREAKER_RESET_SECONDS: float = 15.0
+
+    # Instruções SQL preparadas mantidas por conexão do pool (0 desliga o cache)
+    DB_STATEMENT_CACHE_SIZE: int = 64
+
+    # Validade (em segundos) dos totais em cache das listagens de usuários e itens
+    COUNT_CACHE_SECONDS: int = 30
+
+    # Invalidação dos caches por alterações externas (core/change_listener.py):
+    # 'events' (POST_EVENT dos gatilhos), 'polling' (contadores) ou 'off'.
+    # Intervalo (segundos) entre consultas e espera até assinar os eventos de novo
+    CHANGE_LISTENER_MODE: str = 'events'
+    CHANGE_POLL_SECONDS: float = 5.0
+    CHANGE_EVENTS_RETRY_SECONDS: float = 60.0
+
+    # Feed ao vivo de itens de caixa (GET /caixa_itens/feed, SSE): intervalo
+    # (segundos) entre consultas, itens por consulta, mensagens pendentes por
+    # painel, intervalo do ping de manutenção, espera do navegador para reconectar (ms)
+    # e itens perdidos reenviados na reconexão (acima disso, evento "reset": o
+    # painel recarrega /caixa_itens/ e segue ao vivo)
+    FEED_POLL_SECONDS: float = 2.0
+    FEED_BATCH_SIZE: int = 200
+    FEED_QUEUE_SIZE: int = 100
+    FEED_HEARTBEAT_SECONDS: float = 15.0
+    FEED_RETRY_MS: int = 3000
+    FEED_RESUME_MAX_ITEMS: int = 5000
+    # Validade (minutos) do ticket do feed (?ticket=, para o EventSource do
+    # navegador); vencido, o painel pede outro e reconecta com ?ultimo_id=
+    FEED_TICKET_MINUTES: int = 60
+
+    # Resumo diário de C_CAIXA_ITEM (GET /caixa_itens/resumo): arquivo SQLite local,
+    # intervalo mínimo (segundos) entre atualizações incrementais, espera pelo
+    # bloqueio de escrita na reconstrução e dias antes de hoje refeitos a cada
+    # atualização (itens confirmados fora da ordem de ID)
+    SUMMARY_DB_PATH: str = 'data/resumo_caixa.sqlite'
+    SUMMARY_REFRESH_SECONDS: float = 30.0
+    SUMMARY_REBUILD_LOCK_SECONDS: float = 30.0
+    SUMMARY_RECENT_DAYS: int = 1
+
+    # Análise em memória dos itens de caixa (GET /caixa_itens/analytics, requer NumPy):
+    # liga a cópia colunar por worker, intervalo (segundos) entre cargas
+    # incrementais, intervalo da recarga completa e linhas lidas por consulta
+    ANALYTICS_ENABLED: bool = False
+    ANALYTICS_REFRESH_SECONDS: float = 30.0
+    ANALYTICS_RELOAD_SECONDS: float = 3600.0
+    ANALYTICS_BATCH_SIZE: int = 10_000
+
+    # Exportação Parquet para BI (scripts/export_parquet.py, requer pyarrow):
+    # pasta de destino e linhas lidas do banco por bloco
+    PARQUET_EXPORT_DIR: str = 'data/parquet'
+    PARQUET_BATCH_SIZE: int = 50_000
+    # IDs que faltavam abaixo da marca d'água (transação ainda aberta na leitura)
+    # são procurados de novo nas execuções seguintes: até quantos guardar e por
+    # quanto tempo (segundos) antes de tratá-los como excluídos/desfeitos
+    PARQUET_MAX_GAPS: int = 1000
+    PARQUET_GAP_SECONDS: int = 3600
+
+    # Tarefas em segundo plano (POST /jobs): pasta do estado e dos resultados,
+    # executor ('thread' ou 'process'), tarefas simultâneas e aguardando por
+    # worker e validade (segundos) dos resultados depois de terminadas
+    JOBS_DIR: str = 'data/jobs'
+    JOBS_EXECUTOR: str = 'thread'
+    JOBS_MAX_WORKERS: int = 2
+    JOBS_MAX_QUEUED: int = 20
+    JOBS_RESULT_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Controle de admissão (core/admission.py), por worker: requisições
+    # simultâneas por grupo de rotas, requisições aguardando por grupo (acima
+    # disso, 429) e espera máxima (segundos) na fila (acima disso, 503)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: dict[str, int] = {"prioridade": 16, "listagem": 4, "exportacao": 2, "padrao": 16}
+    ADMISSION_QUEUE_SIZE: int = 32
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+
+    # Limite de tentativas de login (core/rate_limit.py), verificado antes do
+    # banco e do bcrypt: balde de fichas por IP e por e-mail (rajada máxima e
+    # tentativas repostas por minuto; login bem-sucedido devolve a ficha do e-mail)
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_IP_BURST: int = 20
+    LOGIN_RATE_IP_PER_MINUTE: float = 10.0
+    LOGIN_RATE_EMAIL_BURST: int = 5
+    LOGIN_RATE_EMAIL_PER_MINUTE: float = 2.0
+
+    # Armazenamento dos limites: 'memory' (por worker) ou 'redis' (compartilhado,
+    # requer o pacote redis), chaves mantidas em memória e se o IP do cliente
+    # vem do X-Forwarded-For (só atrás de um proxy confiável)
+    RATE_LIMIT_BACKEND: str = 'memory'
+    RATE_LIMIT_REDIS_URL: str = 'redis://localhost:6379/0'
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+
+    # Tamanho máximo da página (parâmetro limit) das listagens
+    MAX_PAGE_SIZE: int = 100
+
+    # Logs (core/log.py): nível geral, níveis por logger (ex: {"core.database": "DEBUG"};
+    # httpx/httpcore registram cada chamada externa em INFO), fração dos registros
+    # INFO/DEBUG mantida por logger (avisos e erros sempre saem) e tamanho da fila
+    # de escrita (cheia, o registro é descartado)
+    LOG_LEVEL: str = 'INFO'
+    LOG_LEVELS: dict[str, str] = {"httpx": "WARNING", "httpcore": "WARNING"}
+    LOG_SAMPLING: dict[str, float] = {"api.access": 0.1}
+    LOG_QUEUE_SIZE: int = 10_000
+
+    # Log de acesso: tempo e instruções no banco por requisição, e duração
+    # (segundos) a partir da qual a requisição é registrada como lenta (WARNING;
+    # não vale para fluxos SSE como /caixa_itens/feed)
+    LOG_DB_TIMINGS: bool = True
+    LOG_SLOW_REQUEST_SECONDS: float = 1.0
+
+    # Aquecimento na partida: tentativas e intervalo inicial (segundos) entre elas
+    WARMUP_ATTEMPTS: int = 5
+    WARMUP_RETRY_SECONDS: float = 2.0
+
+    # API externa (services/api_externa_1): URL base, tempos limite (segundos)
+    # e limites do pool de conexões do cliente HTTP compartilhado
+    EXTERNAL_API_BASE_URL: str = 'https://api.exemplo.com'
+    EXTERNAL_API_TIMEOUT: float = 10.0
+    EXTERNAL_API_CONNECT_TIMEOUT: float = 3.0
+    EXTERNAL_API_MAX_CONNECTIONS: int = 50
+    EXTERNAL_API_MAX_KEEPALIVE: int = 20
+    EXTERNAL_API_KEEPALIVE_EXPIRY: float = 30.0
+    EXTERNAL_API_HTTP2: bool = True
+
+    # Novas tentativas (com espera aleatória crescente) e cache de respostas
+    EXTERNAL_API_RETRIES: int = 2
+    EXTERNAL_API_BACKOFF_BASE: float = 0.2
+    EXTERNAL_API_BACKOFF_MAX: float = 5.0
+    EXTERNAL_API_CACHE_MAX_ENTRIES: int = 1000
+
+    # Consultas em lote (services/fanout): chamadas simultâneas e tempo limite por chamada
+    EXTERNAL_API_FANOUT_CONCURRENCY: int = 20
+    EXTERNAL_API_CALL_TIMEOUT: float = 5.0
+
+    # Disjuntor: falhas seguidas que abrem o circuito e segundos até testar de novo
+    EXTERNAL_API_BREAKER_FAILURES: int = 5
+    EXTERNAL_API_BREAKER_RESET_SECONDS: float = 30.0
+
     # Configuração do Pydantic
     class Config:
         case_sensitive = True  # Variáveis de ambiente sensíveis a maiúsculas/minúsculas
@@ -1,10 +1,75 @@
+import logging
 import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, TypeVar
 from urllib.parse import urlparse, unquote
-from firebird.driver import connect
+from core import metrics
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from core.configs import settings
+from core.instrumentation import instrument
 
-def get_connection():
-    parsed = urlparse(settings.DB_URL)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Função connect do firebird-driver, importada só na primeira conexão:
+# o driver não pesa na inicialização nem em cada fork de worker
+connect = None
+
+
+def _driver_connect():
+    global connect
+    if connect is None:
+        from firebird.driver import connect as firebird_connect
+        connect = firebird_connect
+    return connect
+
+
+# Expõe a exceção do driver (core.database.DatabaseError) também sob demanda
+def __getattr__(name: str):
+    if name == "DatabaseError":
+        from firebird.driver.types import DatabaseError
+        globals()["DatabaseError"] = DatabaseError
+        return DatabaseError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Códigos do Firebird de falha de rede/conexão: a instrução não chegou a
+# rodar ou a conexão caiu, então uma leitura pode ser repetida com segurança
+_GDS_TRANSITORIOS = {
+    335544528,  # isc_shutdown: banco em shutdown
+    335544721,  # isc_network_error: servidor inacessível
+    335544726,  # isc_net_read_err
+    335544727,  # isc_net_write_err
+    335544741,  # isc_lost_db_connection
+    335544856,  # isc_att_shutdown: conexão encerrada pelo servidor
+}
+
+_erros_transitorios = metrics.counter(
+    "db_transient_errors_total", "Falhas de rede/conexão com o banco, por pool", ("pool",)
+)
+_leituras_repetidas = metrics.counter(
+    "db_read_retries_total", "Leituras repetidas depois de uma falha de rede/conexão"
+)
+
+
+def is_transient_error(e: BaseException) -> bool:
+    """Falha de rede/conexão (e não de SQL, de dados ou de tempo limite)."""
+    if isinstance(e, CircuitOpenError):
+        return False
+    if isinstance(e, (ConnectionError, TimeoutError)):
+        return True
+    return bool(_GDS_TRANSITORIOS.intersection(getattr(e, "gds_codes", None) or ()))
+
+
+# Abre uma conexão física nova com o banco descrito pela URL
+def open_connection(db_url: str):
+    parsed = urlparse(db_url)
 
     user = parsed.username
     password = unquote(parsed.password or '')
@@ -20,9 +85,628 @@ def get_connection():
     # E essa string é passada como o PRIMEIRO ARGUMENTO POSICIONAL
     connection_dsn = f"{host}/{port}:{database}"
 
-    return connect(
+    return _driver_connect()(
         connection_dsn, # Este é o DSN completo que o driver espera
         user=user,
         password=password,
         charset="UTF8"
-    )
\ No newline at end of file
+    )
+
+
+class PooledCursor:
+    """
+    Cursor que reaproveita instruções já preparadas na mesma conexão física
+    (evita reenviar e recompilar o SQL a cada execução).
+    """
+
+    def __init__(self, cursor, statements: "OrderedDict | None", pool: "ConnectionPool | None" = None):
+        self._cursor = cursor
+        self._statements = statements
+        self._pool = pool
+
+    def execute(self, operation, parameters=None):
+        try:
+            if self._statements is not None and isinstance(operation, str):
+                statement = self._statements.get(operation)
+                if statement is None:
+                    statement = self._cursor.prepare(operation)
+                    self._statements[operation] = statement
+                    if len(self._statements) > settings.DB_STATEMENT_CACHE_SIZE:
+                        _, antiga = self._statements.popitem(last=False)
+                        _free_statement(antiga)
+                else:
+                    self._statements.move_to_end(operation)
+                operation = statement
+            if parameters is None:
+                resultado = self._cursor.execute(operation)
+            else:
+                resultado = self._cursor.execute(operation, parameters)
+        except Exception as e:
+            # Só falhas de rede contam para o disjuntor: erro de SQL prova que o banco respondeu
+            if self._pool is not None and is_transient_error(e):
+                self._pool.record_failure()
+            raise
+        if self._pool is not None:
+            self._pool.breaker.record_success()
+        return resultado
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _free_statement(statement) -> None:
+    free = getattr(statement, "free", None)
+    if free:
+        try:
+            free()
+        except Exception:
+            pass
+
+
+class _Slot:
+    """Conexão física do pool e as instruções preparadas nela."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        # Cache de instruções preparadas (só se o driver suportar prepare)
+        self.statements = None
+        if settings.DB_STATEMENT_CACHE_SIZE > 0:
+            cur = raw.cursor()
+            if hasattr(cur, "prepare"):
+                self.statements = OrderedDict()
+            cur.close()
+        self.last_used = time.monotonic()
+        # Tempo limite das instruções em vigor nesta conexão (ms; None = padrão do servidor)
+        self.timeout_ms: int | None = None
+        # False depois que o servidor recusou SET STATEMENT TIMEOUT (não tenta de novo)
+        self.timeout_supported = True
+
+    def close(self) -> None:
+        for statement in (self.statements or {}).values():
+            _free_statement(statement)
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """
+    Conexão emprestada do pool. Tem a mesma interface usada pelos models
+    (cursor/commit/rollback/close); close() devolve a conexão ao pool.
+    """
+
+    def __init__(self, pool: "ConnectionPool", slot: _Slot):
+        self._pool = pool
+        self._slot = slot
+
+    def cursor(self):
+        return PooledCursor(self._slot.raw.cursor(), self._slot.statements, self._pool)
+
+    def set_statement_timeout(self, segundos: float) -> None:
+        """
+        Limita o tempo de cada instrução desta conexão (0 = sem limite). A
+        configuração vale para a sessão no Firebird (4+), então só é enviada
+        quando muda em relação ao último uso da conexão.
+        """
+        milissegundos = int(segundos * 1000)
+        slot = self._slot
+        if slot.timeout_ms == milissegundos or not slot.timeout_supported:
+            return
+        try:
+            slot.raw.execute_immediate(f"SET STATEMENT TIMEOUT {milissegundos} MILLISECOND")
+        except Exception as e:
+            # Ex: servidor anterior ao Firebird 4; segue sem limite nesta conexão
+            # (um aviso por conexão, não a cada troca de tempo limite)
+            slot.timeout_supported = False
+            logger.warning("Could not set statement timeout on %s: %s", self._pool.name, e)
+            return
+        slot.timeout_ms = milissegundos
+
+    def commit(self):
+        self._slot.raw.commit()
+        _registrar_escrita()
+
+    def rollback(self):
+        self._slot.raw.rollback()
+
+    def close(self):
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._pool.release(slot)
+
+    def discard(self):
+        """Fecha a conexão física em vez de devolvê-la (ex: conexão quebrada)."""
+        if self._slot is not None:
+            slot, self._slot = self._slot, None
+            self._pool.release(slot, discard=True)
+
+    def __getattr__(self, name):
+        return getattr(self._slot.raw, name)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões Firebird seguro entre threads.
+
+    Mantém até `max_size` conexões físicas; quem pede uma conexão com o pool
+    cheio espera até `acquire_timeout` segundos. As conexões ociosas circulam
+    em ordem FIFO, de modo que chamadas em sequência passam por todas elas
+    (útil no aquecimento).
+    """
+
+    def __init__(self, db_url: str, min_size: int, max_size: int, acquire_timeout: float):
+        self.db_url = db_url
+        self.name = _descrever(db_url)
+        # Disjuntor: com o banco fora, as chamadas falham na hora em vez de
+        # prender threads até o tempo limite da rede
+        self.breaker = CircuitBreaker(
+            f"db:{self.name}", settings.DB_BREAKER_FAILURES, settings.DB_BREAKER_RESET_SECONDS
+        )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._idle: deque[_Slot] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self.waits = 0          # vezes em que alguém esperou por uma conexão
+        self.timeouts = 0       # vezes em que a espera estourou o tempo
+
+    def _open(self) -> _Slot:
+        return _Slot(open_connection(self.db_url))
+
+    def record_failure(self) -> None:
+        _erros_transitorios.inc(pool=self.name)
+        self.breaker.record_failure()
+
+    def acquire(self) -> PooledConnection:
+        self.breaker.before_call()  # CircuitOpenError enquanto o banco estiver fora
+        prazo = time.monotonic() + self.acquire_timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    return PooledConnection(self, self._idle.popleft())
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    self.timeouts += 1
+                    raise RuntimeError(
+                        f"Tempo esgotado aguardando conexão com o banco (pool com {self.max_size} conexões em uso)."
+                    )
+                self.waits += 1
+                self._cond.wait(restante)
+
+        # Abre a conexão fora do lock: o attach ao Firebird pode demorar
+        try:
+            return PooledConnection(self, self._open())
+        except Exception:
+            self.record_failure()
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, slot: _Slot, discard: bool = False) -> None:
+        if not discard:
+            try:
+                # Encerra a transação aberta pela leitura: a próxima requisição
+                # começa um snapshot novo e não enxerga dados antigos
+                slot.raw.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            slot.close()
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            return
+
+        slot.last_used = time.monotonic()
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify()
+
+    def prefill(self, size: int | None = None) -> int:
+        """Abre conexões até haver `size` (padrão: min_size) ociosas; retorna quantas abriu."""
+        alvo = self.min_size if size is None else size
+        abertas = 0
+        while True:
+            with self._cond:
+                if len(self._idle) >= alvo or self._size >= self.max_size:
+                    return abertas
+                self._size += 1
+            try:
+                slot = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append(slot)
+                self._cond.notify()
+            abertas += 1
+
+    def close_all(self) -> None:
+        """Fecha as conexões ociosas (as emprestadas são fechadas ao serem devolvidas)."""
+        with self._cond:
+            ociosas, self._idle = list(self._idle), deque()
+            self._size -= len(ociosas)
+        for slot in ociosas:
+            slot.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "max_size": self.max_size,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "circuit": self.breaker.stats(),
+            }
+
+
+# ---------------------- roteamento leitura/escrita ----------------------
+#
+# Com DB_READ_URLS configurado, as leituras marcadas pelos models
+# (get_connection(read_only=True)) vão para as réplicas somente leitura;
+# as escritas e todo o resto continuam em DB_URL. Quem acabou de gravar lê
+# do primário por DB_READ_YOUR_WRITES_SECONDS (ReadYourWritesMiddleware),
+# para não deixar de ver a própria alteração enquanto a réplica não a recebe.
+
+# Leituras do contexto atual forçadas no primário (ver use_primary)
+_primario: ContextVar[bool] = ContextVar("db_primario", default=False)
+
+# Marca da requisição atual: vira [True] quando algo é gravado (commit)
+_escrita: ContextVar[list | None] = ContextVar("db_escrita", default=None)
+
+
+@contextmanager
+def use_primary():
+    """Dentro do bloco, as leituras vão para o primário mesmo havendo réplicas."""
+    token = _primario.set(True)
+    try:
+        yield
+    finally:
+        _primario.reset(token)
+
+
+def _registrar_escrita() -> None:
+    marca = _escrita.get()
+    if marca is not None:
+        marca[0] = True
+
+
+def _descrever(db_url: str) -> str:
+    # Host e banco, sem usuário e senha (vai para /health/ready)
+    parsed = urlparse(db_url)
+    return f"{parsed.hostname}:{parsed.port or 3050}{parsed.path}"
+
+
+class _Replica:
+    def __init__(self, db_url: str):
+        self.nome = _descrever(db_url)
+        self.pool = ConnectionPool(
+            db_url,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+        )
+        self.latencia: float | None = None   # média móvel do SELECT 1 (segundos)
+        self.indisponivel_ate = 0.0           # time.monotonic(); 0 = disponível
+        self.falhas = 0
+        self.ultimo_erro: str | None = None
+        self.peso_atual = 0.0                 # estado do round-robin ponderado
+        self.leituras = 0
+
+
+class ReplicaSet:
+    """
+    Réplicas somente leitura, escolhidas por round-robin ponderado pela
+    latência (a réplica duas vezes mais rápida recebe o dobro das leituras).
+    Uma réplica que falha fica fora por DB_READ_HEALTH_SECONDS; a verificação
+    periódica (start) mede a latência e devolve ao rodízio as que voltaram.
+    """
+
+    def __init__(self, db_urls: list[str]):
+        self._replicas = [_Replica(url) for url in db_urls]
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _peso(self, replica: _Replica, media: float) -> float:
+        return 1.0 / max(replica.latencia if replica.latencia is not None else media, 0.001)
+
+    def _escolher(self, excluidas: set) -> _Replica | None:
+        agora = time.monotonic()
+        with self._lock:
+            candidatas = [r for r in self._replicas if r not in excluidas and r.indisponivel_ate <= agora]
+            if not candidatas:
+                return None
+            medidas = [r.latencia for r in candidatas if r.latencia is not None]
+            media = sum(medidas) / len(medidas) if medidas else 0.01
+            # Round-robin ponderado suave (sem rajadas na mesma réplica)
+            total = 0.0
+            escolhida = None
+            for replica in candidatas:
+                peso = self._peso(replica, media)
+                replica.peso_atual += peso
+                total += peso
+                if escolhida is None or replica.peso_atual > escolhida.peso_atual:
+                    escolhida = replica
+            escolhida.peso_atual -= total
+            escolhida.leituras += 1
+            return escolhida
+
+    def _falhou(self, replica: _Replica, e: Exception) -> None:
+        with self._lock:
+            replica.falhas += 1
+            replica.ultimo_erro = f"{type(e).__name__}: {e}"
+            replica.indisponivel_ate = time.monotonic() + settings.DB_READ_HEALTH_SECONDS
+        logger.warning("Read replica %s unavailable: %s", replica.nome, e)
+
+    def _respondeu(self, replica: _Replica, latencia: float) -> None:
+        with self._lock:
+            replica.latencia = latencia if replica.latencia is None else 0.8 * replica.latencia + 0.2 * latencia
+            replica.indisponivel_ate = 0.0
+
+    def acquire(self) -> "PooledConnection | None":
+        """Conexão de uma réplica disponível, ou None se nenhuma atender (use o primário)."""
+        tentadas: set = set()
+        while True:
+            replica = self._escolher(tentadas)
+            if replica is None:
+                return None
+            tentadas.add(replica)
+            try:
+                return replica.pool.acquire()
+            except RuntimeError:
+                continue  # Pool da réplica esgotado: tenta outra (ela não está fora do ar)
+            except Exception as e:
+                self._falhou(replica, e)
+
+    def check(self) -> None:
+        """Mede a latência de todas as réplicas (inclusive as que estão fora)."""
+        for replica in self._replicas:
+            try:
+                latencia = ping(replica.pool)
+            except Exception as e:
+                self._falhou(replica, e)
+            else:
+                self._respondeu(replica, latencia)
+
+    def prefill(self) -> None:
+        for replica in self._replicas:
+            try:
+                replica.pool.prefill()
+            except Exception as e:
+                self._falhou(replica, e)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="read-replicas", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _executar(self) -> None:
+        while True:
+            self.check()
+            if self._parar.wait(settings.DB_READ_HEALTH_SECONDS):
+                return
+
+    def close_all(self) -> None:
+        for replica in self._replicas:
+            replica.pool.close_all()
+
+    def stats(self) -> list[dict]:
+        agora = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "replica": r.nome,
+                    "available": r.indisponivel_ate <= agora,
+                    "latency_ms": round(r.latencia * 1000, 2) if r.latencia is not None else None,
+                    "reads": r.leituras,
+                    "failures": r.falhas,
+                    "last_error": r.ultimo_erro,
+                    "pool": r.pool.stats(),
+                }
+                for r in self._replicas
+            ]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI: requisições que gravam (POST, PUT, PATCH, DELETE) leem
+    do primário, e depois de uma gravação o cliente recebe o cookie
+    db_primario, que manda as leituras dele ao primário por
+    DB_READ_YOUR_WRITES_SECONDS (em qualquer worker). Sem réplicas, não faz nada.
+    """
+
+    COOKIE = "db_primario"
+
+    def __init__(self, app):
+        self.app = app
+
+    def _cookie_valido(self, scope) -> bool:
+        for nome, valor in scope.get("headers", []):
+            if nome != b"cookie":
+                continue
+            for parte in valor.decode("latin-1").split(";"):
+                chave, _, ate = parte.strip().partition("=")
+                if chave == self.COOKIE:
+                    try:
+                        return float(ate) > time.time()
+                    except ValueError:
+                        return False
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DB_READ_URLS:
+            await self.app(scope, receive, send)
+            return
+
+        primario = scope["method"] not in ("GET", "HEAD", "OPTIONS") or self._cookie_valido(scope)
+        marca = [False]
+        token_primario = _primario.set(primario)
+        token_escrita = _escrita.set(marca)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and marca[0]:
+                segundos = settings.DB_READ_YOUR_WRITES_SECONDS
+                cookie = (f"{self.COOKIE}={time.time() + segundos:.0f}; Max-Age={segundos:.0f}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _primario.reset(token_primario)
+            _escrita.reset(token_escrita)
+
+
+# Pool principal, criado no primeiro uso
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    settings.DB_URL,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    acquire_timeout=settings.DB_POOL_ACQUIRE_TIMEOUT,
+                )
+    return _pool
+
+
+# Réplicas de leitura, criadas no primeiro uso (None sem DB_READ_URLS)
+_replicas: ReplicaSet | None = None
+
+
+def get_replicas() -> ReplicaSet | None:
+    global _replicas
+    if _replicas is None and settings.DB_READ_URLS:
+        with _pool_lock:
+            if _replicas is None:
+                _replicas = ReplicaSet(settings.DB_READ_URLS)
+    return _replicas
+
+
+def get_connection(read_only: bool = False, timeout: float | None = None):
+    # Conexão emprestada do pool; conn.close() a devolve. Leituras (read_only)
+    # vão para uma réplica quando houver, salvo em contexto de primário.
+    # `timeout`: limite (segundos) de cada instrução; None usa
+    # DB_STATEMENT_TIMEOUT_SECONDS e 0 tira o limite (ex: exportações)
+    conn = None
+    if read_only and not _primario.get():
+        replicas = get_replicas()
+        if replicas is not None:
+            conn = replicas.acquire()
+    if conn is None:
+        conn = get_pool().acquire()
+    conn.set_statement_timeout(settings.DB_STATEMENT_TIMEOUT_SECONDS if timeout is None else timeout)
+
+    # Em modo de depuração, conta as conexões/instruções da requisição atual
+    return instrument(conn)
+
+
+def read_with_retry(consulta: Callable[..., T], read_only: bool = True, timeout: float | None = None) -> T:
+    """
+    Executa `consulta(cur)` em uma conexão do pool e devolve o resultado. Em
+    falha de rede/conexão descarta a conexão e repete até DB_READ_RETRIES
+    vezes, com espera aleatória crescente. Use só para leituras (repetir uma
+    escrita poderia gravá-la duas vezes). As demais exceções sobem sem repetir.
+    """
+    tentativa = 0
+    while True:
+        conn = None
+        cur = None
+        try:
+            conn = get_connection(read_only=read_only, timeout=timeout)
+            cur = conn.cursor()
+            return consulta(cur)
+        except Exception as e:
+            if not is_transient_error(e) or tentativa >= settings.DB_READ_RETRIES:
+                raise
+            if cur:
+                cur.close()
+                cur = None
+            if conn:
+                # Conexão quebrada: não volta para o pool
+                conn.discard()
+            _leituras_repetidas.inc()
+            time.sleep(random.uniform(0, settings.DB_RETRY_BACKOFF_SECONDS * (2 ** tentativa)))
+            tentativa += 1
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+
+def ping(pool: ConnectionPool | None = None) -> float:
+    """Executa uma consulta mínima no banco (padrão: primário) e retorna a latência em segundos."""
+    inicio = time.perf_counter()
+    conn = (pool or get_pool()).acquire()
+    cur = None
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM RDB$DATABASE")
+        cur.fetchone()
+    except Exception:
+        if cur:
+            cur.close()
+            cur = None
+        # Conexão possivelmente quebrada: não volta para o pool
+        conn.discard()
+        raise
+    finally:
+        if cur:
+            cur.close()
+        conn.close()
+    return time.perf_counter() - inicio
+
+
+# Estado dos disjuntores e uso dos pools (primário e réplicas) para GET /metrics
+def _pools() -> list[ConnectionPool]:
+    replicas = get_replicas()
+    return [get_pool()] + ([r.pool for r in replicas._replicas] if replicas is not None else [])
+
+
+_ESTADOS_CIRCUITO = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+metrics.gauge(
+    "db_circuit_state", "Disjuntor do banco por pool (0 fechado, 1 meio-aberto, 2 aberto)",
+    lambda: [({"pool": p.name}, _ESTADOS_CIRCUITO[p.breaker.state]) for p in _pools()],
+)
+metrics.gauge(
+    "db_circuit_opened", "Vezes em que o disjuntor do pool abriu desde a partida",
+    lambda: [({"pool": p.name}, p.breaker.opened_count) for p in _pools()],
+)
+metrics.gauge(
+    "db_pool_connections", "Conexões do pool por situação",
+    lambda: [
+        ({"pool": p.name, "state": situacao}, p.stats()[situacao])
+        for p in _pools() for situacao in ("idle", "in_use")
+    ],
+)
@@ -1,18 +1,70 @@
 # core/deps.py
 
-from fastapi import Depends, HTTPException, status
+import logging
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from core.configs import settings
+from core.signing import TokenError
+from core.auth import decode_token
+from core.token_cache import VerifiedTokenCache
+from core.log import set_user
 from api.v1.models.g_usuario_model import UserModel # <--- Importe o UserModel
 
+logger = logging.getLogger(__name__)
+
 # Define o esquema de segurança OAuth2 (token tipo Bearer)
 oauth2_schema = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/usuarios/login"
 )
 
+# Mesmo esquema, sem exigir o cabeçalho (rotas que aceitam outra credencial)
+oauth2_schema_opcional = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/usuarios/login",
+    auto_error=False
+)
+
+# Cache dos tokens já verificados: evita refazer assinatura e claims a cada requisição
+verified_tokens = VerifiedTokenCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+# Verifica o token JWT (usando o cache quando possível) e retorna o payload
+def verify_token(token: str) -> dict:
+    if verified_tokens.is_revoked(token):
+        raise TokenError("Token revogado.")
+
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        verified_tokens.put(token, payload)
+
+    return payload
+
+
+# Revoga um token já verificado, removendo-o também do cache
+def revoke_token(token: str) -> None:
+    payload = verify_token(token)
+    verified_tokens.revoke(token, exp=payload.get("exp", 0))
+
+
 # Função que retorna o usuário autenticado com base no token JWT
 def get_current_user(token: str = Depends(oauth2_schema)) -> dict:
+    return _user_from_token(token, "access_token")
+
+
+# Feed ao vivo: aceita o token no cabeçalho ou um ticket do feed na URL
+# (?ticket=, obtido em POST /caixa_itens/feed/ticket), para o EventSource do navegador
+def get_feed_user(
+    ticket: Optional[str] = Query(None, description="Ticket do feed (para EventSource, que não envia Authorization)"),
+    token: Optional[str] = Depends(oauth2_schema_opcional)
+) -> dict:
+    if token:
+        return _user_from_token(token, "access_token")
+    return _user_from_token(ticket or "", "feed_ticket")
+
+
+# Valida o token (do tipo esperado) e carrega o usuário do banco
+def _user_from_token(token: str, tipo: str) -> dict:
     credential_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail='Could not validate credentials',
@@ -20,19 +72,15 @@ def get_current_user(token: str = Depends(oauth2_schema)) -> dict:
     )
 
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.ALGORITHM],
-            options={"verify_aud": False}
-        )
+        payload = verify_token(token)
 
         user_id: str = payload.get("sub")
 
-        if user_id is None:
+        # Um ticket do feed não serve como token de acesso (nem o contrário)
+        if user_id is None or payload.get("type") != tipo:
             raise credential_exception
 
-    except JWTError:
+    except TokenError:
         raise credential_exception
 
     # --- NOVO: Buscar os dados completos do usuário do banco de dados ---
@@ -50,7 +98,7 @@ def get_current_user(token: str = Depends(oauth2_schema)) -> dict:
     try:
         user = UserModel.get_by_id(user_id_int)
     except Exception as e: # Captura qualquer erro ao buscar no DB
-        print(f"Error fetching user in get_current_user: {e}")
+        logger.exception("Error fetching user in _user_from_token")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve user data. {str(e)}"
@@ -61,4 +109,7 @@ def get_current_user(token: str = Depends(oauth2_schema)) -> dict:
         # pode indicar um usuário deletado ou um ID inválido no token.
         raise credential_exception # Ou HTTPException(404, "User associated with token not found")
 
+    # Identifica o usuário nos logs da requisição
+    set_user(user["user_id"])
+
     return user # Retorna o dicionário completo do usuário
\ No newline at end of file
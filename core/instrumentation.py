@@ -0,0 +1,121 @@
+# core/instrumentation.py
+
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.configs import settings
+
+
+@dataclass
+class QueryStats:
+    """Contadores de acesso ao banco de uma requisição (ou de um bloco `count_queries`)."""
+    connections: int = 0
+    statements: int = 0
+    db_time: float = 0.0                         # segundos gastos em execute()
+    sql: list[str] = field(default_factory=list)  # instruções executadas, na ordem
+
+
+# Contadores ativos no contexto atual; None quando a instrumentação está desligada
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+class InstrumentedCursor:
+    """Repassa tudo ao cursor real, contando e cronometrando cada execute()."""
+
+    def __init__(self, cursor, stats: QueryStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, operation, parameters=None):
+        self._stats.statements += 1
+        self._stats.sql.append(str(operation).strip())
+        inicio = time.perf_counter()
+        try:
+            if parameters is None:
+                return self._cursor.execute(operation)
+            return self._cursor.execute(operation, parameters)
+        finally:
+            self._stats.db_time += time.perf_counter() - inicio
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """Conexão que devolve cursores instrumentados."""
+
+    def __init__(self, conn, stats: QueryStats):
+        self._conn = conn
+        self._stats = stats
+
+    def cursor(self):
+        return InstrumentedCursor(self._conn.cursor(), self._stats)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Contadores da medição ativa no contexto atual, se houver."""
+    return _current_stats.get()
+
+
+def instrument(conn):
+    """
+    Envolve a conexão com contadores se houver uma medição ativa no contexto.
+    Sem medição ativa devolve a própria conexão (sem custo no caminho normal).
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        return conn
+    stats.connections += 1
+    return InstrumentedConnection(conn, stats)
+
+
+@contextmanager
+def count_queries():
+    """Mede as conexões e instruções executadas dentro do bloco."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class QueryCountMiddleware:
+    """
+    Middleware ASGI que, com DEBUG_QUERY_COUNT ativo, conta as conexões e
+    instruções SQL de cada requisição e as devolve nos cabeçalhos
+    X-DB-Connections, X-DB-Statements e Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DEBUG_QUERY_COUNT:
+            await self.app(scope, receive, send)
+            return
+
+        # Reaproveita a medição aberta por um middleware externo (ex: log de acesso)
+        existente = current_stats()
+        with (nullcontext(existente) if existente is not None else count_queries()) as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (b"x-db-connections", str(stats.connections).encode()),
+                        (b"x-db-statements", str(stats.statements).encode()),
+                        (b"server-timing", f"db;dur={stats.db_time * 1000:.2f}".encode()),
+                    ]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,313 @@
+# core/jobs.py
+#
+# Tarefas demoradas (exportações, reconstrução de resumos) executadas fora
+# da requisição: POST /jobs devolve o ID na hora e o cliente acompanha por
+# GET /jobs/{id}. As tarefas rodam em um executor próprio, com
+# JOBS_MAX_WORKERS vagas, separado do threadpool que atende as requisições.
+#
+# O estado de cada tarefa fica em JOBS_DIR/<id>/job.json (com os arquivos
+# de resultado na mesma pasta), então qualquer worker do uvicorn responde
+# pela tarefa, e o cancelamento é um arquivo-marca que a tarefa consulta
+# entre um bloco e outro. Com JOBS_EXECUTOR = "process" as tarefas rodam em
+# processos separados (não disputam o GIL com a API).
+#
+# Uma tarefa é uma função `funcao(ctx: JobContext, **params) -> dict`,
+# registrada pelo caminho "modulo:funcao" (importável também no processo
+# filho). O dict devolvido vira o resultado; a chave "arquivo" aponta o
+# arquivo para download criado com ctx.path().
+
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDO = "concluido"
+FALHOU = "falhou"
+CANCELADO = "cancelado"
+FINAIS = {CONCLUIDO, FALHOU, CANCELADO}
+
+_ID_VALIDO = re.compile(r"^[0-9a-f]{32}$")
+
+# Intervalo mínimo (segundos) entre gravações do progresso em job.json
+_INTERVALO_PROGRESSO = 0.5
+
+
+class JobCancelled(Exception):
+    """Levantada dentro da tarefa quando o cancelamento foi pedido."""
+
+
+class JobQueueFull(RuntimeError):
+    """Já há JOBS_MAX_QUEUED tarefas aguardando neste worker."""
+
+
+def _pasta(job_id: str) -> str:
+    if not _ID_VALIDO.match(job_id):
+        raise ValueError("ID de tarefa inválido.")
+    return os.path.join(settings.JOBS_DIR, job_id)
+
+
+def _agora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _ler(job_id: str) -> dict | None:
+    try:
+        with open(os.path.join(_pasta(job_id), "job.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _gravar(job: dict) -> None:
+    caminho = os.path.join(_pasta(job["id"]), "job.json")
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(job, f, ensure_ascii=False, default=str)
+    os.replace(temporario, caminho)  # Troca atômica: leitores nunca veem o arquivo pela metade
+
+
+def _atualizar(job_id: str, **campos) -> dict | None:
+    job = _ler(job_id)
+    if job is None:
+        return None
+    job.update(campos)
+    if campos.get("estado") in FINAIS:
+        job["terminado_em"] = _agora()
+        job["expira_em"] = (datetime.now() + timedelta(seconds=settings.JOBS_RESULT_TTL_SECONDS)).isoformat(timespec="seconds")
+    _gravar(job)
+    return job
+
+
+def _processo_vivo(job: dict) -> bool:
+    if job.get("host") != socket.gethostname():
+        return True  # Outra máquina: não há como verificar daqui
+    try:
+        os.kill(job["pid"], 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, KeyError, TypeError):
+        return True
+    return True
+
+
+class JobContext:
+    """O que a tarefa recebe: progresso, cancelamento e pasta de resultados."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.pasta = _pasta(job_id)
+        self._gravado_em = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return os.path.exists(os.path.join(self.pasta, "cancelar"))
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, fracao: float | None = None, mensagem: str | None = None) -> None:
+        """Registra o andamento (0 a 1) e verifica o cancelamento."""
+        self.check_cancelled()
+        agora = time.monotonic()
+        if agora - self._gravado_em < _INTERVALO_PROGRESSO:
+            return
+        self._gravado_em = agora
+        campos = {}
+        if fracao is not None:
+            campos["progresso"] = round(min(max(fracao, 0.0), 1.0), 4)
+        if mensagem is not None:
+            campos["mensagem"] = mensagem
+        _atualizar(self.job_id, **campos)
+
+    def path(self, nome: str) -> str:
+        """Caminho de um arquivo de resultado dentro da pasta da tarefa."""
+        return os.path.join(self.pasta, os.path.basename(nome))
+
+
+def _importar(caminho: str):
+    modulo, funcao = caminho.split(":")
+    return getattr(importlib.import_module(modulo), funcao)
+
+
+def _executar(caminho: str, job_id: str, params: dict) -> None:
+    """Roda a tarefa (no thread ou no processo do executor) e grava o desfecho."""
+    ctx = JobContext(job_id)
+    if ctx.cancelled:
+        _atualizar(job_id, estado=CANCELADO)
+        return
+    _atualizar(job_id, estado=EXECUTANDO, iniciado_em=_agora(), pid=os.getpid(), host=socket.gethostname())
+    try:
+        resultado = _importar(caminho)(ctx, **params) or {}
+        _atualizar(job_id, estado=CONCLUIDO, progresso=1.0, resultado=resultado)
+    except JobCancelled:
+        _atualizar(job_id, estado=CANCELADO)
+    except Exception as e:
+        logger.error("Job %s failed: %s", job_id, e)
+        _atualizar(job_id, estado=FALHOU, erro=f"{type(e).__name__}: {e}")
+
+
+class JobRunner:
+    def __init__(self):
+        self._tipos: dict[str, str] = {}
+        self._executor: Executor | None = None
+        self._futuros: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def register(self, tipo: str, caminho: str) -> None:
+        """Associa o tipo de tarefa à função "modulo:funcao"."""
+        self._tipos[tipo] = caminho
+
+    @property
+    def tipos(self) -> list[str]:
+        return sorted(self._tipos)
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        os.makedirs(settings.JOBS_DIR, exist_ok=True)
+        if settings.JOBS_EXECUTOR == "process":
+            # spawn: o processo filho não herda threads nem conexões abertas do worker
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.JOBS_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=settings.JOBS_MAX_WORKERS, thread_name_prefix="job")
+        self.cleanup()
+
+    def shutdown(self) -> None:
+        """Cancela as tarefas deste worker e libera o executor sem esperar."""
+        with self._lock:
+            futuros = dict(self._futuros)
+        for job_id in futuros:
+            self.cancel(job_id)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, tipo: str, params: dict, owner) -> dict:
+        if tipo not in self._tipos:
+            raise ValueError(f"Tipo de tarefa desconhecido: {tipo}. Disponíveis: {', '.join(self.tipos)}.")
+        if self._executor is None:
+            raise RuntimeError("O executor de tarefas não foi iniciado.")
+        self.cleanup()
+
+        with self._lock:
+            aguardando = sum(1 for f in self._futuros.values() if not f.running())
+            if aguardando >= settings.JOBS_MAX_QUEUED:
+                raise JobQueueFull(f"Há {aguardando} tarefas aguardando; tente novamente em instantes.")
+
+            job_id = uuid.uuid4().hex
+            os.makedirs(_pasta(job_id))
+            job = {
+                "id": job_id,
+                "tipo": tipo,
+                "params": params,
+                "owner": owner,
+                "estado": PENDENTE,
+                "progresso": 0.0,
+                "mensagem": None,
+                "resultado": None,
+                "erro": None,
+                "criado_em": _agora(),
+                "iniciado_em": None,
+                "terminado_em": None,
+                "expira_em": None,
+                "pid": os.getpid(),
+                "host": socket.gethostname(),
+            }
+            _gravar(job)
+            futuro = self._executor.submit(_executar, self._tipos[tipo], job_id, params)
+            self._futuros[job_id] = futuro
+        futuro.add_done_callback(lambda _f, job_id=job_id: self._terminou(job_id))
+        return job
+
+    def _terminou(self, job_id: str) -> None:
+        with self._lock:
+            self._futuros.pop(job_id, None)
+
+    def get(self, job_id: str) -> dict | None:
+        job = _ler(job_id)
+        if job is not None and job["estado"] not in FINAIS and not _processo_vivo(job):
+            # O processo que rodava a tarefa terminou sem gravar o desfecho
+            job = _atualizar(job_id, estado=FALHOU, erro="O processo que executava a tarefa foi encerrado.")
+        return job
+
+    def cancel(self, job_id: str) -> dict | None:
+        job = self.get(job_id)
+        if job is None or job["estado"] in FINAIS:
+            return job
+        # A marca vale para qualquer worker/processo; a tarefa a vê no próximo bloco
+        open(os.path.join(_pasta(job_id), "cancelar"), "w").close()
+        with self._lock:
+            futuro = self._futuros.get(job_id)
+        if futuro is not None and futuro.cancel():
+            # Ainda não tinha começado: sai da fila agora
+            return _atualizar(job_id, estado=CANCELADO)
+        return _ler(job_id)
+
+    def list_jobs(self, owner=None) -> list[dict]:
+        jobs = []
+        try:
+            nomes = os.listdir(settings.JOBS_DIR)
+        except FileNotFoundError:
+            return []
+        for nome in nomes:
+            if not _ID_VALIDO.match(nome):
+                continue
+            job = self.get(nome)
+            if job is not None and (owner is None or job["owner"] == owner):
+                jobs.append(job)
+        return sorted(jobs, key=lambda j: j["criado_em"], reverse=True)
+
+    def result_path(self, job: dict) -> str | None:
+        arquivo = (job.get("resultado") or {}).get("arquivo")
+        if job["estado"] != CONCLUIDO or not arquivo:
+            return None
+        caminho = os.path.join(_pasta(job["id"]), os.path.basename(arquivo))
+        return caminho if os.path.exists(caminho) else None
+
+    def cleanup(self) -> int:
+        """Apaga as tarefas terminadas há mais de JOBS_RESULT_TTL_SECONDS (e seus arquivos)."""
+        agora = datetime.now().isoformat(timespec="seconds")
+        removidas = 0
+        try:
+            nomes = os.listdir(settings.JOBS_DIR)
+        except FileNotFoundError:
+            return 0
+        for nome in nomes:
+            if not _ID_VALIDO.match(nome):
+                continue
+            job = _ler(nome)
+            if job is not None and job.get("expira_em") and job["expira_em"] <= agora:
+                shutil.rmtree(_pasta(nome), ignore_errors=True)
+                removidas += 1
+        return removidas
+
+    def stats(self) -> dict:
+        with self._lock:
+            futuros = list(self._futuros.values())
+        return {
+            "executor": settings.JOBS_EXECUTOR,
+            "max_workers": settings.JOBS_MAX_WORKERS,
+            "running": sum(1 for f in futuros if f.running()),
+            "queued": sum(1 for f in futuros if not f.running()),
+        }
+
+
+runner = JobRunner()
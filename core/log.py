@@ -0,0 +1,216 @@
+# core/log.py
+#
+# Logging estruturado (uma linha JSON por registro) fora do caminho da
+# requisição: os loggers só enfileiram o registro (QueueHandler) e uma
+# thread (QueueListener) formata e escreve. Com a fila cheia o registro é
+# descartado e contado, em vez de segurar a requisição.
+#
+# Cada registro leva o contexto da requisição em que foi gerado
+# (request_id, método, rota, user_id) e, no log de acesso, o tempo e a
+# quantidade de instruções no banco. Níveis por módulo em LOG_LEVELS;
+# logs INFO de alto volume são amostrados por logger (LOG_SAMPLING).
+#
+# Uso nos módulos:  logger = logging.getLogger(__name__)
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from core import metrics
+from core.configs import settings
+from core.instrumentation import count_queries, current_stats
+
+# Contexto da requisição atual. É um dict mutável: o que for preenchido
+# dentro do threadpool (ex: user_id em get_current_user) aparece também
+# no log de acesso, escrito pelo middleware
+_contexto: ContextVar[dict | None] = ContextVar("log_contexto", default=None)
+
+# Atributos padrão de LogRecord (o resto veio de `extra=` e vai para o JSON)
+_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "contexto"}
+
+_descartados = metrics.counter("log_records_dropped_total", "Registros de log descartados com a fila cheia")
+
+access_logger = logging.getLogger("api.access")
+
+_listener: logging.handlers.QueueListener | None = None
+_handler: logging.handlers.QueueHandler | None = None
+
+
+def set_user(user_id) -> None:
+    """Associa o usuário autenticado aos logs da requisição atual."""
+    contexto = _contexto.get()
+    if contexto is not None:
+        contexto["user_id"] = user_id
+
+
+def request_id() -> str | None:
+    contexto = _contexto.get()
+    return contexto["request_id"] if contexto else None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        contexto = getattr(record, "contexto", None)
+        if contexto:
+            dados.update({k: v for k, v in contexto.items() if v is not None})
+        for chave, valor in vars(record).items():
+            if chave not in _PADRAO and not chave.startswith("_"):
+                dados[chave] = valor
+        if record.exc_text:
+            dados["exc"] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class _SoMensagem(logging.Formatter):
+    """Só a mensagem, sem traceback (ele vai em um campo próprio do JSON)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
+
+
+class _FilaHandler(logging.handlers.QueueHandler):
+    """Enfileira sem bloquear; guarda no registro o contexto da requisição."""
+
+    def __init__(self, fila: queue.Queue, amostragem: dict[str, float]):
+        super().__init__(fila)
+        self._amostragem = amostragem
+        self.setFormatter(_SoMensagem())
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Amostragem só de INFO/DEBUG: avisos e erros sempre saem
+        taxa = self._amostragem.get(record.name)
+        if taxa is not None and record.levelno <= logging.INFO and random.random() >= taxa:
+            return False
+        return super().filter(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Traceback formatado aqui: os objetos da requisição não devem ir
+        # para outra thread. A base trabalha sobre uma cópia do registro,
+        # então os demais handlers (ex: caplog) recebem o original intacto
+        exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip() if record.exc_info else None
+        copia = super().prepare(record)
+        copia.exc_text = exc_text
+        contexto = _contexto.get()
+        if contexto is not None:
+            copia.contexto = dict(contexto)
+        return copia
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _descartados.inc()
+
+
+def setup_logging() -> None:
+    """Configura o logger raiz (uma vez por ciclo de vida; chamadas repetidas não fazem nada)."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(JsonFormatter())
+    fila: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        if isinstance(handler, _FilaHandler):
+            raiz.removeHandler(handler)
+    _handler = _FilaHandler(fila, settings.LOG_SAMPLING)
+    raiz.addHandler(_handler)
+    raiz.setLevel(settings.LOG_LEVEL)
+    for nome, nivel in settings.LOG_LEVELS.items():
+        logging.getLogger(nome).setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(fila, saida, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Escreve o que ainda estiver na fila, para a thread de escrita e retira o
+    handler do logger raiz (sem ninguém esvaziando a fila, tudo seria descartado).
+    """
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class LogContextMiddleware:
+    """
+    Middleware ASGI: abre o contexto de log da requisição (X-Request-ID do
+    cliente ou um novo, devolvido no cabeçalho da resposta) e escreve uma
+    linha de acesso ao final, com status, duração e tempo no banco.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recebido = dict(scope.get("headers") or []).get(b"x-request-id", b"").decode("latin-1")
+        contexto = {
+            "request_id": recebido[:64] or uuid.uuid4().hex,
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": None,
+            "user_id": None,
+        }
+        token = _contexto.set(contexto)
+        status = 500
+        continuo = False
+        inicio = time.perf_counter()
+
+        async def send_with_id(message):
+            nonlocal status, continuo
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Fluxo de eventos (SSE, ex: /caixa_itens/feed): dura o tempo que o cliente ficar conectado
+                tipo = dict(message.get("headers") or []).get(b"content-type", b"")
+                continuo = tipo.startswith(b"text/event-stream")
+                headers = list(message.get("headers", [])) + [(b"x-request-id", contexto["request_id"].encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        # Reaproveita a medição do QueryCountMiddleware, se houver; senão mede aqui
+        stats = current_stats()
+        medicao = count_queries() if stats is None and settings.LOG_DB_TIMINGS else None
+        try:
+            if medicao is not None:
+                with medicao as stats:
+                    await self.app(scope, receive, send_with_id)
+            else:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            rota = scope.get("route")
+            contexto["route"] = getattr(rota, "path", None)
+            duracao = time.perf_counter() - inicio
+            extra = {"status": status, "duration_ms": round(duracao * 1000, 2)}
+            if stats is not None:
+                extra["db_ms"] = round(stats.db_time * 1000, 2)
+                extra["db_statements"] = stats.statements
+            # Lentas e erros sempre saem (WARNING não é amostrado); fluxos contínuos não contam como lentos
+            lenta = not continuo and duracao >= settings.LOG_SLOW_REQUEST_SECONDS
+            nivel = logging.WARNING if status >= 500 or lenta else logging.INFO
+            access_logger.log(nivel, "%s %s %s", scope["method"], scope["path"], status, extra=extra)
+            _contexto.reset(token)
@@ -0,0 +1,106 @@
+# core/metrics.py
+#
+# Métricas do processo no formato texto do Prometheus (GET /metrics).
+# Contadores são incrementados pelo código; medidores são lidos no momento
+# da coleta por uma função (ex: estado do disjuntor do banco). Cada worker
+# do uvicorn tem os seus próprios valores.
+
+import logging
+import threading
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def _rotulos(labels: dict) -> str:
+    if not labels:
+        return ""
+    partes = []
+    for nome, valor in labels.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{nome}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(float(valor))
+
+
+class Counter:
+    """Contador que só cresce, opcionalmente separado por rótulos."""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._valores: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor: float = 1.0, **labels) -> None:
+        chave = tuple(str(labels.get(nome, "")) for nome in self.labels)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def value(self, **labels) -> float:
+        chave = tuple(str(labels.get(nome, "")) for nome in self.labels)
+        with self._lock:
+            return self._valores.get(chave, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            valores = dict(self._valores)
+        linhas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        if not valores and not self.labels:
+            valores[()] = 0.0
+        for chave, valor in sorted(valores.items()):
+            linhas.append(f"{self.name}{_rotulos(dict(zip(self.labels, chave)))} {_numero(valor)}")
+        return linhas
+
+
+class Gauge:
+    """Medidor lido na coleta: `coletar()` devolve pares (rótulos, valor)."""
+
+    def __init__(self, name: str, help: str, coletar: Callable[[], Iterable[tuple[dict, float]]]):
+        self.name = name
+        self.help = help
+        self._coletar = coletar
+
+    def render(self) -> list[str]:
+        linhas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            for labels, valor in self._coletar():
+                linhas.append(f"{self.name}{_rotulos(labels)} {_numero(valor)}")
+        except Exception as e:
+            # Uma métrica com defeito não derruba a coleta das demais
+            logger.error("Metric %s failed: %s", self.name, e)
+        return linhas
+
+
+_registro: dict[str, Counter | Gauge] = {}
+_registro_lock = threading.Lock()
+
+
+def counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+    """Retorna o contador `name`, criando-o na primeira chamada."""
+    with _registro_lock:
+        metrica = _registro.get(name)
+        if metrica is None:
+            metrica = _registro[name] = Counter(name, help, labels)
+        return metrica
+
+
+def gauge(name: str, help: str, coletar: Callable[[], Iterable[tuple[dict, float]]]) -> Gauge:
+    """Registra (ou substitui) o medidor `name`."""
+    with _registro_lock:
+        metrica = _registro[name] = Gauge(name, help, coletar)
+        return metrica
+
+
+def render() -> str:
+    """Todas as métricas no formato de exposição do Prometheus."""
+    with _registro_lock:
+        metricas = list(_registro.values())
+    linhas = []
+    for metrica in metricas:
+        linhas.extend(metrica.render())
+    return "\n".join(linhas) + "\n"
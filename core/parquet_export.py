@@ -0,0 +1,323 @@
+# core/parquet_export.py
+#
+# Exportação de um Resource (core/resource.py) para arquivos Parquet, para
+# análise fora da API (BI). Lê o cursor em blocos, converte cada bloco em
+# um RecordBatch do Arrow e grava, opcionalmente particionado por mês de uma
+# coluna de data (estilo Hive: ano_mes=2025-01/). Valores monetários vão
+# como decimal128 com a precisão e a escala declaradas no Firebird, sem
+# passar por float.
+#
+# Exportação incremental: cada execução grava arquivos novos só com os
+# registros de chave acima da última exportada (_watermark.json). Parquet
+# não é alterado depois de escrito; os leitores (pyarrow.dataset, DuckDB,
+# Spark) tratam todos os arquivos da pasta como uma tabela.
+#
+# O Firebird numera o ID no INSERT, não no commit: quando a exportação lê,
+# o ID N pode ainda estar em uma transação aberta enquanto N+1 já aparece.
+# Os IDs que faltam abaixo da marca d'água ficam guardados como lacunas e
+# são procurados de novo a cada execução (exportados quando aparecem);
+# uma lacuna que continua vazia depois de PARQUET_GAP_SECONDS é tratada
+# como registro excluído ou inserção desfeita e deixa de ser procurada.
+#
+# Uma exportação por pasta de cada vez (trava em .<pasta>.lock no destino,
+# válida entre processos): uma segunda execução simultânea falha na hora.
+#
+# Exportação completa: é gravada em uma pasta temporária (.<pasta>.novo) e
+# só toma o lugar da anterior quando termina; se falhar ou for cancelada, a
+# pasta e a marca d'água anteriores continuam valendo.
+# Requer pyarrow (opcional: só quem exporta precisa instalar).
+
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Optional
+
+from core import database # database.DatabaseError: exceção do driver, carregada sob demanda
+from core.configs import settings
+from core.database import get_connection
+from core.resource import Resource
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+SEM_DATA = "sem_data"
+
+# Precisão/escala quando o Firebird não informa (NUMERIC guardado como DOUBLE no dialeto 1)
+_DECIMAL_PADRAO = (18, 4)
+
+
+class ExportInProgress(RuntimeError):
+    """Já há uma exportação da mesma pasta em andamento (outro worker, tarefa ou script)."""
+
+
+@dataclass(frozen=True)
+class ParquetExport:
+    """O que exportar de um Resource e como organizar os arquivos."""
+    resource: Resource
+    pasta: str                              # subpasta dentro do destino (ex: "c_caixa_item")
+    excluir: tuple[str, ...] = ()           # campos que não saem (ex: dados sigilosos)
+    particionar_por: Optional[str] = None   # campo de data/hora: uma partição por mês
+    incremental: bool = True                # False: reescreve tudo a cada execução
+
+    def campos(self) -> list[str]:
+        return [c for c in self.resource.columns if c not in self.excluir]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("A exportação Parquet requer o pacote pyarrow (pip install pyarrow).")
+    return pyarrow
+
+
+def decimais(tabela: str) -> dict[str, tuple[int, int]]:
+    """Precisão e escala das colunas NUMERIC/DECIMAL da tabela, pelo catálogo do Firebird."""
+    conn = None
+    cur = None
+    try:
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT TRIM(RF.RDB$FIELD_NAME), F.RDB$FIELD_PRECISION, F.RDB$FIELD_SCALE
+            FROM RDB$RELATION_FIELDS RF
+            JOIN RDB$FIELDS F ON F.RDB$FIELD_NAME = RF.RDB$FIELD_SOURCE
+            WHERE RF.RDB$RELATION_NAME = ? AND F.RDB$FIELD_SCALE < 0
+        """, (tabela,))
+        # A escala vem negativa (NUMERIC(15,2) -> -2)
+        return {nome: (precisao or _DECIMAL_PADRAO[0], -escala) for nome, precisao, escala in cur.fetchall()}
+    except database.DatabaseError as e:
+        logger.error("Database error in decimais(%s): %s", tabela, e)
+        raise RuntimeError(f"Erro ao ler a estrutura de {tabela}: {e}")
+    except Exception as e:
+        logger.exception("Unexpected error in decimais(%s): %s", tabela, e)
+        raise RuntimeError(f"Erro inesperado ao ler a estrutura de {tabela}: {e}")
+    finally:
+        if cur:
+            cur.close()
+        if conn:
+            conn.close()
+
+
+def schema_arrow(export: ParquetExport, pa, escalas: dict[str, tuple[int, int]]):
+    campos = []
+    for nome in export.campos():
+        coluna = export.resource.columns[nome]
+        if coluna.type is int:
+            tipo = pa.int64()
+        elif coluna.type is Decimal:
+            tipo = pa.decimal128(*escalas.get(coluna.name, _DECIMAL_PADRAO))
+        elif coluna.type is datetime:
+            tipo = pa.timestamp("ms")
+        elif coluna.type is date:
+            tipo = pa.date32()
+        elif coluna.type is bytes:
+            tipo = pa.binary()
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(nome, tipo))
+    return pa.schema(campos)
+
+
+def _particao(valor) -> str:
+    if valor is None:
+        return SEM_DATA
+    return f"{valor.year:04d}-{valor.month:02d}"
+
+
+def _ler_watermark(caminho: str) -> dict:
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _gravar_watermark(caminho: str, ultimo_id, linhas: int, lacunas: dict, execucao: int) -> None:
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump({"ultimo_id": ultimo_id, "linhas": linhas, "execucao": execucao,
+                   "exportado_em": datetime.now().isoformat(timespec="seconds"),
+                   "lacunas": sorted([chave, desde] for chave, desde in lacunas.items())}, f)
+    os.replace(temporario, caminho)  # Troca atômica: nunca fica meio escrito
+
+
+def _anotar_lacunas(lacunas: dict, anterior, chave, agora: float) -> None:
+    """Registra os IDs que faltam entre `anterior` e `chave` (saltos grandes não são transações abertas)."""
+    if anterior is None or chave - anterior - 1 > settings.PARQUET_MAX_GAPS:
+        return
+    for faltando in range(anterior + 1, chave):
+        lacunas.setdefault(faltando, agora)
+
+
+def _trocar_pasta(nova: str, pasta: str) -> None:
+    """Põe `nova` no lugar de `pasta` (renomeações; a anterior é apagada depois)."""
+    antiga = os.path.join(os.path.dirname(pasta), f".{os.path.basename(pasta)}.antigo")
+    shutil.rmtree(antiga, ignore_errors=True)
+    if os.path.exists(pasta):
+        os.replace(pasta, antiga)
+    os.replace(nova, pasta)
+    shutil.rmtree(antiga, ignore_errors=True)
+
+
+@contextmanager
+def _trava(destino: str, pasta: str):
+    """Trava exclusiva da pasta, liberada ao sair (ou se o processo morrer)."""
+    os.makedirs(destino, exist_ok=True)
+    arquivo = open(os.path.join(destino, f".{pasta}.lock"), "a+")
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            raise ExportInProgress(f"Já há uma exportação de {pasta} em andamento.")
+        yield
+    finally:
+        arquivo.close()
+
+
+def exportar(export: ParquetExport, destino: str, lote: int = 10_000, completo: bool = False,
+             progresso: Optional[Callable[[int], None]] = None) -> dict:
+    """
+    Exporta os registros novos (ou todos, com `completo` ou se o export não
+    for incremental) para `destino/<pasta>/`. Retorna linhas, arquivos e a
+    nova marca d'água. Lança RuntimeError em falhas do banco ou do pyarrow.
+    `progresso(linhas)` é chamado a cada bloco; se levantar exceção (ex:
+    tarefa cancelada), a exportação para sem avançar a marca d'água. Lança
+    ExportInProgress se a mesma pasta já estiver sendo exportada.
+    """
+    pa = _pyarrow()
+    with _trava(destino, export.pasta):
+        return _exportar(export, pa, destino, lote, completo, progresso)
+
+
+def _exportar(export: ParquetExport, pa, destino: str, lote: int, completo: bool,
+              progresso: Optional[Callable[[int], None]]) -> dict:
+    resource = export.resource
+    pasta_final = os.path.join(destino, export.pasta)
+
+    completo = completo or not export.incremental
+    if completo:
+        # Começa do zero em uma pasta à parte (oculta para os leitores do dataset);
+        # uma sobra de execução interrompida é descartada
+        pasta = os.path.join(destino, f".{export.pasta}.novo")
+        shutil.rmtree(pasta, ignore_errors=True)
+    else:
+        pasta = pasta_final
+    os.makedirs(pasta, exist_ok=True)
+    caminho_watermark = os.path.join(pasta, "_watermark.json")
+    estado = {} if completo else _ler_watermark(caminho_watermark)
+    ultimo_id = estado.get("ultimo_id")
+    agora = time.time()
+    # Lacunas da execução anterior: ID -> quando começou a faltar
+    pendentes = {int(chave): desde for chave, desde in estado.get("lacunas", [])}
+    lacunas: dict[int, float] = {}
+
+    campos = export.campos()
+    posicao_chave = campos.index(resource.key)
+    posicao_particao = campos.index(export.particionar_por) if export.particionar_por else None
+    # O nome do arquivo leva o primeiro ID possível e o número da execução:
+    # repetir uma execução que falhou sobrescreve os mesmos arquivos (e apaga
+    # os que ela deixou em outras partições) em vez de duplicar
+    execucao = estado.get("execucao", 0) + 1
+    nome_arquivo = f"part-{(ultimo_id or 0) + 1:012d}-{execucao:06d}.parquet"
+    for raiz, _, arquivos in os.walk(pasta):
+        if nome_arquivo in arquivos:
+            os.remove(os.path.join(raiz, nome_arquivo))
+
+    escritores = {}
+    linhas = 0
+    novo_ultimo = ultimo_id
+    concluida = False
+    def blocos():
+        # Primeiro os registros que faltavam e já foram confirmados; os que
+        # continuam faltando seguem pendentes até vencer o prazo
+        if pendentes:
+            encontrados = resource.batch(sorted(pendentes), campos)
+            for registro in encontrados:
+                del pendentes[registro[resource.key]]
+            for chave, desde in pendentes.items():
+                if agora - desde < settings.PARQUET_GAP_SECONDS:
+                    lacunas[chave] = desde
+            for inicio in range(0, len(encontrados), lote):
+                yield [tuple(r[c] for c in campos) for r in encontrados[inicio:inicio + lote]], False
+        anterior = ultimo_id
+        for rows in resource.batches(campos, lote=lote, after=ultimo_id):
+            if export.incremental:
+                for r in rows:
+                    _anotar_lacunas(lacunas, anterior, r[posicao_chave], agora)
+                    anterior = r[posicao_chave]
+            yield rows, True
+
+    try:
+        schema = schema_arrow(export, pa, decimais(resource.table))
+        for rows, novos in blocos():
+            grupos: dict[str, list] = {}
+            if posicao_particao is None:
+                grupos[""] = rows
+            else:
+                for r in rows:
+                    grupos.setdefault(_particao(r[posicao_particao]), []).append(r)
+
+            for particao, linhas_grupo in grupos.items():
+                colunas = list(zip(*linhas_grupo))
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, schema)],
+                    schema=schema,
+                )
+                escritor = escritores.get(particao)
+                if escritor is None:
+                    subpasta = os.path.join(pasta, f"ano_mes={particao}") if particao else pasta
+                    os.makedirs(subpasta, exist_ok=True)
+                    escritor = escritores[particao] = pa.parquet.ParquetWriter(
+                        os.path.join(subpasta, nome_arquivo), schema, compression="zstd"
+                    )
+                escritor.write_batch(batch)
+
+            linhas += len(rows)
+            if novos:
+                novo_ultimo = rows[-1][posicao_chave]
+            if progresso is not None:
+                progresso(linhas)
+        concluida = True
+    except (pa.ArrowException, OSError) as e:
+        logger.error("Parquet export error in %s: %s", resource.table, e)
+        raise RuntimeError(f"Erro ao gravar {resource.name} em Parquet: {e}")
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+        if completo and not concluida:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+    # A marca d'água só avança depois que todos os arquivos foram fechados
+    # Só as lacunas mais recentes (as mais antigas são, quase sempre, exclusões)
+    lacunas = dict(sorted(lacunas.items())[-settings.PARQUET_MAX_GAPS:])
+    _gravar_watermark(caminho_watermark, novo_ultimo, linhas, lacunas, execucao)
+    if completo:
+        try:
+            _trocar_pasta(pasta, pasta_final)
+        except OSError as e:
+            logger.error("Parquet export error in %s: %s", resource.table, e)
+            raise RuntimeError(f"Erro ao publicar a exportação de {resource.name}: {e}")
+    return {
+        "tabela": resource.table,
+        "linhas": linhas,
+        "arquivos": len(escritores),
+        "ultimo_id": novo_ultimo,
+        "lacunas": len(lacunas),
+        "completo": completo,
+    }
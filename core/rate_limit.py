@@ -0,0 +1,168 @@
+# core/rate_limit.py
+#
+# Limite de taxa por balde de fichas: cada chave (ex: IP, e-mail) tem até
+# `capacidade` fichas, repostas continuamente a `taxa` fichas por segundo;
+# cada tentativa gasta uma. Balde vazio: recusa na hora, informando em
+# quantos segundos haverá ficha de novo. Uma ficha gasta pode ser devolvida
+# (custo negativo), sem passar da capacidade.
+#
+# Armazenamento (RATE_LIMIT_BACKEND):
+#   memory  dicionário por worker (com N workers, o limite efetivo é N vezes maior)
+#   redis   compartilhado entre workers e máquinas; a conta é feita em um
+#           script Lua (atômico, com o relógio do Redis). Requer o pacote redis.
+# Se o Redis falhar, a tentativa é liberada (o limite não pode derrubar o login).
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from core import metrics
+from core.configs import settings
+
+logger = logging.getLogger(__name__)
+
+_erros_backend = metrics.counter(
+    "rate_limit_backend_errors_total", "Falhas do armazenamento compartilhado do limite de taxa (tentativa liberada)"
+)
+
+_SCRIPT_REDIS = """
+local capacidade = tonumber(ARGV[1])
+local taxa = tonumber(ARGV[2])
+local custo = tonumber(ARGV[3])
+local tempo = redis.call('TIME')
+local agora = tonumber(tempo[1]) + tonumber(tempo[2]) / 1000000
+local balde = redis.call('HMGET', KEYS[1], 'fichas', 'em')
+local fichas = tonumber(balde[1]) or capacidade
+local em = tonumber(balde[2]) or agora
+fichas = math.min(capacidade, fichas + math.max(0, agora - em) * taxa)
+local permitido = 0
+local espera = 0
+if fichas >= custo then
+    fichas = math.min(capacidade, fichas - custo)
+    permitido = 1
+else
+    espera = (custo - fichas) / taxa
+end
+redis.call('HSET', KEYS[1], 'fichas', tostring(fichas), 'em', tostring(agora))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacidade / taxa * 1000))
+return {permitido, tostring(espera)}
+"""
+
+
+class MemoryBackend:
+    """Baldes em memória, limitados a `max_keys` (os menos usados saem primeiro)."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._baldes: OrderedDict[str, tuple[float, float]] = OrderedDict()  # chave -> (fichas, em)
+
+    def take(self, chave: str, capacidade: int, taxa: float, custo: float = 1.0) -> tuple[bool, float]:
+        agora = time.monotonic()
+        with self._lock:
+            fichas, em = self._baldes.get(chave, (float(capacidade), agora))
+            fichas = min(float(capacidade), fichas + (agora - em) * taxa)
+            if fichas >= custo:
+                fichas = min(float(capacidade), fichas - custo)
+                permitido, espera = True, 0.0
+            else:
+                permitido, espera = False, (custo - fichas) / taxa
+            self._baldes[chave] = (fichas, agora)
+            self._baldes.move_to_end(chave)
+            while len(self._baldes) > self.max_keys:
+                self._baldes.popitem(last=False)
+        return permitido, espera
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": "memory", "keys": len(self._baldes)}
+
+
+class RedisBackend:
+    """Baldes no Redis (chaves com prefixo `prefixo` e expiração automática)."""
+
+    def __init__(self, url: str, prefixo: str = "rate:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND='redis' requer o pacote redis (pip install redis).")
+        # Tempo limite curto: o Redis lento não pode segurar o login
+        self._cliente = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self._script = self._cliente.register_script(_SCRIPT_REDIS)
+        self._prefixo = prefixo
+
+    def take(self, chave: str, capacidade: int, taxa: float, custo: float = 1.0) -> tuple[bool, float]:
+        try:
+            permitido, espera = self._script(keys=[self._prefixo + chave], args=[capacidade, taxa, custo])
+        except Exception as e:
+            _erros_backend.inc()
+            logger.error("Rate limit backend error: %s", e)
+            return True, 0.0
+        return bool(int(permitido)), float(espera)
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.RATE_LIMIT_BACKEND == "redis":
+                    _backend = RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+                else:
+                    _backend = MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+    return _backend
+
+
+class RateLimiter:
+    """
+    Um limite nomeado (ex: "login_ip"): `capacidade` tentativas em rajada e
+    `por_minuto` tentativas repostas por minuto, por chave.
+    """
+
+    def __init__(self, name: str, capacidade: int, por_minuto: float):
+        self.name = name
+        self.capacidade = capacidade
+        self.por_minuto = por_minuto
+        self._recusadas = metrics.counter(
+            "rate_limit_rejected_total", "Tentativas recusadas pelo limite de taxa", ("limiter",)
+        )
+
+    def hit(self, chave: str) -> float | None:
+        """Gasta uma ficha da chave. Retorna None se permitido, ou os segundos até a próxima ficha."""
+        permitido, espera = get_backend().take(f"{self.name}:{chave}", self.capacidade, self.por_minuto / 60.0)
+        if permitido:
+            return None
+        self._recusadas.inc(limiter=self.name)
+        return max(1.0, math.ceil(espera))
+
+    def refund(self, chave: str) -> None:
+        """Devolve a ficha gasta por `hit` (ex: tentativa que deu certo)."""
+        get_backend().take(f"{self.name}:{chave}", self.capacidade, self.por_minuto / 60.0, custo=-1.0)
+
+
+def hash_key(valor: str) -> str:
+    """Chave derivada de um dado pessoal (ex: e-mail), para não guardá-lo em claro."""
+    return hashlib.sha256(valor.strip().lower().encode()).hexdigest()[:32]
+
+
+def client_ip(request) -> str | None:
+    """
+    IP do cliente. Atrás de um proxy (RATE_LIMIT_TRUST_FORWARDED), usa o
+    último endereço de X-Forwarded-For, que é o acrescentado pelo proxy
+    (os anteriores vêm do cliente e podem ser forjados).
+    """
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        encaminhado = request.headers.get("x-forwarded-for")
+        if encaminhado:
+            return encaminhado.split(",")[-1].strip()
+    return request.client.host if request.client else None
@@ -0,0 +1,328 @@
+# core/resource.py
+#
+# Motor genérico de leitura para tabelas do Firebird. Cada tabela é descrita
+# uma vez (nome, chave, colunas, filtros, tabelas relacionadas) e o Resource
+# gera as consultas: detalhe, listagem por chave ou por deslocamento,
+# contagem, lote por IDs e exportação em fluxo. Todas usam o pool de
+# conexões, buscam só as colunas pedidas e mantêm o texto do SQL estável
+# (parâmetros no lugar de valores), aproveitando o cache de instruções
+# preparadas. As gravações continuam nos models de cada tabela.
+
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional
+
+from core import database # database.DatabaseError: exceção do driver, carregada sob demanda
+from core.database import get_connection, read_with_retry
+
+logger = logging.getLogger(__name__)
+
+# Operadores aceitos nos filtros -> SQL (o valor entra sempre como parâmetro)
+OPERADORES = {
+    "=": "{coluna} = ?",
+    ">": "{coluna} > ?",
+    ">=": "{coluna} >= ?",
+    "<": "{coluna} < ?",
+    "<=": "{coluna} <= ?",
+    # STARTING WITH aproveita o índice da coluna, ao contrário de LIKE '%x%'
+    "starting": "{coluna} STARTING WITH ?",
+    # Intervalo fechado de dias sobre uma coluna de data/hora
+    "date_from": "{coluna} >= ?",
+    "date_to": "{coluna} < ?",
+}
+
+# Limite de valores por IN (...) em um lote; listas maiores viram várias consultas
+TAMANHO_LOTE_IN = 1000
+
+
+@dataclass(frozen=True)
+class Column:
+    """Coluna exposta pela API: nome no banco e tipo Python do valor."""
+    name: str
+    type: type = str
+
+
+@dataclass(frozen=True)
+class Filter:
+    """Filtro da listagem: campo filtrado, operador e tipo do valor recebido."""
+    field: str
+    op: str = "="
+    type: Optional[type] = None
+
+
+@dataclass(frozen=True)
+class Include:
+    """Tabela relacionada (1:N) carregada junto, com um único JOIN por consulta."""
+    table: str
+    foreign_key: str                # coluna da tabela relacionada que aponta para a chave
+    columns: dict[str, Column]      # a primeira coluna identifica a linha relacionada
+
+
+@dataclass
+class Resource:
+    name: str                       # nome usado nas mensagens de erro (ex: "atos")
+    table: str
+    key: str                        # campo chave (deve estar em columns)
+    columns: dict[str, Column]
+    filters: dict[str, Filter] = field(default_factory=dict)
+    includes: dict[str, Include] = field(default_factory=dict)
+    max_limit: int = 500
+
+    def __post_init__(self):
+        if self.key not in self.columns:
+            raise ValueError(f"A chave '{self.key}' precisa estar nas colunas de {self.table}.")
+        for nome, filtro in self.filters.items():
+            if filtro.field not in self.columns or filtro.op not in OPERADORES:
+                raise ValueError(f"Filtro inválido em {self.table}: {nome}")
+
+    # ---------------------- montagem do SQL ----------------------
+
+    def projection(self, campos: Optional[Iterable[str]]) -> list[str]:
+        """Campos a buscar, na ordem declarada; a chave é sempre incluída."""
+        if not campos:
+            return list(self.columns)
+        campos = set(campos)
+        desconhecidos = sorted(campos - set(self.columns))
+        if desconhecidos:
+            raise ValueError(
+                f"Campos desconhecidos: {', '.join(desconhecidos)}. Disponíveis: {', '.join(self.columns)}."
+            )
+        return [c for c in self.columns if c == self.key or c in campos]
+
+    def _include(self, include: Optional[str]) -> Optional[Include]:
+        if not include:
+            return None
+        if include not in self.includes:
+            raise ValueError(f"Relação desconhecida: {include}. Disponíveis: {', '.join(self.includes) or 'nenhuma'}.")
+        return self.includes[include]
+
+    def where(self, filtros: Optional[dict] = None, after: Any = None) -> tuple[str, tuple]:
+        """Cláusula WHERE parametrizada (filtros sem valor são ignorados)."""
+        condicoes, params = [], []
+        chave = self.columns[self.key].name
+
+        if after is not None:
+            condicoes.append(f"{chave} > ?")
+            params.append(after)
+
+        for nome, valor in (filtros or {}).items():
+            if valor is None or valor == "":
+                continue
+            filtro = self.filters.get(nome)
+            if filtro is None:
+                raise ValueError(f"Filtro desconhecido: {nome}.")
+            if filtro.op == "date_from" and type(valor) is date:
+                valor = datetime.combine(valor, time.min)
+            elif filtro.op == "date_to" and type(valor) is date:
+                # O fim é inclusivo: vira "menor que o dia seguinte"
+                valor = datetime.combine(valor + timedelta(days=1), time.min)
+            condicoes.append(OPERADORES[filtro.op].format(coluna=self.columns[filtro.field].name))
+            params.append(valor)
+
+        if not condicoes:
+            return "", ()
+        return "WHERE " + " AND ".join(condicoes), tuple(params)
+
+    def _select(self, campos: list[str], where: str, include: Optional[Include] = None,
+                first: bool = False, skip: bool = False) -> str:
+        colunas = ", ".join(self.columns[c].name for c in campos)
+        chave = self.columns[self.key].name
+        limite = ("FIRST ? " if first else "") + ("SKIP ? " if skip else "")
+        principal = f"SELECT {limite}{colunas} FROM {self.table} {where} ORDER BY {chave}"
+        if include is None:
+            return principal
+
+        # A página vira uma tabela derivada e as linhas relacionadas vêm no
+        # mesmo JOIN: uma ida ao banco em vez de uma consulta por registro
+        colunas_a = ", ".join(f"A.{self.columns[c].name}" for c in campos)
+        colunas_r = ", ".join(f"R.{c.name}" for c in include.columns.values())
+        primeira_r = next(iter(include.columns.values())).name
+        return f"""
+            SELECT {colunas_a}, {colunas_r}
+            FROM ({principal}) A
+            LEFT JOIN {include.table} R ON R.{include.foreign_key} = A.{chave}
+            ORDER BY A.{chave}, R.{primeira_r}
+        """
+
+    def _agrupar(self, rows, campos: list[str], nome_include: str, include: Include) -> list[dict]:
+        """Junta as linhas do JOIN (registro repetido por linha relacionada) em um dict por registro."""
+        n = len(campos)
+        posicao_chave = campos.index(self.key)
+        registros: list[dict] = []
+        for r in rows:
+            if not registros or registros[-1][self.key] != r[posicao_chave]:
+                registros.append({**dict(zip(campos, r[:n])), nome_include: []})
+            if r[n] is not None:  # LEFT JOIN sem relacionados: colunas nulas
+                registros[-1][nome_include].append(dict(zip(include.columns, r[n:])))
+        return registros
+
+    # ---------------------- execução ----------------------
+
+    def _fetch(self, operacao: str, sql: str, params: tuple) -> list:
+        """Executa a consulta (repetida em falha de rede) e devolve todas as linhas."""
+        def consulta(cur):
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+        try:
+            return read_with_retry(consulta)
+        except database.DatabaseError as e:
+            logger.error("Database error in %s.%s: %s", self.table, operacao, e)
+            raise RuntimeError(f"Erro ao {operacao} {self.name} no banco de dados: {e}")
+        except Exception as e:
+            logger.exception("Unexpected error in %s.%s: %s", self.table, operacao, e)
+            raise RuntimeError(f"Erro inesperado ao {operacao} {self.name}: {e}")
+
+    def _montar(self, rows, campos: list[str], include_nome: Optional[str]) -> list[dict]:
+        if include_nome:
+            return self._agrupar(rows, campos, include_nome, self.includes[include_nome])
+        return [dict(zip(campos, r)) for r in rows]
+
+    # ---------------------- operações ----------------------
+
+    def get(self, key: Any, campos: Optional[Iterable[str]] = None, include: Optional[str] = None) -> Optional[dict]:
+        """Um registro pela chave, ou None se não existir."""
+        campos = self.projection(campos)
+        relacao = self._include(include)
+        where = f"WHERE {self.columns[self.key].name} = ?"
+        rows = self._fetch("buscar", self._select(campos, where, relacao), (key,))
+        registros = self._montar(rows, campos, include)
+        return registros[0] if registros else None
+
+    def page(self, after: Any = None, limit: int = 50, campos: Optional[Iterable[str]] = None,
+             filtros: Optional[dict] = None, include: Optional[str] = None) -> list[dict]:
+        """
+        Página por chave: até `limit` registros com chave maior que `after`.
+        O custo não cresce com a profundidade da página, ao contrário de SKIP.
+        """
+        campos = self.projection(campos)
+        relacao = self._include(include)
+        where, params = self.where(filtros, after)
+        rows = self._fetch("listar", self._select(campos, where, relacao, first=True), (limit,) + params)
+        return self._montar(rows, campos, include)
+
+    def page_offset(self, skip: int = 0, limit: int = 10, campos: Optional[Iterable[str]] = None,
+                    filtros: Optional[dict] = None) -> list[dict]:
+        """Página por deslocamento (FIRST/SKIP), para as listagens que expõem skip."""
+        campos = self.projection(campos)
+        where, params = self.where(filtros)
+        rows = self._fetch("listar", self._select(campos, where, first=True, skip=True), (limit, skip) + params)
+        return self._montar(rows, campos, None)
+
+    def count(self, filtros: Optional[dict] = None) -> int:
+        where, params = self.where(filtros)
+        return self._fetch("contar", f"SELECT COUNT(*) FROM {self.table} {where}", params)[0][0]
+
+    def batch(self, keys: Iterable[Any], campos: Optional[Iterable[str]] = None,
+              include: Optional[str] = None) -> list[dict]:
+        """
+        Vários registros pelas chaves, com uma consulta por bloco de até
+        TAMANHO_LOTE_IN chaves. Devolve na ordem pedida, sem repetidos e
+        sem as chaves inexistentes.
+        """
+        campos = self.projection(campos)
+        relacao = self._include(include)
+        chaves = list(dict.fromkeys(k for k in keys if k is not None))
+        coluna = self.columns[self.key].name
+
+        encontrados: dict = {}
+        for inicio in range(0, len(chaves), TAMANHO_LOTE_IN):
+            bloco = chaves[inicio:inicio + TAMANHO_LOTE_IN]
+            where = f"WHERE {coluna} IN ({', '.join('?' * len(bloco))})"
+            rows = self._fetch("buscar em lote", self._select(campos, where, relacao), tuple(bloco))
+            for registro in self._montar(rows, campos, include):
+                encontrados[registro[self.key]] = registro
+        return [encontrados[k] for k in chaves if k in encontrados]
+
+    def batches(self, campos: Optional[Iterable[str]] = None, filtros: Optional[dict] = None,
+                lote: int = 1000, after: Any = None) -> Iterator[list[tuple]]:
+        """
+        Gera as linhas (tuplas na ordem de `projection(campos)`) em blocos de
+        `lote`, lidos do cursor em ordem de chave, sem carregar a tabela inteira
+        na memória. Com `after`, só os registros de chave maior. A conexão fica
+        emprestada até o fim da iteração (ou até o gerador ser fechado).
+        """
+        campos = self.projection(campos)
+        where, params = self.where(filtros, after)
+
+        conn = None
+        cur = None
+        try:
+            # Sem tempo limite: a leitura dura o quanto o cliente levar para consumir
+            conn = get_connection(read_only=True, timeout=0)
+            cur = conn.cursor()
+            cur.execute(self._select(campos, where), params)
+            while True:
+                rows = cur.fetchmany(lote)
+                if not rows:
+                    return
+                yield rows
+        except database.DatabaseError as e:
+            logger.error("Database error in %s.stream: %s", self.table, e)
+            raise RuntimeError(f"Erro ao exportar {self.name} do banco de dados: {e}")
+        except Exception as e:
+            logger.exception("Unexpected error in %s.stream: %s", self.table, e)
+            raise RuntimeError(f"Erro inesperado ao exportar {self.name}: {e}")
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def stream(self, campos: Optional[Iterable[str]] = None, filtros: Optional[dict] = None,
+               lote: int = 1000, after: Any = None) -> Iterator[dict]:
+        """Como `batches`, mas um dict por registro."""
+        campos = self.projection(campos)
+        for rows in self.batches(campos, filtros, lote, after):
+            for r in rows:
+                yield dict(zip(campos, r))
+
+    def export(self, campos: Optional[Iterable[str]] = None, filtros: Optional[dict] = None,
+               formato: str = "ndjson", lote: int = 1000) -> Iterator[bytes]:
+        """
+        Exportação em NDJSON ou CSV, em blocos de `lote` linhas. Campos e
+        filtros são validados aqui (ValueError), antes do primeiro byte.
+        """
+        campos = self.projection(campos)
+        self.where(filtros)
+        return self._gerar_export(campos, filtros, formato, lote)
+
+    def _gerar_export(self, campos: list[str], filtros: Optional[dict], formato: str, lote: int) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if formato == "csv" else None
+        if writer:
+            writer.writerow(campos)
+
+        pendentes = 0
+        for registro in self.stream(campos, filtros, lote):
+            if writer:
+                writer.writerow([json_default(v) if isinstance(v, (datetime, date, Decimal, bytes)) else v
+                                 for v in registro.values()])
+            else:
+                buffer.write(json.dumps(registro, default=json_default, ensure_ascii=False))
+                buffer.write("\n")
+            pendentes += 1
+            # Poucos pedaços grandes em vez de um por linha
+            if pendentes >= lote:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                pendentes = 0
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+
+def json_default(valor):
+    """Serialização dos tipos do banco que o json não conhece."""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if isinstance(valor, bytes):
+        return valor.decode("utf-8", errors="replace")
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
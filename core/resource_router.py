@@ -0,0 +1,195 @@
+# core/resource_router.py
+#
+# Gera o APIRouter de leitura de um Resource (core/resource.py):
+#
+#   GET /            página por chave (after/limit), fields, include e filtros
+#   GET /count       total de registros que atendem aos filtros
+#   GET /batch       vários registros por IDs (ids=1,2,3) em uma consulta
+#   GET /export      NDJSON ou CSV em fluxo
+#   GET /{id}        detalhe, com include opcional
+#
+# Os schemas podem ser informados (documentação explícita) ou gerados a
+# partir das colunas e filtros do Resource.
+
+from typing import List, Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, create_model
+
+from core.configs import settings
+from core.deps import get_current_user
+from core.resource import Resource
+from core.validation import InputSanitizer
+
+_FIELDS = "Campos a retornar, separados por vírgula (ex: protocolo,data_ato). O ID sempre vem."
+
+
+def _split(valor: Optional[str]) -> Optional[List[str]]:
+    if not valor:
+        return None
+    return [v.strip().lower() for v in valor.split(",") if v.strip()] or None
+
+
+def _nome_schema(resource: Resource, sufixo: str) -> str:
+    return "".join(p.capitalize() for p in resource.table.lower().split("_")) + sufixo
+
+
+def item_schema(resource: Resource) -> Type[BaseModel]:
+    """Schema de um registro: todos os campos opcionais (por causa de `fields`)."""
+    campos = {nome: (Optional[coluna.type], None) for nome, coluna in resource.columns.items()}
+    for nome, include in resource.includes.items():
+        relacionado = create_model(
+            _nome_schema(resource, nome.capitalize() + "Schema"),
+            **{c: (Optional[col.type], None) for c, col in include.columns.items()},
+        )
+        campos[nome] = (Optional[List[relacionado]], None)
+    return create_model(_nome_schema(resource, "Schema"), **campos)
+
+
+def filtro_schema(resource: Resource) -> Type[BaseModel]:
+    """Schema dos filtros (query string), todos opcionais."""
+    campos = {}
+    for nome, filtro in resource.filters.items():
+        tipo = filtro.type or resource.columns[filtro.field].type
+        campos[nome] = (Optional[tipo], None)
+    return create_model(_nome_schema(resource, "FiltroSchema"), **campos)
+
+
+def _filtros(filtros: Optional[BaseModel]) -> dict:
+    if filtros is None:
+        return {}
+    valores = filtros.model_dump()
+    for nome, valor in valores.items():
+        if isinstance(valor, str):
+            # Os filtros de texto passam pela mesma limpeza das demais entradas
+            valores[nome] = InputSanitizer.clean_text(valor) or None
+    return valores
+
+
+def _executar(funcao, *args, **kwargs):
+    """Converte os erros do Resource nas respostas HTTP usadas pelos controllers."""
+    try:
+        return funcao(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro interno do servidor: {e}"
+        )
+
+
+def build_router(resource: Resource, item: Optional[Type[BaseModel]] = None,
+                 filtros_schema: Optional[Type[BaseModel]] = None) -> APIRouter:
+    """Cria as rotas de leitura do Resource (todas exigem usuário autenticado)."""
+    item = item or item_schema(resource)
+    filtros_schema = filtros_schema or filtro_schema(resource)
+    tipo_chave = resource.columns[resource.key].type
+    pagina = create_model(
+        _nome_schema(resource, "PageSchema"),
+        limit=(int, ...),
+        next_after=(Optional[tipo_chave], None),
+        data=(List[item], ...),
+    )
+    includes = ", ".join(resource.includes) or "nenhuma"
+
+    router = APIRouter()
+
+    # ---------------------- ROTAS FIXAS ----------------------
+
+    @router.get('/count')
+    def count(filtros: filtros_schema = Depends(), current_user: dict = Depends(get_current_user)):
+        """
+        Retorna a quantidade de registros que atendem aos filtros.
+        """
+        return {"total": _executar(resource.count, _filtros(filtros))}
+
+    @router.get('/batch', response_model=List[item], response_model_exclude_unset=True)
+    def batch(
+        ids: str = Query(..., description="IDs separados por vírgula"),
+        fields: Optional[str] = Query(None, description=_FIELDS),
+        include: Optional[str] = Query(None, description=f"Relação a incluir ({includes})"),
+        current_user: dict = Depends(get_current_user)
+    ):
+        """
+        Retorna vários registros pelos IDs, na ordem pedida, em uma única consulta.
+        """
+        try:
+            chaves = [tipo_chave(v) for v in _split(ids) or []]
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="IDs inválidos.")
+        if len(chaves) > resource.max_limit:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Informe no máximo {resource.max_limit} IDs."
+            )
+        registros = _executar(resource.batch, chaves, campos=_split(fields), include=include)
+        return [item(**r) for r in registros]
+
+    @router.get('/export')
+    def export(
+        formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        fields: Optional[str] = Query(None, description=_FIELDS),
+        filtros: filtros_schema = Depends(),
+        current_user: dict = Depends(get_current_user)
+    ):
+        """
+        Exporta os registros filtrados em NDJSON (um JSON por linha) ou CSV,
+        enviando a resposta aos poucos, enquanto o banco é lido.
+        """
+        corpo = _executar(
+            resource.export, campos=_split(fields), filtros=_filtros(filtros),
+            formato=formato, lote=settings.EXPORT_BATCH_SIZE
+        )
+        return StreamingResponse(
+            corpo,
+            media_type="text/csv" if formato == "csv" else "application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="{resource.name}.{formato}"'},
+        )
+
+    # ---------------------- ROTAS DINÂMICAS ----------------------
+
+    @router.get('/', response_model=pagina, response_model_exclude_unset=True)
+    def list_page(
+        after: Optional[tipo_chave] = Query(None, description="Último ID recebido (next_after da página anterior)"),
+        limit: int = Query(50, ge=1, le=min(resource.max_limit, settings.MAX_PAGE_SIZE)),
+        fields: Optional[str] = Query(None, description=_FIELDS),
+        include: Optional[str] = Query(None, description=f"Relação a incluir ({includes})"),
+        filtros: filtros_schema = Depends(),
+        current_user: dict = Depends(get_current_user)
+    ):
+        """
+        Lista os registros em ordem de ID, paginando por chave: a primeira página
+        vem sem `after`; as seguintes usam o `next_after` da resposta anterior.
+        """
+        registros = _executar(
+            resource.page, after=after, limit=limit, campos=_split(fields),
+            filtros=_filtros(filtros), include=include
+        )
+        return pagina(
+            limit=limit,
+            # Página cheia: pode haver mais; o cliente continua a partir do último ID
+            next_after=registros[-1][resource.key] if len(registros) == limit else None,
+            data=[item(**r) for r in registros],
+        )
+
+    @router.get('/{key}', response_model=item, response_model_exclude_unset=True)
+    def get_one(
+        key: tipo_chave,
+        fields: Optional[str] = Query(None, description=_FIELDS),
+        include: Optional[str] = Query(None, description=f"Relação a incluir ({includes})"),
+        current_user: dict = Depends(get_current_user)
+    ):
+        """
+        Retorna um registro pelo ID.
+        """
+        registro = _executar(resource.get, key, campos=_split(fields), include=include)
+        if not registro:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Registro {key} não encontrado em {resource.name}."
+            )
+        return item(**registro)
+
+    return router
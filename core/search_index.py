@@ -0,0 +1,190 @@
+# core/search_index.py
+
+import re
+import threading
+import unicodedata
+from typing import Callable, Hashable, Iterable, Optional
+
+# Qualquer caractere que não seja letra ou número separa palavras
+_SEPARADORES = re.compile(r"[^0-9a-z]+")
+
+# Consultas formadas apenas por dígitos e pontuação (ex: CPF "123.456.789-00")
+_SO_DIGITOS = re.compile(r"^[\d\s.\-/]+$")
+_NAO_DIGITOS = re.compile(r"\D+")
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """
+    Remove acentos, converte para minúsculas e troca pontuação por espaço.
+    "José da Conceição" -> "jose da conceicao".
+    """
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return _SEPARADORES.sub(" ", sem_acento.casefold()).strip()
+
+
+def somente_digitos(texto: Optional[str]) -> str:
+    """Mantém apenas os dígitos (usado para CPF)."""
+    return _NAO_DIGITOS.sub("", str(texto)) if texto else ""
+
+
+def _trigramas(palavra: str) -> set[str]:
+    # O espaço inicial marca o começo da palavra, permitindo busca por prefixo com 2 letras
+    p = " " + palavra
+    return {p[i:i + 3] for i in range(len(p) - 2)}
+
+
+def _trigramas_consulta(termo: str) -> set[str]:
+    # Termos curtos buscam por início de palavra; os demais, por trecho em qualquer posição
+    if len(termo) < 3:
+        return {" " + termo}
+    return {termo[i:i + 3] for i in range(len(termo) - 2)}
+
+
+class SearchIndex:
+    """
+    Índice invertido de trigramas em memória para busca parcial sem acento.
+
+    Cada campo tem um peso usado no ranking e, opcionalmente, um normalizador
+    próprio (ex: CPF guarda só os dígitos). Os métodos são seguros para uso
+    concorrente entre as threads do servidor.
+    """
+
+    def __init__(self, campos: dict[str, float], normalizadores: Optional[dict[str, Callable[[Optional[str]], str]]] = None):
+        self.campos = campos
+        self.normalizadores = normalizadores or {}
+        self._lock = threading.RLock()
+        self._docs: dict[Hashable, dict] = {}               # id -> registro original
+        self._textos: dict[Hashable, dict[str, str]] = {}   # id -> campo -> texto normalizado
+        self._gramas: dict[str, set] = {}                   # trigrama -> ids
+        self.construido = False
+
+    def _normalizar_campo(self, campo: str, valor: Optional[str]) -> str:
+        return self.normalizadores.get(campo, normalizar)(valor)
+
+    def _gramas_do_doc(self, textos: dict[str, str]) -> set[str]:
+        gramas = set()
+        for texto in textos.values():
+            for palavra in texto.split():
+                gramas |= _trigramas(palavra)
+        return gramas
+
+    def _remover_sem_lock(self, doc_id: Hashable) -> None:
+        textos = self._textos.pop(doc_id, None)
+        self._docs.pop(doc_id, None)
+        if textos is None:
+            return
+        for grama in self._gramas_do_doc(textos):
+            ids = self._gramas.get(grama)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._gramas[grama]
+
+    def _inserir_sem_lock(self, doc_id: Hashable, registro: dict) -> None:
+        textos = {campo: self._normalizar_campo(campo, registro.get(campo)) for campo in self.campos}
+        self._docs[doc_id] = registro
+        self._textos[doc_id] = textos
+        for grama in self._gramas_do_doc(textos):
+            self._gramas.setdefault(grama, set()).add(doc_id)
+
+    def construir(self, registros: Iterable[dict], chave: str) -> None:
+        """Reconstrói o índice inteiro a partir dos registros informados."""
+        docs, textos, gramas = {}, {}, {}
+        # Monta as estruturas fora do lock para não bloquear buscas em andamento
+        for registro in registros:
+            doc_id = registro[chave]
+            campos = {campo: self._normalizar_campo(campo, registro.get(campo)) for campo in self.campos}
+            docs[doc_id] = registro
+            textos[doc_id] = campos
+            for grama in self._gramas_do_doc(campos):
+                gramas.setdefault(grama, set()).add(doc_id)
+
+        with self._lock:
+            self._docs, self._textos, self._gramas = docs, textos, gramas
+            self.construido = True
+
+    def upsert(self, doc_id: Hashable, registro: dict) -> None:
+        """Insere ou atualiza um registro."""
+        with self._lock:
+            self._remover_sem_lock(doc_id)
+            self._inserir_sem_lock(doc_id, registro)
+
+    def remover(self, doc_id: Hashable) -> None:
+        """Remove um registro, se existir."""
+        with self._lock:
+            self._remover_sem_lock(doc_id)
+
+    def invalidar(self) -> None:
+        """Descarta o índice; a próxima busca deve reconstruí-lo."""
+        with self._lock:
+            self._docs, self._textos, self._gramas = {}, {}, {}
+            self.construido = False
+
+    def _termos(self, consulta: str) -> list[str]:
+        if _SO_DIGITOS.match(consulta):
+            digitos = somente_digitos(consulta)
+            return [digitos] if len(digitos) >= 2 else []
+        return [t for t in normalizar(consulta).split() if len(t) >= 2]
+
+    def _pontuar(self, textos: dict[str, str], termos: list[str]) -> float:
+        total = 0.0
+        for termo in termos:
+            melhor = 0.0
+            for campo, peso in self.campos.items():
+                texto = textos[campo]
+                if not texto or termo not in texto:
+                    continue
+                if texto == termo:
+                    nota = 4.0      # Campo igual ao termo
+                elif texto.startswith(termo):
+                    nota = 3.0      # Início do campo
+                elif (" " + termo) in (" " + texto):
+                    nota = 2.0      # Início de uma palavra
+                else:
+                    nota = 1.0      # Trecho no meio de uma palavra
+                melhor = max(melhor, nota * peso)
+            if melhor == 0.0:
+                return 0.0          # Todos os termos precisam aparecer em algum campo
+            total += melhor
+        return total
+
+    def buscar(self, consulta: str, limite: int = 20) -> list[tuple[dict, float]]:
+        """
+        Retorna até `limite` registros que contêm todos os termos da consulta,
+        ordenados pela pontuação (maior primeiro).
+        """
+        termos = self._termos(consulta)
+        if not termos:
+            return []
+
+        with self._lock:
+            conjuntos = []
+            for termo in termos:
+                for grama in _trigramas_consulta(termo):
+                    ids = self._gramas.get(grama)
+                    if not ids:
+                        return []
+                    conjuntos.append(ids)
+
+            # Interseção começando pelo menor conjunto
+            conjuntos.sort(key=len)
+            candidatos = set(conjuntos[0])
+            for ids in conjuntos[1:]:
+                candidatos &= ids
+                if not candidatos:
+                    return []
+
+            resultado = []
+            for doc_id in candidatos:
+                nota = self._pontuar(self._textos[doc_id], termos)
+                if nota > 0:
+                    resultado.append((self._docs[doc_id], nota))
+
+        resultado.sort(key=lambda r: -r[1])
+        return resultado[:limite]
+
+    def __len__(self) -> int:
+        return len(self._docs)
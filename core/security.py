@@ -1,12 +1,21 @@
 # core/security.py
 
-# Importa CryptContext da biblioteca passlib para operações de hash de senha
-from passlib.context import CryptContext
+# Contexto de criptografia do passlib, criado no primeiro uso: importar o
+# passlib e carregar o backend do bcrypt fica fora da inicialização da API
+_crypto = None
 
-# Cria uma instância do contexto de criptografia
-# O esquema usado é 'bcrypt', que é seguro e amplamente aceito
-# O parâmetro 'deprecated="auto"' marca versões antigas como inseguras, se aplicável
-CRYPTO = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+def get_crypto():
+    """
+    Retorna o contexto de criptografia (criado na primeira chamada).
+    O esquema usado é 'bcrypt', que é seguro e amplamente aceito.
+    O parâmetro 'deprecated="auto"' marca versões antigas como inseguras, se aplicável.
+    """
+    global _crypto
+    if _crypto is None:
+        from passlib.context import CryptContext
+        _crypto = CryptContext(schemes=['bcrypt'], deprecated='auto')
+    return _crypto
 
 
 # Verifica se uma senha fornecida corresponde ao hash armazenado
@@ -18,7 +27,7 @@ def verify_senha_api(plain_senha_api: str, hashed_senha_api: str) -> bool:
     :param hashed_senha_api: Hash da senha armazenado no banco de dados
     :return: True se corresponder, False se não
     """
-    return CRYPTO.verify(plain_senha_api, hashed_senha_api)
+    return get_crypto().verify(plain_senha_api, hashed_senha_api)
 
 
 # Gera o hash de uma senha fornecida
@@ -29,4 +38,4 @@ def hash_senha_api(plain_senha_api: str) -> str:
     :param plain_senha_api: Senha em texto puro fornecida pelo usuário
     :return: Hash da senha
     """
-    return CRYPTO.hash(plain_senha_api)
+    return get_crypto().hash(plain_senha_api)
@@ -0,0 +1,268 @@
+# core/signing.py
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class TokenError(Exception):
+    """Token malformado, com assinatura inválida, chave desconhecida ou expirado."""
+
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _int_b64(valor: int, tamanho: int) -> str:
+    return b64url_encode(valor.to_bytes(tamanho, "big"))
+
+
+class Signer(ABC):
+    """
+    Assinador JWS identificado por um `kid`.
+
+    Subclasses implementam sign/verify para um algoritmo. Assinadores criados
+    apenas com a chave pública servem somente para verificação.
+    """
+
+    algorithm: str = ""
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        # O cabeçalho é fixo por chave, então é serializado uma única vez
+        self.encoded_header = b64url_encode(
+            json.dumps({"alg": self.algorithm, "typ": "JWT", "kid": kid}, separators=(",", ":")).encode()
+        )
+
+    @property
+    def can_sign(self) -> bool:
+        return True
+
+    @abstractmethod
+    def sign(self, signing_input: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        ...
+
+    def public_jwk(self) -> Optional[dict]:
+        """Chave pública no formato JWK, ou None para chaves simétricas."""
+        return None
+
+
+class HMACSigner(Signer):
+    """HS256/HS384/HS512 com a biblioteca padrão (segredo compartilhado)."""
+
+    _HASHES = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, kid: str, secret: str, algorithm: str = "HS256"):
+        if algorithm not in self._HASHES:
+            raise ValueError(f"Algoritmo HMAC não suportado: {algorithm}")
+        self.algorithm = algorithm
+        self._digest = self._HASHES[algorithm]
+        self._secret = secret.encode()
+        super().__init__(kid)
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._secret, signing_input, self._digest).digest()
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self.sign(signing_input), signature)
+
+
+class EdDSASigner(Signer):
+    """EdDSA (Ed25519). Permite que outros serviços verifiquem só com a chave pública."""
+
+    algorithm = "EdDSA"
+
+    def __init__(self, kid: str, private_key=None, public_key=None):
+        if private_key is None and public_key is None:
+            raise ValueError("Informe a chave privada ou a chave pública Ed25519.")
+        self._private = private_key
+        self._public = public_key or private_key.public_key()
+        super().__init__(kid)
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        return self._private.sign(signing_input)
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        try:
+            self._public.verify(signature, signing_input)
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> dict:
+        from cryptography.hazmat.primitives import serialization
+        raw = self._public.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return {"kty": "OKP", "crv": "Ed25519", "x": b64url_encode(raw), "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+class ECDSASigner(Signer):
+    """ES256 (ECDSA P-256 + SHA-256), com assinatura no formato JWS (r || s)."""
+
+    algorithm = "ES256"
+    _TAMANHO = 32
+
+    def __init__(self, kid: str, private_key=None, public_key=None):
+        if private_key is None and public_key is None:
+            raise ValueError("Informe a chave privada ou a chave pública P-256.")
+        self._private = private_key
+        self._public = public_key or private_key.public_key()
+        super().__init__(kid)
+
+    @property
+    def can_sign(self) -> bool:
+        return self._private is not None
+
+    def sign(self, signing_input: bytes) -> bytes:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+        r, s = decode_dss_signature(self._private.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(self._TAMANHO, "big") + s.to_bytes(self._TAMANHO, "big")
+
+    def verify(self, signing_input: bytes, signature: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+        if len(signature) != 2 * self._TAMANHO:
+            return False
+        r = int.from_bytes(signature[:self._TAMANHO], "big")
+        s = int.from_bytes(signature[self._TAMANHO:], "big")
+        try:
+            self._public.verify(encode_dss_signature(r, s), signing_input, ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+    def public_jwk(self) -> dict:
+        numeros = self._public.public_numbers()
+        return {
+            "kty": "EC", "crv": "P-256",
+            "x": _int_b64(numeros.x, self._TAMANHO), "y": _int_b64(numeros.y, self._TAMANHO),
+            "kid": self.kid, "alg": self.algorithm, "use": "sig",
+        }
+
+
+def load_pem_signer(kid: str, algorithm: str, pem: bytes) -> Signer:
+    """Cria um assinador EdDSA/ES256 a partir de uma chave PEM (privada ou pública)."""
+    from cryptography.hazmat.primitives import serialization
+
+    classes = {"EdDSA": EdDSASigner, "ES256": ECDSASigner}
+    if algorithm not in classes:
+        raise ValueError(f"Algoritmo assimétrico não suportado: {algorithm}")
+
+    if b"PRIVATE KEY" in pem:
+        return classes[algorithm](kid, private_key=serialization.load_pem_private_key(pem, password=None))
+    return classes[algorithm](kid, public_key=serialization.load_pem_public_key(pem))
+
+
+class KeyRing:
+    """
+    Conjunto de chaves de assinatura indexado por `kid`.
+
+    Uma chave é a ativa (usada para emitir tokens); as demais continuam
+    válidas para verificação, permitindo a rotação sem derrubar sessões.
+    Tokens antigos sem `kid` são verificados com a chave `fallback_kid`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[str, Signer] = {}
+        self._active: Optional[Signer] = None
+        self.fallback_kid: Optional[str] = None
+
+    def add(self, signer: Signer, active: bool = False) -> None:
+        with self._lock:
+            self._keys[signer.kid] = signer
+            if active:
+                if not signer.can_sign:
+                    raise ValueError(f"A chave '{signer.kid}' não possui chave privada para assinar.")
+                self._active = signer
+
+    def rotate(self, signer: Signer) -> None:
+        """Torna `signer` a chave ativa, mantendo as anteriores para verificação."""
+        self.add(signer, active=True)
+
+    def remove(self, kid: str) -> None:
+        with self._lock:
+            if self._active is not None and self._active.kid == kid:
+                raise ValueError("Não é possível remover a chave ativa.")
+            self._keys.pop(kid, None)
+
+    @property
+    def active(self) -> Signer:
+        if self._active is None:
+            raise TokenError("Nenhuma chave ativa configurada para assinar tokens.")
+        return self._active
+
+    def encode(self, payload: dict) -> str:
+        signer = self.active
+        signing_input = signer.encoded_header + "." + b64url_encode(
+            json.dumps(payload, separators=(",", ":")).encode()
+        )
+        return signing_input + "." + b64url_encode(signer.sign(signing_input.encode("ascii")))
+
+    def decode(self, token: str, leeway: int = 0) -> dict:
+        """Verifica assinatura, `kid`, algoritmo e `exp`; retorna o payload."""
+        if not isinstance(token, str) or not token.isascii():
+            raise TokenError("Token malformado.")
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            header = json.loads(b64url_decode(header_b64))
+            signature = b64url_decode(signature_b64)
+        except (ValueError, TypeError):
+            raise TokenError("Token malformado.")
+        if not isinstance(header, dict):
+            raise TokenError("Token malformado.")
+
+        kid = header.get("kid") or self.fallback_kid
+        # O cabeçalho vem do cliente: `kid` que não é texto (ex: lista) não serve de chave do dict (TypeError)
+        if kid is not None and not isinstance(kid, str):
+            raise TokenError("Chave de assinatura desconhecida.")
+        signer = self._keys.get(kid) if kid else None
+        if signer is None:
+            raise TokenError("Chave de assinatura desconhecida.")
+        # O algoritmo vem da chave registrada, nunca do cabeçalho (evita confusão de algoritmo)
+        if header.get("alg") != signer.algorithm:
+            raise TokenError("Algoritmo do token não corresponde à chave.")
+        if not signer.verify(f"{header_b64}.{payload_b64}".encode("ascii"), signature):
+            raise TokenError("Assinatura inválida.")
+
+        try:
+            payload = json.loads(b64url_decode(payload_b64))
+        except ValueError:
+            raise TokenError("Payload malformado.")
+        if not isinstance(payload, dict):
+            raise TokenError("Payload malformado.")
+
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise TokenError("Claim 'exp' inválido.")
+            if exp + leeway <= time.time():
+                raise TokenError("Token expirado.")
+
+        return payload
+
+    def jwks(self) -> dict:
+        """Chaves públicas no formato JWKS, para verificação em outros serviços."""
+        with self._lock:
+            return {"keys": [jwk for jwk in (s.public_jwk() for s in self._keys.values()) if jwk]}
@@ -0,0 +1,71 @@
+# core/testing.py
+#
+# Utilitários para testes que limitam a quantidade de acessos ao banco por
+# endpoint. Para usar a fixture, registre o plugin no conftest.py:
+#
+#     pytest_plugins = ["core.testing"]
+#
+#     def test_lista_caixa(client, query_budget):
+#         resposta = client.get("/api/v1/caixa_itens/", headers=auth)
+#         query_budget(resposta, statements=3, connections=3)
+
+from contextlib import contextmanager
+
+from core.configs import settings
+from core.instrumentation import count_queries
+
+
+class QueryBudgetExceeded(AssertionError):
+    """O endpoint executou mais instruções ou abriu mais conexões que o permitido."""
+
+
+def _verificar(statements: int, connections: int, max_statements, max_connections, sql=()) -> None:
+    problemas = []
+    if max_statements is not None and statements > max_statements:
+        problemas.append(f"{statements} instruções SQL (limite {max_statements})")
+    if max_connections is not None and connections > max_connections:
+        problemas.append(f"{connections} conexões (limite {max_connections})")
+    if problemas:
+        detalhe = "\n".join(f"  {i + 1}. {s.splitlines()[0] if s else s}" for i, s in enumerate(sql))
+        raise QueryBudgetExceeded("Orçamento de consultas excedido: " + ", ".join(problemas) + (f"\n{detalhe}" if detalhe else ""))
+
+
+def assert_query_budget(response, statements: int | None = None, connections: int | None = None) -> None:
+    """
+    Confere os cabeçalhos X-DB-* de uma resposta (requer DEBUG_QUERY_COUNT ativo).
+    """
+    if "x-db-statements" not in response.headers:
+        raise AssertionError("Resposta sem X-DB-Statements: ative settings.DEBUG_QUERY_COUNT.")
+    _verificar(
+        int(response.headers["x-db-statements"]),
+        int(response.headers["x-db-connections"]),
+        statements,
+        connections,
+    )
+
+
+@contextmanager
+def query_budget(statements: int | None = None, connections: int | None = None):
+    """
+    Falha se o código dentro do bloco exceder o orçamento (uso direto, sem HTTP):
+
+        with query_budget(statements=2):
+            controller.get_all_caixa_itens()
+    """
+    with count_queries() as stats:
+        yield stats
+    _verificar(stats.statements, stats.connections, statements, connections, stats.sql)
+
+
+try:
+    import pytest
+except ImportError:  # pytest só é necessário ao rodar testes
+    pytest = None
+
+if pytest is not None:
+
+    # Exposta nos testes como "query_budget"; liga a contagem só durante o teste
+    @pytest.fixture(name="query_budget")
+    def query_budget_fixture(monkeypatch):
+        monkeypatch.setattr(settings, "DEBUG_QUERY_COUNT", True)
+        return assert_query_budget
@@ -0,0 +1,86 @@
+# core/token_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class VerifiedTokenCache:
+    """
+    Cache LRU limitado de tokens JWT já verificados.
+
+    A chave é o SHA-256 do token (o token em si não fica em memória) e cada
+    entrada expira junto com o claim `exp` do token. Tokens revogados ficam em
+    uma lista negra até expirarem, e a revogação remove a entrada do cache.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()  # hash -> (exp, payload)
+        self._revoked: dict[bytes, float] = {}                                  # hash -> exp
+
+    @staticmethod
+    def _chave(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Retorna o payload já verificado, ou None se não estiver no cache."""
+        chave = self._chave(token)
+        agora = time.time()
+        with self._lock:
+            entrada = self._entries.get(chave)
+            if entrada is None:
+                return None
+            exp, payload = entrada
+            if exp <= agora:
+                del self._entries[chave]
+                return None
+            self._entries.move_to_end(chave)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Guarda o payload de um token recém-verificado até o seu `exp`."""
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # Sem expiração conhecida não há como limitar a validade no cache
+        chave = self._chave(token)
+        with self._lock:
+            if chave in self._revoked:
+                return
+            self._entries[chave] = (float(exp), payload)
+            self._entries.move_to_end(chave)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        chave = self._chave(token)
+        with self._lock:
+            exp = self._revoked.get(chave)
+            if exp is None:
+                return False
+            if exp <= time.time():
+                del self._revoked[chave]
+                return False  # Já expirou: a verificação normal vai rejeitá-lo
+            return True
+
+    def revoke(self, token: str, exp: float) -> None:
+        """Revoga o token até `exp` e remove a entrada correspondente do cache."""
+        chave = self._chave(token)
+        agora = time.time()
+        with self._lock:
+            self._entries.pop(chave, None)
+            self._revoked[chave] = float(exp)
+            # Aproveita para descartar revogações de tokens que já expiraram
+            for antiga in [c for c, e in self._revoked.items() if e <= agora]:
+                del self._revoked[antiga]
+
+    def clear(self) -> None:
+        """Esvazia o cache (as revogações são mantidas)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
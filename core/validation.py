@@ -2,6 +2,33 @@
 
 import re
 import html
+from typing import Iterable
+
+
+# Padrões considerados perigosos em entradas de usuários (XSS / SQL injection)
+BLACKLIST = ["<script", "javascript:", "--", ";", "/*", "*/", "@@", "char(", "nchar(", "varchar(", "alter", "drop", "exec"]
+
+
+def _compilar_blacklist(padroes: list[str]) -> re.Pattern:
+    """
+    Monta um único autômato de busca para todos os padrões.
+
+    Padrões que contêm outro padrão da lista são redundantes ("nchar(" já é
+    detectado por "char(") e são descartados. O restante vira uma alternância
+    compilada uma única vez, que percorre o texto em uma só passada dentro do
+    motor de regex (em C), em vez de uma varredura por padrão.
+    """
+    minimos = sorted(
+        {p for p in padroes if not any(q != p and q in p for q in padroes)},
+        key=lambda p: (-len(p), p),
+    )
+    return re.compile("|".join(re.escape(p) for p in minimos))
+
+
+_WHITESPACE = re.compile(r"\s+")
+_EMAIL = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+_SCRIPT = re.compile(r"<script|javascript:")
+_BLACKLIST = _compilar_blacklist(BLACKLIST)
 
 
 class InputSanitizer:
@@ -9,24 +36,42 @@ class InputSanitizer:
     @staticmethod
     def clean_text(text: str) -> str:
         """Trim spaces, escape HTML entities, collapse multiple spaces."""
-        text = text.strip()
-        text = html.escape(text)
-        text = re.sub(r"\s+", " ", text)
-        return text
+        return _WHITESPACE.sub(" ", html.escape(text.strip()))
 
     @staticmethod
     def is_valid_email(email: str) -> bool:
         """Check if email has a valid structure"""
-        return bool(re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email))
+        return _EMAIL.match(email) is not None
 
     @staticmethod
     def has_script(text: str) -> bool:
         """Detect basic XSS attempts"""
-        return "<script" in text.lower() or "javascript:" in text.lower()
+        return _SCRIPT.search(text.lower()) is not None
 
     @staticmethod
     def is_safe(text: str) -> bool:
         """Detect common XSS/SQL injection characters or patterns"""
-        blacklist = ["<script", "javascript:", "--", ";", "/*", "*/", "@@", "char(", "nchar(", "varchar(", "alter", "drop", "exec"]
-        text_lower = text.lower()
-        return not any(p in text_lower for p in blacklist)
+        return _BLACKLIST.search(text.lower()) is None
+
+    @staticmethod
+    def sanitize(text: str) -> tuple[str, bool]:
+        """Clean a text and report whether the cleaned result is safe."""
+        cleaned = _WHITESPACE.sub(" ", html.escape(text.strip()))
+        return cleaned, _BLACKLIST.search(cleaned.lower()) is None
+
+    @staticmethod
+    def sanitize_many(texts: Iterable[str]) -> list[tuple[str, bool]]:
+        """
+        Batch version of sanitize() for bulk imports.
+        Returns (cleaned_text, is_safe) for each input, in the same order.
+        """
+        # Referências locais evitam buscas de atributo a cada iteração
+        escape = html.escape
+        collapse = _WHITESPACE.sub
+        search = _BLACKLIST.search
+        result = []
+        append = result.append
+        for text in texts:
+            cleaned = collapse(" ", escape(text.strip()))
+            append((cleaned, search(cleaned.lower()) is None))
+        return result
@@ -0,0 +1,173 @@
+# core/warmup.py
+#
+# Aquecimento da instância logo após a partida: abre as conexões do pool,
+# prepara as instruções SQL mais usadas em cada uma, carrega o backend do
+# bcrypt, exercita a validação dos schemas e preenche os caches. Enquanto não
+# termina, /health/ready responde 503 e o balanceador não envia tráfego.
+
+import asyncio
+import logging
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from core.configs import settings
+from core.database import get_pool, get_replicas, use_primary
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Situação do aquecimento, consultada por /health/ready."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = False
+        self.attempts = 0
+        self.started_at: float | None = None
+        self.duration: float | None = None
+        self.steps: dict[str, float] = {}   # etapa -> segundos
+        self.last_error: str | None = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "attempts": self.attempts,
+                "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+                "steps_ms": {k: round(v * 1000, 1) for k, v in self.steps.items()},
+                "last_error": self.last_error,
+            }
+
+
+state = WarmupState()
+
+
+def _consultas_quentes() -> list:
+    """Chamadas dos models que mais aparecem no tráfego (login, listagens, detalhes)."""
+    # Import tardio: os controllers importam este módulo indiretamente via main
+    from api.v1.models.g_usuario_model import UserModel
+    from api.v1.models.caixa.c_caixa_item_model import CCaixaItemModel
+
+    return [
+        lambda: UserModel.get_by_email(""),
+        lambda: UserModel.get_by_id(0),
+        lambda: UserModel.get_all(skip=0, limit=10),
+        UserModel.count_users,
+        lambda: CCaixaItemModel.get_by_id(0),
+        lambda: CCaixaItemModel.get_all_caixa_itens(skip=0, limit=10),
+        CCaixaItemModel.count_items,
+    ]
+
+
+def _preparar_instrucoes() -> None:
+    """
+    Executa as consultas quentes uma vez em cada conexão ociosa do pool, para
+    que todas já tenham as instruções preparadas. Os models pegam e devolvem
+    a conexão a cada chamada, então basta deixar só uma conexão livre por vez.
+    """
+    pool = get_pool()
+    consultas = _consultas_quentes()
+    emprestadas = [pool.acquire() for _ in range(pool.stats()["idle"])]
+    aquecidas = []
+    try:
+        # No primário mesmo com réplicas: as conexões emprestadas acima são dele
+        with use_primary():
+            while emprestadas:
+                emprestadas.pop().close()
+                for consulta in consultas:
+                    consulta()
+                aquecidas.append(pool.acquire())
+    finally:
+        for conn in emprestadas + aquecidas:
+            conn.close()
+
+
+def _preencher_replicas() -> None:
+    # Uma réplica fora do ar não impede a partida: fica fora do rodízio
+    replicas = get_replicas()
+    if replicas is not None:
+        replicas.prefill()
+
+
+def _carregar_bcrypt() -> None:
+    # Carrega o backend (e roda os autotestes do passlib) fora do primeiro login
+    from core.security import get_crypto
+    get_crypto().handler("bcrypt").get_backend()
+
+
+def _validar_schemas() -> None:
+    # Primeira validação de cada schema de listagem, com linhas reais
+    from api.v1.models.g_usuario_model import UserModel
+    from api.v1.models.caixa.c_caixa_item_model import CCaixaItemModel
+    from api.v1.schemas.g_usuario_schema import UserSchemaList
+    from api.v1.schemas.caixa.c_caixa_item_schema import CCaixaItemSchemaList
+
+    for row in UserModel.get_all(skip=0, limit=1):
+        UserSchemaList(**row)
+    for row in CCaixaItemModel.get_all_caixa_itens(skip=0, limit=1):
+        CCaixaItemSchemaList(**row)
+
+
+def _preencher_caches() -> None:
+    from api.v1.controllers import g_usuario_controller
+    from api.v1.controllers.caixa import c_caixa_item_controller
+
+    g_usuario_controller.count_users()
+    c_caixa_item_controller.count_items()
+    g_usuario_controller._ensure_search_index()
+
+
+ETAPAS = [
+    ("pool", lambda: get_pool().prefill()),
+    ("replicas", _preencher_replicas),
+    ("statements", _preparar_instrucoes),
+    ("bcrypt", _carregar_bcrypt),
+    ("schemas", _validar_schemas),
+    ("caches", _preencher_caches),
+]
+
+
+def run_warmup() -> None:
+    """Executa todas as etapas (bloqueante); levanta a exceção da etapa que falhar."""
+    inicio = time.perf_counter()
+    with state._lock:
+        state.attempts += 1
+        state.started_at = time.time()
+        state.steps = {}
+    for nome, etapa in ETAPAS:
+        t = time.perf_counter()
+        etapa()
+        with state._lock:
+            state.steps[nome] = time.perf_counter() - t
+    with state._lock:
+        state.duration = time.perf_counter() - inicio
+        state.last_error = None
+        state.ready = True
+
+
+async def warmup_in_background() -> None:
+    """
+    Aquece a instância sem bloquear a partida do servidor. Em caso de falha
+    (ex: banco ainda indisponível) tenta de novo com espera crescente; depois
+    de WARMUP_ATTEMPTS tentativas a instância é liberada mesmo fria, para não
+    ficar fora do balanceador indefinidamente.
+    """
+    espera = settings.WARMUP_RETRY_SECONDS
+    for tentativa in range(1, settings.WARMUP_ATTEMPTS + 1):
+        try:
+            await run_in_threadpool(run_warmup)
+            logger.info("Aquecimento concluído em %.0f ms (%sª tentativa).", state.duration * 1000, tentativa)
+            return
+        except Exception as e:
+            with state._lock:
+                state.last_error = f"{type(e).__name__}: {e}"
+            logger.error("Falha no aquecimento (%sª tentativa): %s", tentativa, e)
+            if tentativa < settings.WARMUP_ATTEMPTS:
+                await asyncio.sleep(espera)
+                espera *= 2
+
+    with state._lock:
+        state.ready = True
+    logger.warning("Aquecimento não concluído; a instância foi liberada sem aquecer.")
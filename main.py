@@ -7,17 +7,146 @@ import os
 # Adiciona o diretório atual (onde está o main.py) ao sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import asyncio
+import logging
+import math
+from contextlib import asynccontextmanager
+
 # Importa a classe principal do FastAPI
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Importa as configurações globais da aplicação
 from core.configs import settings
 
+# Logs estruturados (JSON) escritos por uma thread, com o contexto da requisição
+from core.log import LogContextMiddleware, setup_logging, shutdown_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # Importa o roteador principal da API versão 1
 from api.v1.api import api_router
 
+# Rotas /health/live e /health/ready (fora do prefixo da API)
+from api.v1.endpoints import health_endpoint
+
+# Pool de conexões e aquecimento da instância na partida
+from core.database import get_pool, get_replicas, ReadYourWritesMiddleware
+from core.warmup import warmup_in_background
+
+# Invalidação dos caches quando o banco é alterado fora da API
+from core.change_listener import listener as change_listener
+
+# Executor das tarefas em segundo plano (/jobs)
+from core.jobs import runner as job_runner
+
+# Cliente HTTP compartilhado das APIs externas
+from services.http_client import start_http_client, close_http_client
+
+# Disjuntor aberto (banco ou API externa fora do ar) vira 503 com Retry-After
+from core.circuit_breaker import CircuitOpenError, find_circuit_open
+
+# Contagem de conexões/instruções SQL por requisição (DEBUG_QUERY_COUNT)
+from core.instrumentation import QueryCountMiddleware
+
+# Controle de admissão e descarte de carga por grupo de rotas
+from core.admission import AdmissionMiddleware
+
+# Verificação dos índices usados pelos filtros de /caixa_itens
+from api.v1.controllers.caixa.c_caixa_item_controller import verificar_indices_filtros
+from api.v1.models.caixa.c_caixa_item_model import INDICES_RECOMENDADOS
+
+
+# Ciclo de vida da aplicação: executado na inicialização e no encerramento
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # De novo a cada partida: o encerramento anterior (reload, TestClient) parou a escrita
+    setup_logging()
+
+    # Avisa quando as colunas filtradas não estão indexadas (a API continua subindo)
+    for coluna in await run_in_threadpool(verificar_indices_filtros):
+        logger.warning(
+            "A coluna C_CAIXA_ITEM.%s não está indexada; os filtros de /caixa_itens vão varrer a tabela. Sugestão: %s",
+            coluna, INDICES_RECOMENDADOS[coluna],
+        )
+
+    # Aquece em segundo plano: o servidor já responde /health/live, e
+    # /health/ready só fica 200 quando o aquecimento terminar
+    aquecimento = asyncio.create_task(warmup_in_background())
+
+    # Thread que recebe os avisos de alteração de G_USUARIO e C_CAIXA_ITEM
+    change_listener.start()
+
+    # Verificação periódica de saúde e latência das réplicas de leitura (se houver)
+    replicas = get_replicas()
+    if replicas is not None:
+        replicas.start()
+
+    # Vagas próprias para exportações e reconstruções, fora do threadpool das requisições
+    job_runner.start()
+
+    # Um cliente HTTP por processo: conexões com as APIs externas são reaproveitadas
+    start_http_client()
+    yield
+
+    aquecimento.cancel()
+    job_runner.shutdown()
+    await run_in_threadpool(change_listener.stop)
+    await close_http_client()
+    if replicas is not None:
+        await run_in_threadpool(replicas.stop)
+        replicas.close_all()
+    get_pool().close_all()
+    shutdown_logging()
+
+
 # Instancia o app FastAPI com um título personalizado
-app = FastAPI(title='Orius Cartórios')
+app = FastAPI(title='Orius Cartórios', lifespan=lifespan)
+app.add_middleware(QueryCountMiddleware)
+# Leituras de quem acabou de gravar vão para o primário (com DB_READ_URLS)
+app.add_middleware(ReadYourWritesMiddleware)
+# Vagas por grupo de rotas: listagens pesadas não tomam a vez do login (o mais externo)
+app.add_middleware(AdmissionMiddleware)
+# Request ID, contexto dos logs e linha de acesso (por fora de todos, para medir a requisição inteira)
+app.add_middleware(LogContextMiddleware)
+
+# Dependência fora do ar: responde 503 na hora, dizendo quando tentar de novo
+def _servico_indisponivel(erro: CircuitOpenError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Serviço temporariamente indisponível. Tente novamente em instantes."},
+        headers={"Retry-After": str(max(1, math.ceil(erro.retry_after)))},
+    )
+
+
+@app.exception_handler(CircuitOpenError)
+async def circuito_aberto(request: Request, exc: CircuitOpenError):
+    return _servico_indisponivel(exc)
+
+
+@app.exception_handler(StarletteHTTPException)
+async def erro_http(request: Request, exc: StarletteHTTPException):
+    # Os controllers transformam as falhas do model em 500; se a causa foi o
+    # disjuntor aberto, o cliente recebe 503 com Retry-After
+    aberto = find_circuit_open(exc) if exc.status_code >= 500 else None
+    if aberto is not None:
+        return _servico_indisponivel(aberto)
+    return await http_exception_handler(request, exc)
+
+
+# Publica as chaves públicas (EdDSA/ES256) para que outros serviços verifiquem os tokens
+@app.get('/.well-known/jwks.json', include_in_schema=False)
+def jwks():
+    from core.auth import keyring
+    return keyring.jwks()
+
+
+# Rotas de saúde para o balanceador de carga
+app.include_router(health_endpoint.router, tags=['Saúde'])
 
 # Inclui as rotas da versão 1 da API com prefixo definido em settings (ex: /api/v1)
 app.include_router(api_router, prefix=settings.API_V1_STR)
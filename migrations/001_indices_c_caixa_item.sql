@@ -0,0 +1,20 @@
+-- migrations/001_indices_c_caixa_item.sql
+--
+-- Índices recomendados para os filtros de GET /api/v1/caixa_itens/.
+-- Cada filtro vira uma condição parametrizada em CCaixaItemModel._montar_filtros:
+--
+--   data_pagamento_inicio / data_pagamento_fim -> DATA_PAGAMENTO >= ? / DATA_PAGAMENTO < ?
+--   apresentante                               -> APRESENTANTE STARTING WITH ?
+--   valor_pago_min / valor_pago_max            -> VALOR_PAGO >= ? / VALOR_PAGO <= ?
+--
+-- STARTING WITH usa o índice de APRESENTANTE; LIKE '%texto%' não usaria.
+-- Na inicialização a API consulta RDB$INDICES e avisa quando alguma dessas
+-- colunas não é a primeira coluna de um índice ativo.
+--
+-- Execute com isql (ou ferramenta equivalente) conectado ao banco CARTORIO.
+
+CREATE INDEX IDX_C_CAIXA_ITEM_DATA_PAGAMENTO ON C_CAIXA_ITEM (DATA_PAGAMENTO);
+CREATE INDEX IDX_C_CAIXA_ITEM_APRESENTANTE ON C_CAIXA_ITEM (APRESENTANTE);
+CREATE INDEX IDX_C_CAIXA_ITEM_VALOR_PAGO ON C_CAIXA_ITEM (VALOR_PAGO);
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- migrations/002_indices_t_ato.sql
+--
+-- Índices usados por GET /api/v1/atos/ (TAtoModel):
+--
+--   pagamentos=true  -> LEFT JOIN C_CAIXA_ITEM C ON C.ATO_ID = A.ATO_ID
+--   data_ato_inicio / data_ato_fim -> DATA_ATO >= ? / DATA_ATO < ?
+--
+-- A paginação por chave (ATO_ID > ?) usa o índice da chave primária de T_ATO.
+-- Sem o índice em C_CAIXA_ITEM.ATO_ID, cada página com pagamentos varre a
+-- tabela de itens de caixa.
+--
+-- Execute com isql (ou ferramenta equivalente) conectado ao banco CARTORIO.
+
+CREATE INDEX IDX_C_CAIXA_ITEM_ATO_ID ON C_CAIXA_ITEM (ATO_ID);
+CREATE INDEX IDX_T_ATO_DATA_ATO ON T_ATO (DATA_ATO);
+
+COMMIT;
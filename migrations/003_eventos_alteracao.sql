@@ -0,0 +1,46 @@
+-- migrations/003_eventos_alteracao.sql
+--
+-- Avisa a API quando G_USUARIO ou C_CAIXA_ITEM são alterados por qualquer
+-- sistema (inclusive o desktop), para ela invalidar seus caches
+-- (core/change_listener.py):
+--
+--   POST_EVENT 'G_USUARIO_ALTERADO' / 'C_CAIXA_ITEM_ALTERADO'
+--     entregue aos ouvintes apenas quando a transação é confirmada (modo "events")
+--
+--   SEQ_G_USUARIO_ALTERACOES / SEQ_C_CAIXA_ITEM_ALTERACOES
+--     contador incrementado a cada linha alterada; o modo "polling" compara
+--     GEN_ID(seq, 0) a cada intervalo. Sequências não participam da transação,
+--     então os gatilhos não disputam bloqueio de linha com o sistema desktop
+--     (um UPDATE numa tabela de controle causaria conflitos de atualização).
+--
+-- Os gatilhos rodam depois da alteração (AFTER) e não mudam os dados.
+-- Requer Firebird 3 ou superior (gatilho com várias ações).
+--
+-- Execute com isql (ou ferramenta equivalente) conectado ao banco CARTORIO.
+
+CREATE SEQUENCE SEQ_G_USUARIO_ALTERACOES;
+CREATE SEQUENCE SEQ_C_CAIXA_ITEM_ALTERACOES;
+
+SET TERM ^ ;
+
+CREATE OR ALTER TRIGGER TRG_G_USUARIO_API_ALTERADO FOR G_USUARIO
+ACTIVE AFTER INSERT OR UPDATE OR DELETE POSITION 100
+AS
+DECLARE VARIABLE CONTADOR BIGINT;
+BEGIN
+  CONTADOR = NEXT VALUE FOR SEQ_G_USUARIO_ALTERACOES;
+  POST_EVENT 'G_USUARIO_ALTERADO';
+END^
+
+CREATE OR ALTER TRIGGER TRG_C_CAIXA_ITEM_API_ALTERADO FOR C_CAIXA_ITEM
+ACTIVE AFTER INSERT OR UPDATE OR DELETE POSITION 100
+AS
+DECLARE VARIABLE CONTADOR BIGINT;
+BEGIN
+  CONTADOR = NEXT VALUE FOR SEQ_C_CAIXA_ITEM_ALTERACOES;
+  POST_EVENT 'C_CAIXA_ITEM_ALTERADO';
+END^
+
+SET TERM ; ^
+
+COMMIT;
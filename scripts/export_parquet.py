@@ -0,0 +1,54 @@
+# scripts/export_parquet.py
+#
+# Exporta tabelas para Parquet (core/parquet_export.py), para o time de BI.
+#
+#   c_caixa_item  particionado por mês de DATA_PAGAMENTO, incremental por CAIXA_ITEM_ID
+#   g_usuario     sem dados sigilosos, reescrito a cada execução (tabela pequena,
+#                 e alterações de cadastro não aparecem em uma carga por ID)
+#
+# Uso:
+#   python scripts/export_parquet.py                      # todas, incremental
+#   python scripts/export_parquet.py c_caixa_item --full  # refaz do zero
+#   python scripts/export_parquet.py --destino /mnt/bi
+#
+# Requer pyarrow.
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.configs import settings
+from core.parquet_export import exportar
+from api.v1.controllers.job_controller import EXPORTACOES_PARQUET as EXPORTACOES
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Exporta tabelas para Parquet")
+    parser.add_argument("tabelas", nargs="*",
+                        help=f"tabelas a exportar: {', '.join(EXPORTACOES)} (padrão: todas)")
+    parser.add_argument("--destino", default=settings.PARQUET_EXPORT_DIR)
+    parser.add_argument("--lote", type=int, default=settings.PARQUET_BATCH_SIZE,
+                        help="linhas lidas do banco por bloco")
+    parser.add_argument("--full", action="store_true", help="ignora a marca d'água e refaz a exportação")
+    args = parser.parse_args()
+    desconhecidas = [t for t in args.tabelas if t not in EXPORTACOES]
+    if desconhecidas:
+        parser.error(f"tabela desconhecida: {', '.join(desconhecidas)}")
+
+    codigo = 0
+    for nome in args.tabelas or EXPORTACOES:
+        try:
+            resultado = exportar(EXPORTACOES[nome], args.destino, lote=args.lote, completo=args.full)
+        except RuntimeError as e:
+            print(f"Erro ao exportar {nome}: {e}", file=sys.stderr)
+            codigo = 1
+            continue
+        print(json.dumps(resultado, ensure_ascii=False))
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
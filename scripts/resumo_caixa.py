@@ -0,0 +1,48 @@
+# scripts/resumo_caixa.py
+#
+# Manutenção do resumo diário de C_CAIXA_ITEM (SUMMARY_DB_PATH).
+#
+# Uso:
+#   python scripts/resumo_caixa.py rebuild                      # refaz tudo
+#   python scripts/resumo_caixa.py rebuild --desde 2025-01-01   # refaz a partir da data
+#   python scripts/resumo_caixa.py update                       # soma os itens novos (constrói o resumo se vazio)
+#   python scripts/resumo_caixa.py status
+
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.v1.models.caixa.c_caixa_resumo_model import CCaixaResumoModel
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resumo diário dos itens de caixa")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    rebuild = comandos.add_parser("rebuild", help="reconstrói o resumo a partir de C_CAIXA_ITEM")
+    rebuild.add_argument("--desde", type=date.fromisoformat, help="refaz só os dias a partir desta data (AAAA-MM-DD)")
+    comandos.add_parser("update", help="soma os itens acima da marca d'água")
+    comandos.add_parser("status", help="mostra a marca d'água e a última atualização")
+    args = parser.parse_args()
+
+    try:
+        if args.comando == "rebuild":
+            resultado = CCaixaResumoModel.reconstruir(args.desde)
+        elif args.comando == "update":
+            resultado = CCaixaResumoModel.atualizar(forcar=True)
+            if resultado.get("vazio"):
+                resultado = CCaixaResumoModel.reconstruir(se_vazio=True)
+        else:
+            resultado = CCaixaResumoModel.get_status()
+    except RuntimeError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(resultado, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
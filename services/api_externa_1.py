@@ -1,8 +1,10 @@
-import httpx
+from services.http_client import get_http_client
 
-# Exemplo de cliente HTTP para API externa
+# Exemplo de cliente HTTP para API externa (EXTERNAL_API_BASE_URL).
+# Usa o cliente compartilhado do processo: conexões reaproveitadas, respostas
+# em cache conforme Cache-Control, novas tentativas e disjuntor.
+# Com o circuito aberto levanta core.circuit_breaker.CircuitOpenError.
 async def buscar_dados_externos(param: str):
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(f"https://api.exemplo.com/{param}")
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+    response = await get_http_client().get(f"/{param}")
+    response.raise_for_status()
+    return response.json()
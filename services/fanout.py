@@ -0,0 +1,73 @@
+# services/fanout.py
+#
+# Consulta a API externa para muitos parâmetros de uma vez (ex: enriquecer
+# uma página de itens de caixa). Os parâmetros repetidos são consultados uma
+# vez só e as chamadas rodam em paralelo, limitadas por um semáforo, cada uma
+# com seu tempo limite. O resultado traz o que deu certo e os erros de cada
+# parâmetro: uma falha isolada não derruba o lote.
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+from core.configs import settings
+from services.api_externa_1 import buscar_dados_externos
+
+
+@dataclass
+class FanoutResult:
+    """Resultado de um lote: valores por parâmetro e erros por parâmetro."""
+    results: dict[Hashable, Any] = field(default_factory=dict)
+    errors: dict[Hashable, str] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors
+
+
+async def buscar_em_lote(
+    params: Iterable[Hashable],
+    funcao: Callable[[Any], Awaitable[Any]] = buscar_dados_externos,
+    concorrencia: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> FanoutResult:
+    """
+    Chama `funcao(param)` para cada parâmetro distinto, com no máximo
+    `concorrencia` chamadas simultâneas e `timeout` segundos por chamada
+    (padrões em EXTERNAL_API_FANOUT_CONCURRENCY / EXTERNAL_API_CALL_TIMEOUT).
+    """
+    concorrencia = concorrencia or settings.EXTERNAL_API_FANOUT_CONCURRENCY
+    timeout = timeout or settings.EXTERNAL_API_CALL_TIMEOUT
+
+    # dict.fromkeys remove repetidos mantendo a ordem; None não é consultado
+    distintos = [p for p in dict.fromkeys(params) if p is not None]
+    semaforo = asyncio.Semaphore(concorrencia)
+    resultado = FanoutResult()
+
+    async def uma(param):
+        async with semaforo:
+            try:
+                resultado.results[param] = await asyncio.wait_for(funcao(param), timeout)
+            except asyncio.TimeoutError:
+                resultado.errors[param] = f"Tempo limite de {timeout:.1f}s excedido."
+            except Exception as e:
+                resultado.errors[param] = f"{type(e).__name__}: {e}"
+
+    await asyncio.gather(*(uma(p) for p in distintos))
+    return resultado
+
+
+async def enriquecer(
+    registros: list[dict],
+    campo_param: str,
+    campo_destino: str = "dados_externos",
+    **kwargs,
+) -> FanoutResult:
+    """
+    Preenche `registro[campo_destino]` com o retorno da API externa para
+    `registro[campo_param]` (None quando a consulta falhou), em um único lote.
+    """
+    lote = await buscar_em_lote((r.get(campo_param) for r in registros), **kwargs)
+    for registro in registros:
+        registro[campo_destino] = lote.results.get(registro.get(campo_param))
+    return lote
@@ -0,0 +1,273 @@
+# services/http_client.py
+#
+# Cliente HTTP compartilhado para as APIs externas. Um único httpx.AsyncClient
+# por processo (aberto e fechado no lifespan do app) reaproveita conexões
+# TCP/TLS entre chamadas, com HTTP/2 quando o pacote h2 estiver instalado.
+# Por cima dele: cache de respostas que respeita Cache-Control, novas
+# tentativas com espera aleatória crescente e um disjuntor por host.
+
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from core.circuit_breaker import CircuitBreaker
+from core.configs import settings
+
+# Respostas que valem uma nova tentativa (sobrecarga ou falha temporária do servidor)
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+def _http2_disponivel() -> bool:
+    # httpx só fala HTTP/2 com o pacote h2 instalado
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _diretivas_cache(valor: str) -> dict[str, Optional[str]]:
+    """Converte 'public, max-age=60' em {'public': None, 'max-age': '60'}."""
+    diretivas = {}
+    for parte in valor.split(","):
+        nome, _, arg = parte.strip().partition("=")
+        if nome:
+            diretivas[nome.lower()] = arg.strip('"') if arg else None
+    return diretivas
+
+
+def tempo_de_vida(response: httpx.Response) -> float:
+    """
+    Por quantos segundos a resposta pode ser reaproveitada sem consultar o
+    servidor (0 = não guardar), segundo Cache-Control/Age/Expires.
+    """
+    if response.status_code != 200 or response.request.method != "GET":
+        return 0.0
+    if response.headers.get("vary", "").strip() == "*":
+        return 0.0
+
+    diretivas = _diretivas_cache(response.headers.get("cache-control", ""))
+    if "no-store" in diretivas or "no-cache" in diretivas:
+        return 0.0
+
+    idade = 0.0
+    try:
+        idade = float(response.headers.get("age", 0))
+    except ValueError:
+        pass
+
+    if diretivas.get("max-age") is not None:
+        try:
+            return max(0.0, int(diretivas["max-age"]) - idade)
+        except ValueError:
+            return 0.0
+
+    if "expires" in response.headers:
+        try:
+            expira = parsedate_to_datetime(response.headers["expires"])
+            data = parsedate_to_datetime(response.headers["date"]) if "date" in response.headers else None
+            agora = data.timestamp() if data else time.time()
+            return max(0.0, expira.timestamp() - agora - idade)
+        except (TypeError, ValueError):
+            return 0.0
+
+    return 0.0
+
+
+class ResponseCache:
+    """Cache LRU de respostas GET, por URL completa."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # url -> (expira_em, resposta)
+        self._dados: OrderedDict[str, tuple[float, httpx.Response]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, url: str) -> tuple[Optional[httpx.Response], bool]:
+        """Retorna (resposta, ainda_valida); resposta vencida serve para revalidação."""
+        entrada = self._dados.get(url)
+        if entrada is None:
+            self.misses += 1
+            return None, False
+        self._dados.move_to_end(url)
+        if entrada[0] > time.monotonic():
+            self.hits += 1
+            return entrada[1], True
+        self.misses += 1
+        return entrada[1], False
+
+    def set(self, url: str, response: httpx.Response, ttl: float) -> None:
+        self._dados[url] = (time.monotonic() + ttl, response)
+        self._dados.move_to_end(url)
+        while len(self._dados) > self.max_entries:
+            self._dados.popitem(last=False)
+
+    def discard(self, url: str) -> None:
+        self._dados.pop(url, None)
+
+    def clear(self) -> None:
+        self._dados.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._dados),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+class ResilientClient:
+    """
+    Envolve o httpx.AsyncClient compartilhado com cache, novas tentativas e
+    disjuntor. Só GET é repetido e guardado em cache (é idempotente).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, retries: int, backoff_base: float,
+                 backoff_max: float, cache: ResponseCache, breaker_failures: int, breaker_reset: float):
+        self.client = client
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = cache
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def breaker_for(self, url: httpx.URL) -> CircuitBreaker:
+        host = f"{url.host}:{url.port}" if url.port else url.host
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                f"http:{host}", self.breaker_failures, self.breaker_reset
+            )
+        return breaker
+
+    def _espera(self, tentativa: int, response: Optional[httpx.Response]) -> float:
+        # Retry-After do servidor tem prioridade (se não for maior que o teto)
+        if response is not None and "retry-after" in response.headers:
+            try:
+                return min(self.backoff_max, max(0.0, float(response.headers["retry-after"])))
+            except ValueError:
+                pass
+        # "Full jitter": espera aleatória entre 0 e base * 2^tentativa, para
+        # que vários clientes não tentem de novo todos ao mesmo tempo
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** tentativa)))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        request = self.client.build_request("GET", url, **kwargs)
+        chave = str(request.url)
+
+        guardada, valida = self.cache.get(chave)
+        if valida:
+            return guardada
+
+        # Resposta vencida com validador: pergunta ao servidor se mudou (304)
+        if guardada is not None:
+            if "etag" in guardada.headers:
+                request.headers["if-none-match"] = guardada.headers["etag"]
+            if "last-modified" in guardada.headers:
+                request.headers["if-modified-since"] = guardada.headers["last-modified"]
+
+        response = await self._send_with_retries(request)
+
+        if response.status_code == 304 and guardada is not None:
+            self.cache.revalidated += 1
+            ttl = tempo_de_vida(response) or tempo_de_vida(guardada)
+            if ttl > 0:
+                self.cache.set(chave, guardada, ttl)
+            return guardada
+
+        ttl = tempo_de_vida(response)
+        if ttl > 0:
+            self.cache.set(chave, response, ttl)
+        else:
+            self.cache.discard(chave)
+        return response
+
+    async def _send_with_retries(self, request: httpx.Request) -> httpx.Response:
+        breaker = self.breaker_for(request.url)
+        tentativa = 0
+        while True:
+            breaker.before_call()
+            try:
+                response = await self.client.send(request)
+            except (httpx.TimeoutException, httpx.TransportError):
+                breaker.record_failure()
+                if tentativa >= self.retries:
+                    raise
+                await asyncio.sleep(self._espera(tentativa, None))
+                tentativa += 1
+                continue
+
+            # 429 é o servidor pedindo calma, não uma falha dele: não conta no disjuntor
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code in RETRY_STATUS and tentativa < self.retries:
+                await asyncio.sleep(self._espera(tentativa, response))
+                tentativa += 1
+                continue
+            return response
+
+    def stats(self) -> dict:
+        return {
+            "cache": self.cache.stats(),
+            "breakers": {host: b.stats() for host, b in self.breakers.items()},
+        }
+
+
+# Cliente do processo, criado no lifespan (ou no primeiro uso fora do app)
+_client: Optional[ResilientClient] = None
+
+
+def start_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> ResilientClient:
+    """
+    Cria o cliente compartilhado. `transport` permite apontar para um
+    servidor simulado (ex: httpx.MockTransport) nos testes.
+    """
+    global _client
+    http2 = settings.EXTERNAL_API_HTTP2 and transport is None and _http2_disponivel()
+    client = httpx.AsyncClient(
+        base_url=settings.EXTERNAL_API_BASE_URL,
+        timeout=httpx.Timeout(settings.EXTERNAL_API_TIMEOUT, connect=settings.EXTERNAL_API_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.EXTERNAL_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.EXTERNAL_API_MAX_KEEPALIVE,
+            keepalive_expiry=settings.EXTERNAL_API_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+        transport=transport,
+    )
+    _client = ResilientClient(
+        client,
+        retries=settings.EXTERNAL_API_RETRIES,
+        backoff_base=settings.EXTERNAL_API_BACKOFF_BASE,
+        backoff_max=settings.EXTERNAL_API_BACKOFF_MAX,
+        cache=ResponseCache(settings.EXTERNAL_API_CACHE_MAX_ENTRIES),
+        breaker_failures=settings.EXTERNAL_API_BREAKER_FAILURES,
+        breaker_reset=settings.EXTERNAL_API_BREAKER_RESET_SECONDS,
+    )
+    return _client
+
+
+def get_http_client() -> ResilientClient:
+    if _client is None:
+        return start_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        cliente, _client = _client, None
+        await cliente.client.aclose()
@@ -0,0 +1,80 @@
+# tests/test_query_budget.py
+#
+# Orçamento de consultas (core/testing.py) sobre um endpoint real, com o
+# banco simulado dos benchmarks (SQLite no lugar do Firebird).
+#
+#     python -m pytest -q tests
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+import dataset
+import fake_firebird
+
+from core import testing
+from core.testing import QueryBudgetExceeded
+
+# Fixture query_budget de core/testing.py
+query_budget_fixture = testing.query_budget_fixture
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    caminho = str(tmp_path_factory.mktemp("db") / "query_budget.sqlite")
+    dataset.build(caminho, usuarios=5, itens=20)
+    fake_firebird.install(caminho)
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def auth(client):
+    from core.configs import settings
+
+    resposta = client.post(
+        f"{settings.API_V1_STR}/usuarios/login",
+        data={"username": dataset.BENCH_EMAIL, "password": dataset.BENCH_SENHA},
+    )
+    resposta.raise_for_status()
+    return {"Authorization": f"Bearer {resposta.json()['access_token']}"}
+
+
+def test_endpoint_dentro_do_orcamento(client, auth, query_budget):
+    resposta = client.get("/api/v1/usuarios/2", headers=auth)
+    assert resposta.status_code == 200
+    query_budget(resposta, statements=2, connections=2)
+
+
+def test_endpoint_acima_do_orcamento(client, auth, query_budget):
+    resposta = client.get("/api/v1/usuarios/2", headers=auth)
+    assert resposta.status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="instruções SQL"):
+        query_budget(resposta, statements=1)
+
+
+def test_sem_contagem_ativa(client, auth):
+    # Sem a fixture, DEBUG_QUERY_COUNT fica desligado e não há cabeçalhos para conferir
+    resposta = client.get("/api/v1/usuarios/2", headers=auth)
+    with pytest.raises(AssertionError, match="DEBUG_QUERY_COUNT"):
+        testing.assert_query_budget(resposta, statements=10)
+
+
+def test_bloco_sem_http(client):
+    from api.v1.controllers.g_usuario_controller import get_user_by_id
+
+    with testing.query_budget(statements=1, connections=1):
+        get_user_by_id(2)
+    with pytest.raises(QueryBudgetExceeded, match="SELECT"):
+        with testing.query_budget(statements=0):
+            get_user_by_id(2)